@@ -0,0 +1,62 @@
+"""Write-commit latency of a single task toggle, with SQLite defaults and with the configured tuning.
+
+Run: python -m app.benchmarks.commit_latency [--commits N]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy.orm import sessionmaker
+
+from app import config
+from app.database.db import init_db, make_engine
+from app.models.task import Task
+from app.models.user import User
+
+
+def measure(pragmas, commits, tasks=1000):
+    """Time commits of one toggled task each, like TaskListFrame.toggle_complete. Input: pragmas, commits, tasks.
+    Returns the latencies in milliseconds."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine("sqlite:///" + os.path.join(tmp, "bench.db"), pragmas=pragmas)
+        init_db(engine)
+        db = sessionmaker(bind=engine)()
+        db.add(User(user_id=1, username="bench", password_hash="x"))
+        db.add_all(Task(task_id=i + 1, user_id=1, title=f"Task {i}", description="", due_date=date(2025, 1, 1),
+                        priority=3, category="General", complete=False) for i in range(tasks))
+        db.commit()
+
+        latencies = []
+        for i in range(commits):
+            task = db.get(Task, i % tasks + 1)
+            start = time.perf_counter()
+            task.complete = not task.complete
+            db.commit()
+            latencies.append((time.perf_counter() - start) * 1000)
+        db.close()
+        engine.dispose()
+    return latencies
+
+
+def report(name, latencies):
+    """Print one result line. Input: label, latencies in milliseconds."""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{name:<10} mean {statistics.mean(ordered):7.3f} ms   p50 {statistics.median(ordered):7.3f} ms   "
+          f"p95 {p95:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commits", type=int, default=300)
+    args = parser.parse_args()
+    # Empty pragmas keep SQLite's defaults: rollback journal, synchronous=FULL
+    report("default", measure({}, args.commits))
+    report("tuned", measure(config.SQLITE_PRAGMAS, args.commits))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Concurrent multi-user load on one database file: throughput, latency percentiles and lock contention.
+
+Run: python -m app.benchmarks.concurrent_load [--processes 2] [--threads 4] [--duration 10] [--mix list=50,save=20,...]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import app.testing.task_logic as L
+from app.benchmarks.synthetic import generate_tasks
+from app.database.db import init_db, make_engine
+from app.models.task import Task
+from app.models.user import User
+from app.store.task_store import TaskStore
+from app.utils.auth import authenticate, create_user
+
+# Relative weights of the simulated operations
+DEFAULT_MIX = dict(login=5, create_user=1, list=50, save=20, toggle=15, delete=9)
+# Rows shown by one list operation, like the first screen of the task list
+LIST_LIMIT = 200
+
+
+def parse_mix(text):
+    """Parse 'op=weight,...' into a dict, unknown operations are rejected. Input: mix text."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation '{name}', choose from {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of sorted values. Input: sorted values, fraction between 0 and 1."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))]
+
+
+def username(index):
+    """Username of a simulated user. Input: user index."""
+    return f"load{index}"
+
+
+def prepare(url, users, tasks_per_user, pragmas):
+    """Create the schema, the simulated users and their starting tasks. Input: database URL, users,
+    tasks per user, pragmas. Returns the user ids by user index."""
+    engine = make_engine(url, pragmas=pragmas)
+    init_db(engine)
+    session = sessionmaker(bind=engine)()
+    ids = []
+    for index in range(users):
+        # Users of an earlier run on the same file are reused
+        create_user(session, username(index), f"password{index}")
+        ids.append(session.query(User.user_id).filter_by(username=username(index)).scalar())
+    statement = insert(Task.__table__).prefix_with("OR IGNORE", dialect="sqlite")
+    batch = []
+    for values in generate_tasks(users * tasks_per_user, users=users):
+        values["user_id"] = ids[values["user_id"] - 1]
+        batch.append(values)
+        if len(batch) >= 10000:
+            session.execute(statement, batch)
+            batch = []
+    if batch:
+        session.execute(statement, batch)
+    session.commit()
+    session.close()
+    engine.dispose()
+    return ids
+
+
+def simulate_user(engine, index, user_id, mix, deadline, seed):
+    """Run random operations of one user until the deadline. Input: engine, user index, user_id, operation mix,
+    deadline (time.time()), seed. Returns {operation: [(latency ms, outcome)]} with outcome ok, locked or error."""
+    rng = random.Random(seed)
+    session = sessionmaker(bind=engine)()
+    names, weights = list(mix), list(mix.values())
+    samples = defaultdict(list)
+    store = TaskStore()
+    created = 0
+
+    def run(operation):
+        nonlocal store, created
+        if operation == "login":
+            authenticate(session, username(index), f"password{index}")
+        elif operation == "create_user":
+            created += 1
+            create_user(session, f"load{index}-{os.getpid()}-{created}-{uuid.uuid4().hex[:6]}", "password")
+        elif operation == "list":
+            store = TaskStore(L.load_tasks(session, user_id, sorted_column="Due Date", limit=LIST_LIMIT))
+        elif operation == "save":
+            session.add(Task(user_id=user_id, title=f"Load task {rng.random():.6f}",
+                             description="created by the load driver",
+                             due_date=date(2025, 1, 1) + timedelta(days=rng.randrange(365)),
+                             priority=rng.randint(1, 5), category=rng.choice(["Work", "Home", "School"]),
+                             complete=False))
+            session.commit()
+        elif operation == "toggle" and len(store):
+            L.toggle_complete_logic(rng.choice(list(store)).task_id, store, session)
+        elif operation == "delete" and len(store):
+            L.delete_task_logic(rng.choice(list(store)).task_id, store, session)
+
+    while time.time() < deadline:
+        operation = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            run(operation)
+            outcome = "ok"
+        except OperationalError as e:
+            session.rollback()
+            outcome = "locked" if "database is locked" in str(e) else "error"
+        except Exception:
+            session.rollback()
+            outcome = "error"
+        samples[operation].append(((time.perf_counter() - start) * 1000, outcome))
+    session.close()
+    return dict(samples)
+
+
+def run_process(url, pragmas, users, mix, deadline, seed):
+    """One worker process: a thread per simulated user on a shared engine. Input: database URL, pragmas,
+    [(user index, user_id)], mix, deadline, seed. Returns the merged samples of its users."""
+    engine = make_engine(url, pragmas=pragmas, pool_size=len(users))
+    merged = defaultdict(list)
+    with ThreadPoolExecutor(max_workers=len(users)) as pool:
+        futures = [pool.submit(simulate_user, engine, index, user_id, mix, deadline, seed * 1000 + index)
+                   for index, user_id in users]
+        for future in futures:
+            for operation, values in future.result().items():
+                merged[operation].extend(values)
+    engine.dispose()
+    return dict(merged)
+
+
+def summarize(samples, elapsed):
+    """Build the report rows. Input: {operation: [(latency ms, outcome)]}, wall time in seconds.
+    Returns one dict per operation, plus a 'total' row."""
+    rows = []
+    everything = []
+    for operation in sorted(samples):
+        values = samples[operation]
+        everything.extend(values)
+        rows.append(_summary_row(operation, values, elapsed))
+    rows.append(_summary_row("total", everything, elapsed))
+    return rows
+
+
+def _summary_row(name, values, elapsed):
+    """Helper function. Counts, throughput and latency percentiles of one operation. Input: name, samples, seconds."""
+    ordered = sorted(latency for latency, _ in values)
+    outcomes = [outcome for _, outcome in values]
+    return dict(operation=name, count=len(values), per_second=len(values) / elapsed if elapsed else 0.0,
+                p50=percentile(ordered, 0.50), p95=percentile(ordered, 0.95), p99=percentile(ordered, 0.99),
+                locked=outcomes.count("locked"), errors=outcomes.count("error"))
+
+
+def print_report(rows):
+    """Print the report table. Input: summarize() rows."""
+    print(f"{'operation':<12} {'count':>8} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'locked':>7} {'errors':>7}")
+    for row in rows:
+        print(f"{row['operation']:<12} {row['count']:>8} {row['per_second']:>9.1f} {row['p50']:>9.2f} "
+              f"{row['p95']:>9.2f} {row['p99']:>9.2f} {row['locked']:>7} {row['errors']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", help="SQLite file to use, a temporary one by default")
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4, help="simulated users per process")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--tasks-per-user", type=int, default=500)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="operation weights, e.g. list=50,save=20,toggle=15,delete=9,login=5,create_user=1")
+    parser.add_argument("--no-tuning", action="store_true", help="use SQLite's default pragmas")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # None applies config.SQLITE_PRAGMAS
+    pragmas = {} if args.no_tuning else None
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.database or os.path.join(tmp, "load.db")
+        url = "sqlite:///" + path
+        ids = prepare(url, args.processes * args.threads, args.tasks_per_user, pragmas)
+        users = list(enumerate(ids))
+        deadline = time.time() + args.duration
+        start = time.time()
+        samples = defaultdict(list)
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            futures = [pool.submit(run_process, url, pragmas, users[p::args.processes], args.mix, deadline,
+                                   args.seed + p)
+                       for p in range(args.processes)]
+            for future in futures:
+                for operation, values in future.result().items():
+                    samples[operation].extend(values)
+        print(f"{args.processes} processes x {args.threads} users, {time.time() - start:.1f} s, "
+              f"{'default' if args.no_tuning else 'tuned'} pragmas")
+        print_report(summarize(samples, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Insert throughput and database file size of the tasks table with UUID and integer primary keys.
+
+Run: python -m app.benchmarks.primary_key [--tasks 1000000] [--batch 10000]
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+
+from app.benchmarks.synthetic import generate_tasks
+from app.database.db import make_engine
+
+# Tasks table and list view indexes with only the key column changing, no triggers or search index,
+# so the numbers show the cost of the key itself
+TABLE = """CREATE TABLE tasks (
+    task_id {key},
+    title VARCHAR NOT NULL,
+    user_id INTEGER,
+    description VARCHAR,
+    due_date DATE NOT NULL,
+    priority INTEGER NOT NULL,
+    category VARCHAR NOT NULL,
+    complete BOOLEAN NOT NULL,
+    version INTEGER DEFAULT '0' NOT NULL)"""
+INDEXES = [
+    "CREATE INDEX ix_tasks_user_complete_due ON tasks (user_id, complete, due_date, task_id)",
+    "CREATE INDEX ix_tasks_user_category ON tasks (user_id, category, task_id)",
+    "CREATE INDEX ix_tasks_user_due ON tasks (user_id, due_date, task_id)",
+    "CREATE INDEX ix_tasks_user_priority ON tasks (user_id, priority, task_id)",
+    "CREATE INDEX ix_tasks_user_version ON tasks (user_id, version)",
+]
+INSERT = ("INSERT INTO tasks (task_id, title, user_id, description, due_date, priority, category, complete) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+
+# Key column definition and id generator of each variant, None lets SQLite number the row
+KEYS = {
+    "uuid4 text": ("VARCHAR NOT NULL PRIMARY KEY", lambda: str(uuid.uuid4())),
+    "uuid4 blob": ("BLOB NOT NULL PRIMARY KEY", lambda: uuid.uuid4().bytes),
+    "integer": ("INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT", lambda: None),
+}
+
+
+def run_variant(path, key, count, batch_size):
+    """Create a database with one key variant and insert count tasks, one transaction per batch.
+    Input: file path, KEYS name, task count, rows per batch. Returns a result dict."""
+    definition, new_id = KEYS[key]
+    engine = make_engine("sqlite:///" + path)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(TABLE.format(key=definition))
+        for statement in INDEXES:
+            connection.exec_driver_sql(statement)
+
+    elapsed = 0.0
+    batch = []
+
+    def insert(rows):
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            connection.exec_driver_sql(INSERT, rows)
+        return time.perf_counter() - start
+
+    # Rows are generated outside the timed inserts
+    for values in generate_tasks(count):
+        batch.append((new_id(), values["title"], values["user_id"], values["description"],
+                      values["due_date"].isoformat(), values["priority"], values["category"], values["complete"]))
+        if len(batch) >= batch_size:
+            elapsed += insert(batch)
+            batch = []
+    if batch:
+        elapsed += insert(batch)
+
+    with engine.connect() as connection:
+        # Move the WAL into the database file, so the file size is the whole database
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        page_size = connection.exec_driver_sql("PRAGMA page_size").scalar()
+        pages = connection.exec_driver_sql("PRAGMA page_count").scalar()
+    engine.dispose()
+    return dict(key=key, tasks=count, seconds=round(elapsed, 3), per_second=round(count / elapsed) if elapsed else 0,
+                mib=round(pages * page_size / 2 ** 20, 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=10000, help="rows per transaction")
+    parser.add_argument("--keys", nargs="+", choices=list(KEYS), default=list(KEYS))
+    args = parser.parse_args()
+
+    print(f"{'primary key':<12} {'tasks':>9} {'seconds':>9} {'tasks/s':>9} {'size MiB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for number, key in enumerate(args.keys):
+            row = run_variant(os.path.join(tmp, f"keys{number}.db"), key, args.tasks, args.batch)
+            print(f"{row['key']:<12} {row['tasks']:>9} {row['seconds']:>9.2f} {row['per_second']:>9} {row['mib']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
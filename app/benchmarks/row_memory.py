@@ -0,0 +1,86 @@
+"""Load time and memory per task of the list view: ORM Task objects against plain TaskRow objects.
+
+Run: python -m app.benchmarks.row_memory [--sizes 10000 100000] [--repeat 5] [--words 200 400]
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy.orm import sessionmaker
+
+from app.benchmarks.synthetic import populate
+from app.database.db import init_db, make_engine
+from app.database.queries import query_tasks
+
+DEFAULT_SIZES = (10000, 100000)
+# (min, max) words per generated description
+DEFAULT_WORDS = (0, 30)
+# Every generated task belongs to one user, so a single load returns all of them
+USER_ID = 1
+
+
+def measure_load(db, rows, repeat):
+    """Time a full list load and measure the memory the loaded tasks keep. Input: session, TaskRow flag,
+    repetitions. Returns (best ms, retained bytes, task count)."""
+    timings = []
+    for _ in range(repeat):
+        # Every load starts from an empty identity map, like a fresh reader session
+        db.expunge_all()
+        start = time.perf_counter()
+        query_tasks(db, USER_ID, sorted_column="Due Date", rows=rows)
+        timings.append((time.perf_counter() - start) * 1000)
+    db.expunge_all()
+    gc.collect()
+    # Retained memory: what is still allocated while the result is kept, temporary allocations are not counted
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tasks = query_tasks(db, USER_ID, sorted_column="Due Date", rows=rows)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    count = len(tasks)
+    del tasks
+    db.expunge_all()
+    return min(timings), retained, count
+
+
+def run_size(size, repeat, description_words=DEFAULT_WORDS):
+    """Compare both read paths on one generated database. Input: task count, repetitions, (min, max) words per
+    description (optional).
+    Returns result dicts with kind, size, best_ms and bytes_per_task."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine("sqlite:///" + os.path.join(tmp, "bench.db"))
+        init_db(engine)
+        db = sessionmaker(bind=engine, expire_on_commit=False)()
+        populate(db, size, users=1, description_words=description_words)
+        for kind, rows in (("orm", False), ("rows", True)):
+            best, retained, count = measure_load(db, rows, repeat)
+            results.append(dict(kind=kind, size=count, best_ms=round(best, 3),
+                                bytes_per_task=round(retained / count) if count else 0))
+        db.close()
+        engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--words", type=int, nargs=2, default=list(DEFAULT_WORDS), metavar=("MIN", "MAX"),
+                        help="words per task description")
+    args = parser.parse_args()
+
+    print(f"{'read path':<10} {'tasks':>9} {'best ms':>11} {'bytes/task':>11}")
+    for size in args.sizes:
+        for row in run_size(size, args.repeat, tuple(args.words)):
+            print(f"{row['kind']:<10} {row['size']:>9} {row['best_ms']:>11.3f} {row['bytes_per_task']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Latency of the task search box over a large synthetic task list.
+
+Run: python -m app.benchmarks.search_latency [--tasks N] [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.benchmarks.synthetic import populate, vocabulary
+from app.database.db import init_db, make_engine
+from app.database.queries import search_tasks
+
+USERS = 5
+
+
+def measure(db, text, repeat):
+    """Time one search repeatedly. Input: session, search text, repetitions. Returns (results, latencies in ms)."""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = search_tasks(db, 1, text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return len(results), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    words = vocabulary()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine("sqlite:///" + os.path.join(tmp, "bench.db"))
+        init_db(engine)
+        db = sessionmaker(bind=engine)()
+        populate(db, args.tasks, users=USERS, description_words=(12, 12), words=words)
+        # Short and long prefixes, a whole word, and two words
+        for text in (words[0][:2], words[1][:4], words[2], f"{words[3]} {words[4][:3]}"):
+            found, latencies = measure(db, text, args.repeat)
+            print(f"{text!r:<22} {found:4d} results   p50 {statistics.median(latencies):7.3f} ms   "
+                  f"max {max(latencies):7.3f} ms")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
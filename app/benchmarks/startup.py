@@ -0,0 +1,78 @@
+"""Startup import report: what the GUI imports before the login window appears, and how long it takes.
+
+Run: python -m app.benchmarks.startup [--top 15] [--budget-ms 500]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Imported before the first frame is shown: the entry point, then App.switch_to_login()
+STARTUP_MODULES = ("app.main", "app.gui.login_frame")
+# Must stay off the startup path, they are loaded on first database use or on the first report
+DEFERRED_MODULES = ("sqlalchemy", "matplotlib", "numpy", "bcrypt", "app.database.db", "app.gui.task_list_frame")
+DEFAULT_BUDGET_MS = 500
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Child script: import the startup modules in a fresh interpreter, report the time and the deferred modules loaded
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps(dict(ms=elapsed, loaded=[m for m in {deferred!r} if m in sys.modules])))
+"""
+
+
+def _run(args):
+    """Helper function. Run a Python child process from the repository root. Input: interpreter arguments."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def probe(modules=STARTUP_MODULES, deferred=DEFERRED_MODULES):
+    """Import modules in a fresh interpreter. Input: modules, modules that should not be loaded.
+    Returns (import time in ms, deferred modules that were loaded anyway)."""
+    result = json.loads(_run(["-c", _PROBE.format(modules=tuple(modules), deferred=tuple(deferred))]).stdout)
+    return result["ms"], result["loaded"]
+
+
+def import_times(modules=STARTUP_MODULES):
+    """Per-module import times from python -X importtime. Input: modules.
+    Returns [(module, self µs, cumulative µs)] in import order."""
+    stderr = _run(["-X", "importtime", "-c", "; ".join(f"import {name}" for name in modules)]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            rows.append((name, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+
+    rows = import_times()
+    print(f"{'module':<48} {'self ms':>9} {'cumulative ms':>14}")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{name:<48} {self_us / 1000:>9.2f} {cumulative_us / 1000:>14.2f}")
+    print(f"\n{len(rows)} modules, {sum(row[1] for row in rows) / 1000:.1f} ms import time in total")
+
+    elapsed, loaded = probe()
+    print(f"Startup imports: {elapsed:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if loaded:
+        print("Loaded at startup but should be deferred: " + ", ".join(loaded))
+    if loaded or elapsed > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
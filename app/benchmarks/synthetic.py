@@ -0,0 +1,54 @@
+"""Deterministic synthetic task data for benchmarks. The same options and seed always give the same tasks."""
+import random
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+
+from app.models.task import Task
+from app.models.user import User
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def vocabulary(size=5000, seed=0):
+    """Return random words of 3-9 letters. Input: number of words, seed."""
+    rng = random.Random(seed)
+    return ["".join(rng.choice(LETTERS) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+
+def generate_tasks(count, users=10, categories=8, description_words=(0, 30), due_days=365,
+                   complete_ratio=0.3, start=date(2025, 1, 1), seed=0, words=None):
+    """Yield task column values, spread round-robin over user ids 1..users.
+    Input: task count, users, categories, (min, max) words per description, due-date spread in days from start,
+    share of completed tasks, first due date, seed, vocabulary (optional)."""
+    rng = random.Random(seed)
+    words = words or vocabulary(seed=seed)
+    category_names = [f"Category {i}" for i in range(categories)]
+    low, high = description_words
+    for i in range(count):
+        yield dict(
+            task_id=i + 1,
+            user_id=1 + i % users,
+            title=" ".join(rng.choices(words, k=rng.randint(1, 4))),
+            description=" ".join(rng.choices(words, k=rng.randint(low, high))),
+            due_date=start + timedelta(days=rng.randrange(due_days)),
+            priority=rng.randint(1, 5),
+            category=rng.choice(category_names),
+            complete=rng.random() < complete_ratio,
+        )
+
+
+def populate(session, count, users=10, batch_size=10000, **options):
+    """Insert users 1..users and count generated tasks in batches, then commit.
+    Input: session, task count, users, rows per INSERT, generate_tasks() options."""
+    session.execute(insert(User.__table__), [dict(user_id=user_id, username=f"bench{user_id}", password_hash="x")
+                                             for user_id in range(1, users + 1)])
+    batch = []
+    for values in generate_tasks(count, users=users, **options):
+        batch.append(values)
+        if len(batch) >= batch_size:
+            session.execute(insert(Task.__table__), batch)
+            batch = []
+    if batch:
+        session.execute(insert(Task.__table__), batch)
+    session.commit()
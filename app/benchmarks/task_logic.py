@@ -0,0 +1,176 @@
+"""Timing and peak-memory benchmarks of the task_logic hot paths over synthetic task lists.
+
+Run: python -m app.benchmarks.task_logic [--sizes 1000 10000 100000 1000000] [--save FILE] [--compare FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy.orm import sessionmaker
+
+import app.testing.task_logic as L
+from app.benchmarks.synthetic import populate
+from app.database.db import init_db, make_engine
+from app.store.task_store import TaskStore
+from app.store.columnar import TaskColumns
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+# A result this much slower than the baseline counts as a regression
+DEFAULT_THRESHOLD = 1.25
+
+
+def measure(function, repeat, setup=None):
+    """Time a function and record its peak traced allocation. Input: function, repetitions,
+    setup run untimed before every call (optional). Returns (best ms, mean ms, peak KiB)."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    # Memory is measured on a separate call, tracing slows allocations down
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(timings), statistics.mean(timings), peak / 1024
+
+
+def run_size(size, repeat, **options):
+    """Run every benchmark on one generated database. Input: task count, repetitions, generate_tasks() options.
+    Returns result dicts with name, size, best_ms, mean_ms and peak_kib."""
+    results = []
+
+    def record(name, function, setup=None):
+        best, mean, peak = measure(function, repeat, setup)
+        results.append(dict(name=name, size=size, best_ms=round(best, 3), mean_ms=round(mean, 3),
+                            peak_kib=round(peak, 1)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine("sqlite:///" + os.path.join(tmp, "bench.db"))
+        init_db(engine)
+        # Sessions of the GUI's database threads keep loaded tasks after a commit, so do these
+        db = sessionmaker(bind=engine, expire_on_commit=False)()
+        populate(db, size, **options)
+
+        # Loading starts from an empty identity map every time, like a fresh session
+        record("load_tasks", lambda: L.load_tasks(db), setup=db.expunge_all)
+        record("load_tasks user sorted", lambda: L.load_tasks(db, 1, sorted_column="Due Date"), setup=db.expunge_all)
+
+        tasks = L.load_tasks(db)
+        category = tasks[0].category
+        record("filter_tasks list", lambda: L.filter_tasks(tasks, category))
+        record("sort_tasks_logic list Due Date", lambda: L.sort_tasks_logic(tasks, "Due Date", False))
+        record("sort_tasks_logic list Description", lambda: L.sort_tasks_logic(tasks, "Description", True))
+        record("report_counts_logic list", lambda: L.report_counts_logic(tasks))
+
+        record("TaskStore build", lambda: TaskStore(tasks))
+        store = TaskStore(tasks)
+        # Sorted views are built by the first call, later calls read them
+        L.sort_tasks_logic(store, "Due Date", False)
+        record("filter_tasks store", lambda: L.filter_tasks(store, category))
+        record("sort_tasks_logic store Due Date", lambda: L.sort_tasks_logic(store, "Due Date", False))
+        record("report_counts_logic store", lambda: L.report_counts_logic(store))
+        # Each call re-indexes the next task, removing and inserting its entry of the maintained sorted view
+        updated = iter(list(tasks))
+        record("TaskStore update", lambda: store.update(next(updated)))
+
+        record("TaskColumns build", lambda: TaskColumns(tasks))
+        columns = TaskColumns(tasks)
+        record("filter_tasks columns", lambda: L.filter_tasks(columns, category))
+        record("sort_tasks_logic columns Due Date", lambda: L.sort_tasks_logic(columns, "Due Date", False))
+        record("sort_tasks_logic columns Description", lambda: L.sort_tasks_logic(columns, "Description", True))
+        record("sort columns Category, Priority desc", lambda: columns.select(
+            sort=[("Category", False), ("Priority", True)]))
+        record("report_counts_logic columns", lambda: L.report_counts_logic(columns))
+
+        # Each call deletes the next task, the commit is part of the cost
+        victims = iter(list(tasks))
+        state = {"tasks": list(tasks)}
+
+        def delete_from_list():
+            state["tasks"], _ = L.delete_task_logic(next(victims).task_id, state["tasks"], db)
+        record("delete_task_logic list", delete_from_list)
+        record("delete_task_logic store", lambda: L.delete_task_logic(next(victims).task_id, store, db))
+
+        db.close()
+        engine.dispose()
+    return results
+
+
+def compare(baseline, results, threshold=DEFAULT_THRESHOLD):
+    """Match results with a saved baseline by name and size. Input: baseline results, results, slowdown threshold.
+    Returns (name, size, baseline ms, current ms, ratio, regressed) tuples."""
+    saved = {(row["name"], row["size"]): row for row in baseline}
+    rows = []
+    for row in results:
+        base = saved.get((row["name"], row["size"]))
+        if base is None:
+            continue
+        ratio = row["best_ms"] / base["best_ms"] if base["best_ms"] else 1.0
+        rows.append((row["name"], row["size"], base["best_ms"], row["best_ms"], ratio, ratio > threshold))
+    return rows
+
+
+def print_results(results):
+    """Print the timing and memory table. Input: result dicts."""
+    print(f"{'benchmark':<36} {'tasks':>9} {'best ms':>11} {'mean ms':>11} {'peak KiB':>11}")
+    for row in results:
+        print(f"{row['name']:<36} {row['size']:>9} {row['best_ms']:>11.3f} {row['mean_ms']:>11.3f} "
+              f"{row['peak_kib']:>11.1f}")
+
+
+def print_comparison(rows):
+    """Print the baseline comparison table. Input: compare() rows."""
+    print(f"\n{'benchmark':<36} {'tasks':>9} {'baseline ms':>12} {'now ms':>11} {'ratio':>7}")
+    for name, size, before, now, ratio, regressed in rows:
+        print(f"{name:<36} {size:>9} {before:>12.3f} {now:>11.3f} {ratio:>7.2f}{'  REGRESSION' if regressed else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--categories", type=int, default=8)
+    parser.add_argument("--description-words", type=int, nargs=2, default=(0, 30), metavar=("MIN", "MAX"))
+    parser.add_argument("--due-days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="FILE", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare with a saved baseline, exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    options = dict(users=args.users, categories=args.categories, description_words=tuple(args.description_words),
+                   due_days=args.due_days, seed=args.seed)
+    results = []
+    for size in args.sizes:
+        results.extend(run_size(size, args.repeat, **options))
+    print_results(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(dict(created=datetime.now().isoformat(timespec="seconds"), python=platform.python_version(),
+                           options=options, results=results), file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            rows = compare(json.load(file)["results"], results, args.threshold)
+        print_comparison(rows)
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Time to the first rows of the task list on login: warm-start snapshot against a cold database load.
+
+Run: python -m app.benchmarks.warm_start [--sizes 1000 10000 100000] [--repeat 5]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.benchmarks.synthetic import populate
+from app.database.db import init_db, make_engine
+from app.database.queries import count_tasks, current_version, query_categories, query_tasks
+from app.gui.virtual_list import window_range
+from app.store.snapshot import open_snapshot, save_snapshot
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Every generated task belongs to one user
+USER_ID = 1
+# List view settings: rows above which the list is virtual, rows on screen and overscan
+VIRTUAL_THRESHOLD = 2000
+VISIBLE = 10
+OVERSCAN = 10
+SORT = dict(category="All", sorted_column="Due Date", sort_reverse=False)
+
+
+def first_load(session):
+    """Load what the list view needs before its first paint, like refresh_tasks(): every row of a small list,
+    the count and the first window of a virtual one. Input: session. Returns the rows."""
+    current_version(session)
+    query_categories(session, USER_ID)
+    total = count_tasks(session, USER_ID)
+    if total <= VIRTUAL_THRESHOLD:
+        return query_tasks(session, USER_ID, rows=True, **SORT)
+    _, start, stop = window_range(0, VISIBLE, total, OVERSCAN)
+    return query_tasks(session, USER_ID, limit=stop - start, offset=start, rows=True, **SORT)
+
+
+def run_size(size, repeat):
+    """Time the first rows from a fresh database connection and from a snapshot saved after that load.
+    Input: task count, repetitions. Returns a result dict with size, rows, database_ms, snapshot_ms and bytes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        engine = make_engine("sqlite:///" + path)
+        init_db(engine)
+        db = sessionmaker(bind=engine)()
+        populate(db, size, users=1)
+        db.close()
+        engine.dispose()
+
+        database_ms = []
+        for _ in range(repeat):
+            # A new engine per run, like the first query after the app started
+            engine = make_engine("sqlite:///" + path)
+            db = sessionmaker(bind=engine)()
+            start = time.perf_counter()
+            rows = first_load(db)
+            database_ms.append((time.perf_counter() - start) * 1000)
+            version = current_version(db)
+            db.close()
+            engine.dispose()
+
+        snapshot_file = os.path.join(tmp, "tasks.snapshot")
+        save_snapshot(snapshot_file, USER_ID, version, rows, dict(SORT, archived=False, first=0, categories=[]),
+                      total=size)
+        snapshot_ms = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with open_snapshot(snapshot_file, USER_ID) as snapshot:
+                shown = snapshot.rows()
+            snapshot_ms.append((time.perf_counter() - start) * 1000)
+        return dict(size=size, rows=len(shown), database_ms=round(min(database_ms), 3),
+                    snapshot_ms=round(min(snapshot_ms), 3), bytes=os.path.getsize(snapshot_file))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>9} {'rows':>6} {'database ms':>12} {'snapshot ms':>12} {'snapshot KiB':>13}")
+    for size in args.sizes:
+        row = run_size(size, args.repeat)
+        print(f"{row['size']:>9} {row['rows']:>6} {row['database_ms']:>12.3f} {row['snapshot_ms']:>12.3f} "
+              f"{row['bytes'] / 1024:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+from dotenv import load_dotenv
+
+# Read settings from a .env file in the working directory, real environment variables take precedence
+load_dotenv()
+
+
+def env_str(name, default):
+    """Read a string setting. Input: variable name, default value."""
+    value = os.getenv(name)
+    return value.strip() if value and value.strip() else default
+
+
+def env_int(name, default):
+    """Read an integer setting, the default is used when unset or invalid. Input: variable name, default value."""
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def env_bool(name, default):
+    """Read a boolean setting (1/true/yes/on). Input: variable name, default value."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Database location, any SQLAlchemy URL
+DATABASE_URL = env_str("EVERTASK_DATABASE_URL", "sqlite:///task_manager.db")
+
+# SQLite tuning applied to every new connection. WAL lets readers run during a write, and with
+# synchronous=NORMAL a commit no longer waits for an fsync of the database file.
+SQLITE_PRAGMAS = {
+    "journal_mode": env_str("EVERTASK_SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": env_str("EVERTASK_SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": env_int("EVERTASK_SQLITE_MMAP_SIZE", 256 * 1024 * 1024),
+    # Negative values are KiB, 64 MiB page cache per connection
+    "cache_size": env_int("EVERTASK_SQLITE_CACHE_SIZE", -64 * 1024),
+    "temp_store": env_str("EVERTASK_SQLITE_TEMP_STORE", "MEMORY"),
+    "busy_timeout": env_int("EVERTASK_SQLITE_BUSY_TIMEOUT_MS", 5000),
+}
+
+# Connection pool sizing, for the GUI's worker threads
+DB_POOL_SIZE = env_int("EVERTASK_DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = env_int("EVERTASK_DB_MAX_OVERFLOW", 5)
+DB_POOL_TIMEOUT = env_int("EVERTASK_DB_POOL_TIMEOUT", 30)
+
+# Debounce of the write-behind queue for toggles and edits, 0 commits every change immediately
+WRITE_BEHIND_MS = env_int("EVERTASK_WRITE_BEHIND_MS", 500)
+
+# bcrypt work factor (4-31) for new password hashes, each step doubles the hashing time.
+# Stored hashes with another factor are rehashed at the next successful login.
+BCRYPT_ROUNDS = env_int("EVERTASK_BCRYPT_ROUNDS", 12)
+
+# Remember-me login: days a token stays valid, and the file keeping it on this machine
+REMEMBER_DAYS = env_int("EVERTASK_REMEMBER_DAYS", 30)
+REMEMBER_FILE = env_str("EVERTASK_REMEMBER_FILE", os.path.join(os.path.expanduser("~"), ".evertask_session"))
+
+# Opt-in instrumentation: SQL, GUI operation and Tk stall timings, see Menu > Diagnostics.
+# A stall is a Tk event-loop delay of at least PROFILE_STALL_MS, statements slower than PROFILE_SLOW_MS are logged.
+# With PROFILE_FILE set, the measurements are written there as JSON when the app closes.
+PROFILE = env_bool("EVERTASK_PROFILE", False)
+PROFILE_FILE = env_str("EVERTASK_PROFILE_FILE", "")
+PROFILE_STALL_MS = env_int("EVERTASK_PROFILE_STALL_MS", 50)
+PROFILE_SLOW_MS = env_int("EVERTASK_PROFILE_SLOW_MS", 100)
+
+# Tasks completed more than ARCHIVE_DAYS days ago are moved to the archive table in the background,
+# ARCHIVE_BATCH tasks per transaction. 0 days turns the archiver off.
+ARCHIVE_DAYS = env_int("EVERTASK_ARCHIVE_DAYS", 30)
+ARCHIVE_BATCH = env_int("EVERTASK_ARCHIVE_BATCH", 500)
+
+# Warm-start snapshot: the displayed task rows are saved per user when the app closes and shown at once on the
+# next login, before the database has answered
+SNAPSHOT = env_bool("EVERTASK_SNAPSHOT", True)
+SNAPSHOT_DIR = env_str("EVERTASK_SNAPSHOT_DIR", os.path.join(os.path.expanduser("~"), ".evertask_cache"))
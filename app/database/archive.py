@@ -0,0 +1,97 @@
+"""Archiving of old completed tasks: tasks completed more than N days ago are moved from tasks to archived_tasks,
+so the list view's table and indexes only hold the working set.
+
+Run: python -m app.database.archive [--days 30] [--batch 500]
+"""
+import argparse
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app import config
+from app.models.task import Task
+from app.models.archive import ArchivedTask, TaskCompletion
+
+tasks_table = Task.__table__
+archive_table = ArchivedTask.__table__
+completions_table = TaskCompletion.__table__
+# Columns copied between tasks and archived_tasks, generated columns are computed by each table
+COLUMNS = tuple(column.name for column in tasks_table.columns if column.computed is None)
+
+
+def archive_batch(session: Session, days=config.ARCHIVE_DAYS, batch_size=config.ARCHIVE_BATCH):
+    """Move up to batch_size tasks completed more than days ago, oldest completion first, with one INSERT ... SELECT
+    and one DELETE. The deletes leave tombstones, so open list views drop the tasks with their next sync.
+    Input: session, age in days, batch size. Returns the number of archived tasks. The caller commits."""
+    cutoff = func.datetime("now", f"-{int(days)} days")
+    task_ids = session.execute(select(completions_table.c.task_id)
+                               .where(completions_table.c.completed_at < cutoff)
+                               .order_by(completions_table.c.completed_at)
+                               .limit(batch_size)).scalars().all()
+    if not task_ids:
+        return 0
+    rows = (select(*(tasks_table.c[name] for name in COLUMNS), completions_table.c.completed_at)
+            .join_from(tasks_table, completions_table, completions_table.c.task_id == tasks_table.c.task_id)
+            .where(tasks_table.c.task_id.in_(task_ids)))
+    session.execute(insert(archive_table).from_select(COLUMNS + ("completed_at",), rows))
+    return session.execute(delete(tasks_table).where(tasks_table.c.task_id.in_(task_ids))).rowcount
+
+
+def archive_completed(session: Session, days=config.ARCHIVE_DAYS, batch_size=config.ARCHIVE_BATCH):
+    """Archive every task completed more than days ago, committing after each batch so the write lock is
+    released in between. Input: session, age in days, batch size. Returns the number of archived tasks."""
+    archived = 0
+    while True:
+        try:
+            moved = archive_batch(session, days, batch_size)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        archived += moved
+        if moved < batch_size:
+            return archived
+
+
+def restore_tasks(session: Session, task_ids, user_id=None):
+    """Move archived tasks back to tasks, e.g. before they are edited. Their completion time is kept, so the
+    archiver takes them again unless they are reopened. Input: session, task ids, owner user_id (optional).
+    Returns the number of restored tasks. The caller commits."""
+    condition = archive_table.c.task_id.in_(list(task_ids))
+    if user_id is not None:
+        condition = condition & (archive_table.c.user_id == user_id)
+    # One primary key lookup per id, most edits are of live tasks and stop here
+    found = session.execute(select(archive_table.c.task_id, archive_table.c.complete, archive_table.c.completed_at)
+                            .where(condition)).all()
+    if not found:
+        return 0
+    condition = archive_table.c.task_id.in_([task_id for task_id, _, _ in found])
+    session.execute(insert(tasks_table).from_select(
+        COLUMNS, select(*(archive_table.c[name] for name in COLUMNS)).where(condition)))
+    # The insert trigger stamped the restored tasks as completed now, they keep their original time
+    completions = [dict(task_id=task_id, completed_at=completed_at)
+                   for task_id, complete, completed_at in found if complete and completed_at is not None]
+    if completions:
+        session.execute(insert(completions_table).prefix_with("OR REPLACE", dialect="sqlite"), completions)
+    session.execute(delete(archive_table).where(condition))
+    return len(found)
+
+
+def main(argv=None):
+    from app.database.db import init_db, SessionLocal
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=config.ARCHIVE_DAYS, help="archive tasks completed this long ago")
+    parser.add_argument("--batch", type=int, default=config.ARCHIVE_BATCH, help="tasks moved per transaction")
+    args = parser.parse_args(argv)
+
+    init_db()
+    session = SessionLocal()
+    try:
+        print(f"Archived {archive_completed(session, args.days, args.batch)} tasks.")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
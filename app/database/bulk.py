@@ -0,0 +1,50 @@
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.models.archive import ArchivedTask
+from app.database.archive import restore_tasks
+
+# Ids per statement, keeps the IN list under SQLite's bound parameter limit
+CHUNK_SIZE = 500
+
+tasks_table = Task.__table__
+archive_table = ArchivedTask.__table__
+
+
+def bulk_update_tasks(session: Session, user_id, task_ids, **values):
+    """Set the same values on many tasks with one UPDATE ... WHERE task_id IN (...) per chunk of ids.
+    Input: session, owner user_id (None skips the owner check), task ids, column=value pairs.
+    Returns the number of updated rows. The caller commits."""
+    updated = 0
+    for chunk in _chunks(task_ids):
+        # Archived tasks shown with "Show archived" are moved back to tasks before they change
+        restore_tasks(session, chunk, user_id)
+        statement = update(tasks_table).where(tasks_table.c.task_id.in_(chunk)).values(**values)
+        if user_id is not None:
+            statement = statement.where(tasks_table.c.user_id == user_id)
+        updated += session.execute(statement).rowcount
+    return updated
+
+
+def bulk_delete_tasks(session: Session, user_id, task_ids, archived=False):
+    """Delete many tasks with one DELETE ... WHERE task_id IN (...) per chunk of ids.
+    Input: session, owner user_id, task ids, delete from the archive too (optional).
+    Returns the number of deleted rows. The caller commits."""
+    deleted = 0
+    for chunk in _chunks(task_ids):
+        statement = delete(tasks_table).where(tasks_table.c.task_id.in_(chunk), tasks_table.c.user_id == user_id)
+        deleted += session.execute(statement).rowcount
+        if archived:
+            # Archived tasks shown with "Show archived" are deleted from the archive directly
+            statement = delete(archive_table).where(archive_table.c.task_id.in_(chunk),
+                                                    archive_table.c.user_id == user_id)
+            deleted += session.execute(statement).rowcount
+    return deleted
+
+
+def _chunks(task_ids):
+    """Helper function. Split ids into lists of at most CHUNK_SIZE. Input: task ids."""
+    task_ids = list(task_ids)
+    for start in range(0, len(task_ids), CHUNK_SIZE):
+        yield task_ids[start:start + CHUNK_SIZE]
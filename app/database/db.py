@@ -1,19 +1,227 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-# Assign database file
-DATABASE_URL = "sqlite:///task_manager.db"
+from app import config
+
+# Assign database file, configurable with EVERTASK_DATABASE_URL
+DATABASE_URL = config.DATABASE_URL
+
+# Accepted values of the text pragmas, the rest must be integers
+_PRAGMA_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    """Run PRAGMA statements on a new DBAPI connection. Input: sqlite3 connection, {pragma: value}."""
+    statements = []
+    for name, value in pragmas.items():
+        if name in _PRAGMA_CHOICES:
+            value = str(value).upper()
+            if value not in _PRAGMA_CHOICES[name]:
+                raise ValueError(f"Invalid value for PRAGMA {name}: {value}")
+        else:
+            value = int(value)
+        # PRAGMA does not accept bound parameters, values are validated above
+        statements.append(f"PRAGMA {name} = {value}")
+    cursor = dbapi_connection.cursor()
+    for statement in statements:
+        cursor.execute(statement)
+    cursor.close()
+
+
+def make_engine(url=DATABASE_URL, pragmas=None, **kwargs):
+    """Create an engine with the configured pool sizing and, for SQLite, the tuning pragmas.
+    Input: database URL, pragmas (optional, config.SQLITE_PRAGMAS by default), create_engine() options."""
+    url = make_url(url)
+    file_database = url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+    # Pool sizing applies to pooled file/server databases, in-memory SQLite uses a single connection per thread
+    if file_database or url.get_backend_name() != "sqlite":
+        kwargs.setdefault("pool_size", config.DB_POOL_SIZE)
+        kwargs.setdefault("max_overflow", config.DB_MAX_OVERFLOW)
+        kwargs.setdefault("pool_timeout", config.DB_POOL_TIMEOUT)
+    new_engine = create_engine(url, echo=False, **kwargs)
+    if url.get_backend_name() == "sqlite":
+        pragmas = config.SQLITE_PRAGMAS if pragmas is None else pragmas
+
+        @event.listens_for(new_engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, pragmas)
+    return new_engine
+
 
 # Create engine and bind the session
-engine = create_engine(DATABASE_URL, echo=False)
+engine = make_engine()
 SessionLocal = sessionmaker(bind=engine)
 
 # ORM base class
 Base = declarative_base()
 
-def init_db():
-    """Database initialization: create Task and User tables"""
+
+def _migration_task_indexes(connection):
+    """Migration 1: composite indexes for the task list view."""
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_complete_due ON tasks (user_id, complete, due_date, task_id)")
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_category ON tasks (user_id, category, task_id)")
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_due ON tasks (user_id, due_date, task_id)")
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_priority ON tasks (user_id, priority, task_id)")
+
+
+def _migration_sync_version(connection):
+    """Migration 2: task change counter, tombstones and the triggers maintaining them."""
+    from app.models.sync import SYNC_TRIGGERS
+    if not _has_column(connection, "tasks", "version"):
+        connection.exec_driver_sql("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+    connection.exec_driver_sql("CREATE TABLE IF NOT EXISTS sync_counter (id INTEGER NOT NULL PRIMARY KEY, value INTEGER NOT NULL)")
+    connection.exec_driver_sql("CREATE TABLE IF NOT EXISTS task_tombstones (task_id VARCHAR NOT NULL PRIMARY KEY, "
+                               "user_id INTEGER, version INTEGER NOT NULL)")
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_version ON tasks (user_id, version)")
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_task_tombstones_user_version ON task_tombstones (user_id, version)")
+    connection.exec_driver_sql("INSERT OR IGNORE INTO sync_counter (id, value) VALUES (1, 0)")
+    for trigger in SYNC_TRIGGERS:
+        connection.exec_driver_sql(trigger)
+
+
+def _migration_task_search(connection):
+    """Migration 3: FTS5 full-text index of task titles and descriptions, filled from the existing tasks."""
+    from app.models.search import SEARCH_SCHEMA
+    for statement in SEARCH_SCHEMA:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+def _migration_integer_task_ids(connection):
+    """Migration 4: rebuild tasks with an INTEGER PRIMARY KEY task_id instead of a UUID string. Tasks are numbered
+    in their insertion order, tombstones of the old ids are dropped and the search index is rebuilt."""
+    from app.models.sync import SYNC_TRIGGERS
+    from app.models.search import SEARCH_SCHEMA
+    if _column_type(connection, "tasks", "task_id") == "INTEGER":
+        return
+    connection.exec_driver_sql("""CREATE TABLE tasks_new (
+        task_id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+        title VARCHAR NOT NULL,
+        user_id INTEGER REFERENCES users (user_id),
+        description VARCHAR,
+        due_date DATE NOT NULL,
+        priority INTEGER NOT NULL,
+        category VARCHAR NOT NULL,
+        complete BOOLEAN NOT NULL,
+        version INTEGER DEFAULT '0' NOT NULL)""")
+    # The new table has no triggers yet, so the copy keeps every task's version
+    connection.exec_driver_sql("INSERT INTO tasks_new (title, user_id, description, due_date, priority, category, "
+                               "complete, version) SELECT title, user_id, description, due_date, priority, category, "
+                               "complete, version FROM tasks ORDER BY rowid")
+    # Dropping the old table drops its indexes and triggers too
+    connection.exec_driver_sql("DROP TABLE tasks")
+    connection.exec_driver_sql("ALTER TABLE tasks_new RENAME TO tasks")
+    _migration_task_indexes(connection)
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_version ON tasks (user_id, version)")
+    # Tombstones name the old string ids, views loaded before the migration reload anyway
+    connection.exec_driver_sql("DROP TABLE IF EXISTS task_tombstones")
+    connection.exec_driver_sql("CREATE TABLE task_tombstones (task_id INTEGER NOT NULL PRIMARY KEY, "
+                               "user_id INTEGER, version INTEGER NOT NULL)")
+    connection.exec_driver_sql("CREATE INDEX ix_task_tombstones_user_version ON task_tombstones (user_id, version)")
+    for statement in SYNC_TRIGGERS + SEARCH_SCHEMA:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+def _migration_task_archive(connection):
+    """Migration 5: completion times kept by triggers and the archive table old completed tasks are moved to.
+    Tasks already completed count as completed now."""
+    from app.models.archive import COMPLETION_TRIGGERS
+    connection.exec_driver_sql("CREATE TABLE IF NOT EXISTS task_completions (task_id INTEGER NOT NULL PRIMARY KEY, "
+                               "completed_at DATETIME NOT NULL)")
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_task_completions_completed_at "
+                               "ON task_completions (completed_at)")
+    connection.exec_driver_sql("INSERT OR IGNORE INTO task_completions (task_id, completed_at) "
+                               "SELECT task_id, CURRENT_TIMESTAMP FROM tasks WHERE complete")
+    connection.exec_driver_sql("""CREATE TABLE IF NOT EXISTS archived_tasks (
+        task_id INTEGER NOT NULL PRIMARY KEY,
+        title VARCHAR NOT NULL,
+        user_id INTEGER REFERENCES users (user_id),
+        description VARCHAR,
+        due_date DATE NOT NULL,
+        priority INTEGER NOT NULL,
+        category VARCHAR NOT NULL,
+        complete BOOLEAN NOT NULL,
+        version INTEGER DEFAULT '0' NOT NULL,
+        completed_at DATETIME,
+        archived_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL)""")
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_archived_tasks_user ON archived_tasks (user_id, task_id)")
+    for trigger in COMPLETION_TRIGGERS:
+        connection.exec_driver_sql(trigger)
+
+
+def _migration_description_preview(connection):
+    """Migration 6: bounded description preview of tasks and archived tasks, a virtual generated column,
+    and the index of the Description sort."""
+    from app.models.task import DESCRIPTION_PREVIEW_SQL
+    for table in ("tasks", "archived_tasks"):
+        if not _has_column(connection, table, "description_preview"):
+            connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN description_preview VARCHAR "
+                                       f"GENERATED ALWAYS AS ({DESCRIPTION_PREVIEW_SQL}) VIRTUAL")
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_preview "
+                               "ON tasks (user_id, description_preview, task_id)")
+
+
+def _column_type(connection, table, column):
+    """Helper function. Declared type of a column, None if missing. Input: connection, table name, column name."""
+    for row in connection.exec_driver_sql(f"PRAGMA table_info({table})"):
+        if row[1] == column:
+            return row[2].upper()
+    return None
+
+
+def _has_column(connection, table, column):
+    """Helper function. Check if a table has a column, generated ones included. Input: connection, table name,
+    column name."""
+    return any(row[1] == column for row in connection.exec_driver_sql(f"PRAGMA table_xinfo({table})"))
+
+
+# Ordered schema migrations as (version, function). The applied version is kept in PRAGMA user_version.
+# Migrations are idempotent, new databases created by create_all() run them too.
+MIGRATIONS = [
+    (1, _migration_task_indexes),
+    (2, _migration_sync_version),
+    (3, _migration_task_search),
+    (4, _migration_integer_task_ids),
+    (5, _migration_task_archive),
+    (6, _migration_description_preview),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(connection):
+    """Return the schema version stored in the database file. Input: connection."""
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def run_migrations(bind=None):
+    """Apply every migration newer than the database's schema version. Input: engine (optional). Returns applied versions."""
+    bind = bind if bind is not None else engine
+    applied = []
+    with bind.begin() as connection:
+        version = get_schema_version(connection)
+        for target, migration in MIGRATIONS:
+            if target > version:
+                migration(connection)
+                # PRAGMA does not accept bound parameters, target is always an int from MIGRATIONS
+                connection.exec_driver_sql(f"PRAGMA user_version = {int(target)}")
+                applied.append(target)
+    return applied
+
+
+def init_db(bind=None):
+    """Database initialization: create missing tables, then migrate existing databases"""
     from app.models.task import Task
     from app.models.user import User
-    Base.metadata.create_all(bind=engine)
+    from app.models.sync import SyncCounter, TaskTombstone
+    from app.models.session_token import SessionToken
+    from app.models.archive import ArchivedTask, TaskCompletion
+    bind = bind if bind is not None else engine
+    Base.metadata.create_all(bind=bind)
+    run_migrations(bind)
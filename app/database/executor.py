@@ -0,0 +1,112 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+
+class DBExecutor:
+    """Runs database work off the Tk thread. One writer thread serializes writes, a small pool serves reads,
+    every worker thread has its own Session and callbacks are run back on the Tk thread."""
+    def __init__(self, bind, readers=2):
+        """Init for DBExecutor class. Input: engine, number of reader threads."""
+        # One Session per worker thread, objects stay readable after the session is closed
+        self.Session = scoped_session(sessionmaker(bind=bind, expire_on_commit=False))
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-reader")
+        # Finished jobs waiting for their callback to run on the Tk thread
+        self._results = queue.Queue()
+        # Coalescing key -> latest request queued behind the running one (or None)
+        self._coalesced = {}
+        self._lock = threading.Lock()
+        self._root = None
+
+    def submit_read(self, work, on_done=None, on_error=None):
+        """Run work(session) on a reader thread. Input: work function, result callback, error callback (optional)."""
+        self._readers.submit(self._run_and_deliver, work, on_done, on_error, False)
+
+    def submit_write(self, work, on_done=None, on_error=None):
+        """Run work(session) on the writer thread and commit. Input: work function, result callback, error callback."""
+        self._writer.submit(self._run_and_deliver, work, on_done, on_error, True)
+
+    def submit_coalesced(self, key, work, on_done=None, on_error=None, write=False):
+        """Run work(session) with at most one job per key running. Requests made while it runs are coalesced
+        into one follow-up job using the latest request, and the outdated result is dropped.
+        Input: key, work, callbacks, write (optional)."""
+        with self._lock:
+            if key in self._coalesced:
+                self._coalesced[key] = (work, on_done, on_error)
+                return
+            self._coalesced[key] = None
+        self._submit_keyed(key, work, on_done, on_error, write)
+
+    def deliver(self):
+        """Run the callbacks of finished jobs. Must be called on the Tk thread."""
+        while True:
+            try:
+                callback, value = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if not callback:
+                continue
+            # A failing callback is logged, the callbacks queued behind it still run
+            try:
+                callback(value)
+            except Exception:
+                logging.getLogger(__name__).exception("Database job callback failed")
+
+    def attach(self, root, interval=15):
+        """Poll for finished jobs with root.after(), so callbacks run in the Tk mainloop. Input: Tk root, poll ms."""
+        self._root = root
+
+        def poll():
+            # Rescheduled whatever happens, a stopped poll loop would never deliver a result again
+            try:
+                self.deliver()
+            finally:
+                if self._root is not None:
+                    self._root.after(interval, poll)
+        root.after(interval, poll)
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads, finishing queued writes first when wait is True. Input: wait (optional)."""
+        self._root = None
+        self._readers.shutdown(wait=wait, cancel_futures=True)
+        self._writer.shutdown(wait=wait)
+
+    def _submit_keyed(self, key, work, on_done, on_error, write):
+        """Helper function. Submit a coalesced job, then the request that queued behind it, if any."""
+        def run():
+            outcome = self._run(work, on_done, on_error, write)
+            with self._lock:
+                pending = self._coalesced.get(key)
+                if pending is None:
+                    del self._coalesced[key]
+                    self._results.put(outcome)
+                    return
+                self._coalesced[key] = None
+            self._submit_keyed(key, *pending, write)
+        (self._writer if write else self._readers).submit(run)
+
+    def _run_and_deliver(self, work, on_done, on_error, write):
+        """Helper function. Run one job and queue its callback for the Tk thread."""
+        self._results.put(self._run(work, on_done, on_error, write))
+
+    def _run(self, work, on_done, on_error, write):
+        """Helper function. Run one job on the current worker thread with its own session.
+        Returns the (callback, value) pair to deliver."""
+        session = self.Session()
+        try:
+            result = work(session)
+            if write:
+                session.commit()
+        except Exception as e:
+            session.rollback()
+            if on_error is None:
+                logging.getLogger(__name__).exception("Database job failed")
+            return on_error, e
+        finally:
+            # Close the session, loaded objects are handed to the Tk thread detached
+            self.Session.remove()
+        return on_done, result
@@ -0,0 +1,231 @@
+import re
+
+from sqlalchemy import and_, case, func, literal_column, or_, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.models.task import Task
+from app.models.archive import ArchivedTask
+from app.models.sync import SyncCounter, TaskTombstone
+from app.models.search import tasks_fts
+from app.store.task_row import TaskRow
+
+# Most search results shown, the best ranked come first
+SEARCH_LIMIT = 200
+
+# Columns of the list view, loaded into TaskRow objects instead of ORM-tracked Task instances.
+# The description is left out, rows carry its bounded preview
+ROW_COLUMNS = tuple(getattr(Task, name) for name in TaskRow.__slots__)
+
+# Live and archived tasks together, mapped as Task for the list view's "Show archived" mode. Built on first use,
+# aliasing configures the mappers, which needs every model imported
+_all_tasks = None
+
+
+# Treeview heading -> SQL expression used to sort by that column
+SORT_COLUMNS = {
+    '✓/x': Task.complete,
+    'Title': Task.title,
+    'Due Date': Task.due_date,
+    'Description': Task.description_preview,
+    'Priority': Task.priority,
+    'Category': Task.category,
+}
+
+
+def task_source(archived=False):
+    """Return what the list view reads: Task for live tasks, live and archived tasks as one Task alias otherwise.
+    Input: include archived flag."""
+    global _all_tasks
+    if not archived:
+        return Task
+    if _all_tasks is None:
+        columns = Task.__table__.columns
+        _all_tasks = aliased(Task, union_all(
+            select(*columns),
+            select(*(ArchivedTask.__table__.c[column.name] for column in columns)),
+        ).subquery("all_tasks"), name="all_tasks")
+    return _all_tasks
+
+
+def sort_key(source, sorted_column):
+    """Return the SQL sort expression of a list view heading for a task source. Input: source, sort column."""
+    return getattr(source, SORT_COLUMNS[sorted_column].key)
+
+
+def task_query(session: Session, user_id: int, category="All", complete=None,
+               sorted_column=None, sort_reverse=False, rows=False, archived=False):
+    """Build the list view query for one user. Input: session, user_id, category filter, completion filter,
+    sort state, select ROW_COLUMNS instead of Task, include archived tasks."""
+    source = task_source(archived)
+    query = _select(session, rows, source).filter(source.user_id == user_id)
+    # Category filter, "All" keeps every category
+    if category != "All":
+        query = query.filter(source.category == category)
+    # Completion filter, None keeps both states
+    if complete is not None:
+        query = query.filter(source.complete == complete)
+    # Sort on the selected column, task_id breaks ties in the same direction so pages are stable
+    # and the (..., sort column, task_id) indexes can be read in order, forwards or backwards
+    if sorted_column:
+        key = sort_key(source, sorted_column)
+        if sort_reverse:
+            return query.order_by(key.desc(), source.task_id.desc())
+        return query.order_by(key.asc(), source.task_id.asc())
+    return query.order_by(source.task_id)
+
+
+def query_tasks(session: Session, user_id: int, category="All", complete=None,
+                sorted_column=None, sort_reverse=False, limit=None, offset=0, after=None, rows=False,
+                archived=False):
+    """Load one page of a user's tasks, filtered and sorted in SQL. Input: session, user_id, filters, sort state,
+    page size, row offset, keyset position (optional), load TaskRow objects instead of Task (optional),
+    include archived tasks (optional)."""
+    query = task_query(session, user_id, category, complete, sorted_column, sort_reverse, rows, archived)
+    # Keyset pagination: continue after the (sort value, task_id) of the last row of the previous page
+    if after is not None:
+        query = query.filter(_after_clause(sorted_column, sort_reverse, after, task_source(archived)))
+    elif offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return fetch_rows(session, query) if rows else query.all()
+
+
+def search_tasks(session: Session, user_id: int, text, category="All", sorted_column=None, sort_reverse=False,
+                 limit=SEARCH_LIMIT, rows=False):
+    """Full-text search of a user's task titles and descriptions, every word matched as a prefix. Input: session,
+    user_id, search text, category filter, sort state (default: best match first), result limit, load TaskRows.
+    Only live tasks are indexed, archived tasks are not searched."""
+    match = fts_query(text)
+    if match is None:
+        return []
+    query = (_select(session, rows)
+             .join(tasks_fts, tasks_fts.c.rowid == Task.task_id)
+             .filter(literal_column("tasks_fts").op("MATCH")(match), Task.user_id == user_id))
+    if category != "All":
+        query = query.filter(Task.category == category)
+    if sorted_column:
+        key = SORT_COLUMNS[sorted_column]
+        query = query.order_by(key.desc(), Task.task_id.desc()) if sort_reverse else query.order_by(key, Task.task_id)
+    else:
+        # FTS5 rank is bm25(), smaller is a better match
+        query = query.order_by(tasks_fts.c.rank, Task.task_id)
+    query = query.limit(limit)
+    return fetch_rows(session, query) if rows else query.all()
+
+
+def task_row(session: Session, task_id, archived=False):
+    """Load one task as a TaskRow, None if it does not exist. Input: session, task_id, look in the archive too."""
+    source = task_source(archived)
+    rows = fetch_rows(session, _select(session, True, source).filter(source.task_id == task_id))
+    return rows[0] if rows else None
+
+
+def task_description(session: Session, task_id, archived=False):
+    """Load the full description of one task, for the task form. None if the task does not exist.
+    Input: session, task_id, look in the archive too."""
+    source = task_source(archived)
+    return session.query(source.description).filter(source.task_id == task_id).scalar()
+
+
+def fetch_rows(session: Session, query):
+    """Run a query of ROW_COLUMNS as a Core statement, so no ORM state is built or kept in the session.
+    Input: session, query. Returns TaskRow objects."""
+    return [TaskRow(*row) for row in session.execute(query.statement)]
+
+
+def fts_query(text):
+    """Turn user input into an FTS5 query: each word quoted as a prefix, all words required.
+    Input: search text. Returns None when the text has no words."""
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return None
+    # A one letter prefix matches a large part of the vocabulary, single letters only match whole words
+    return " ".join(f'"{word}"*' if len(word) > 1 else f'"{word}"' for word in words)
+
+
+def count_tasks(session: Session, user_id: int, category="All", complete=None, archived=False):
+    """Count a user's tasks matching the filters. Input: session, user_id, category filter, completion filter,
+    include archived tasks."""
+    source = task_source(archived)
+    query = session.query(func.count(source.task_id)).filter(source.user_id == user_id)
+    if category != "All":
+        query = query.filter(source.category == category)
+    if complete is not None:
+        query = query.filter(source.complete == complete)
+    return query.scalar()
+
+
+def query_categories(session: Session, user_id: int, archived=False):
+    """Return the sorted list of unique categories of a user's tasks. Input: session, user_id, include archived."""
+    source = task_source(archived)
+    rows = (session.query(source.category)
+            .filter(source.user_id == user_id)
+            .distinct()
+            .order_by(source.category)
+            .all())
+    return [category for (category,) in rows]
+
+
+def report_counts(session: Session, user_id: int, archived=False):
+    """Count a user's tasks per category in one GROUP BY, completed tasks are grouped under 'Complete'.
+    Input: session, user_id, include archived tasks. Returns a dict of category→count."""
+    source = task_source(archived)
+    label = case((source.complete, 'Complete'), else_=source.category)
+    rows = (session.query(label, func.count(source.task_id))
+            .filter(source.user_id == user_id)
+            .group_by(label)
+            .order_by(label)
+            .all())
+    return dict(rows)
+
+
+def current_version(session: Session):
+    """Return the current value of the change counter. Input: session."""
+    return session.query(SyncCounter.value).filter(SyncCounter.id == 1).scalar() or 0
+
+
+def changes_since(session: Session, user_id: int, version: int, rows=False):
+    """Return what changed for a user after a change counter value.
+    Input: session, user_id, last seen version, load TaskRow objects instead of Task (optional).
+    Returns (new version, inserted or updated tasks, deleted task ids)."""
+    # Read the counter first, changes committed meanwhile are returned again by the next call
+    latest = current_version(session)
+    if latest == version:
+        return latest, [], []
+    query = _select(session, rows).filter(Task.user_id == user_id, Task.version > version)
+    changed = fetch_rows(session, query) if rows else query.all()
+    deleted = [task_id for (task_id,) in session.query(TaskTombstone.task_id)
+               .filter(TaskTombstone.user_id == user_id, TaskTombstone.version > version)]
+    return latest, changed, deleted
+
+
+def keyset_position(task, sorted_column):
+    """Return the keyset position of a task for the given sort column. Input: task, sort column."""
+    if not sorted_column:
+        return None, task.task_id
+    return getattr(task, SORT_COLUMNS[sorted_column].key), task.task_id
+
+
+def _select(session: Session, rows, source=Task):
+    """Helper function. Query of the list view columns when rows is set, of Task objects otherwise.
+    Input: session, rows flag, task source (optional)."""
+    if rows:
+        return session.query(*ROW_COLUMNS) if source is Task else session.query(
+            *(getattr(source, name) for name in TaskRow.__slots__))
+    return session.query(source)
+
+
+def _after_clause(sorted_column, sort_reverse, after, source=Task):
+    """Helper function. WHERE clause selecting rows after a keyset position.
+    Input: sort state, (value, task_id), task source (optional)."""
+    value, task_id = after
+    if not sorted_column:
+        return source.task_id > task_id
+    key = sort_key(source, sorted_column)
+    # Booleans only support equality operators, compare the completion flag as 0/1
+    if isinstance(value, bool):
+        value = int(value)
+    if sort_reverse:
+        return or_(key < value, and_(key == value, source.task_id < task_id))
+    return or_(key > value, and_(key == value, source.task_id > task_id))
@@ -0,0 +1,239 @@
+"""Streaming import and export of a user's tasks as CSV or JSON Lines.
+
+Run: python -m app.database.transfer {import,export} --user USERNAME FILE [--format csv|jsonl]
+"""
+import argparse
+import csv
+import json
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import insert, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.models.archive import ArchivedTask
+from app.models.sync import TaskTombstone
+
+# Columns written to and read from files, user_id and version belong to the database
+FIELDS = ("task_id", "title", "description", "due_date", "priority", "category", "complete")
+# Columns compared to recognize a task the user already has
+CONTENT = FIELDS[1:]
+# Rows per INSERT batch and per fetch while exporting
+BATCH_SIZE = 1000
+FORMATS = ("csv", "jsonl")
+
+tasks_table = Task.__table__
+archive_table = ArchivedTask.__table__
+tombstones_table = TaskTombstone.__table__
+
+
+def detect_format(path, file_format=None):
+    """Pick the file format from the argument or the file suffix. Input: path, format (optional)."""
+    file_format = (file_format or Path(path).suffix.lstrip(".")).lower()
+    if file_format == "json":
+        file_format = "jsonl"
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown file format '{file_format}', use csv or jsonl.")
+    return file_format
+
+
+def read_rows(file, file_format):
+    """Yield raw task dicts from an open text file one line at a time. Input: file, 'csv' or 'jsonl'."""
+    if file_format == "csv":
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def parse_task(row, line):
+    """Convert a raw row to column values, with the same defaults as the task form. Input: row dict, line number.
+    Returns the values, task_id is None when the database should number the task."""
+    try:
+        title = str(row.get("title") or "").strip()
+        if not title:
+            raise ValueError("title is required")
+        complete = row.get("complete", False)
+        if isinstance(complete, str):
+            complete = complete.strip().lower() in ("1", "true", "yes", "on", "✓")
+        return dict(
+            task_id=_task_id(row.get("task_id")),
+            title=title,
+            description=str(row.get("description") or "").strip(),
+            due_date=date.fromisoformat(str(row.get("due_date") or "").strip()),
+            priority=int(row.get("priority") or 3),
+            category=str(row.get("category") or "").strip() or "General",
+            complete=bool(complete),
+        )
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Line {line}: {e}") from None
+
+
+def _task_id(value):
+    """Helper function. Integer task_id of a file row, None for a missing id. Input: raw value."""
+    text = str(value if value is not None else "").strip()
+    # Files exported while task ids were UUIDs are imported under new ids
+    return int(text) if text.isdigit() else None
+
+
+def import_tasks(session: Session, user_id, rows, batch_size=BATCH_SIZE):
+    """Insert tasks for a user in executemany batches, each batch committed in its own transaction.
+    A task keeps the task_id of the file while that id is free. When the id is taken, live or archived, a task
+    the user already has is skipped and any other task gets a new id, so files from another database import
+    in full. Input: session, user_id, iterable of raw rows, batch size. Returns (imported, skipped)."""
+    imported = seen = 0
+    batch = []
+    for line, row in enumerate(rows, start=1):
+        values = parse_task(row, line)
+        values["user_id"] = user_id
+        batch.append(values)
+        if len(batch) >= batch_size:
+            imported += _insert_batch(session, user_id, batch)
+            seen += len(batch)
+            batch = []
+    if batch:
+        imported += _insert_batch(session, user_id, batch)
+        seen += len(batch)
+    return imported, seen - imported
+
+
+def _insert_batch(session, user_id, batch):
+    """Helper function. Insert and commit one batch, rolled back on error. Input: session, user_id, rows.
+    Returns the number of inserted tasks."""
+    try:
+        batch = _assign_ids(session, user_id, batch)
+        if batch:
+            session.execute(insert(tasks_table), batch)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    return len(batch)
+
+
+def _assign_ids(session, user_id, batch):
+    """Helper function. Keep the task_ids of a batch that were never used. A row whose id is taken is dropped when
+    the user already has the same task, re-running an import is harmless that way, otherwise the database numbers
+    it. Input: session, user_id, rows. Returns the rows to insert."""
+    task_ids = [values["task_id"] for values in batch if values["task_id"] is not None]
+    if not task_ids:
+        return batch
+    # Ids are never reused: every id up to the AUTOINCREMENT sequence was handed out once, and a deleted task's id
+    # could still be the target of a queued edit. Tombstones and the archive cover ids above it, e.g. in a
+    # database edited by hand.
+    sequence = session.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'tasks'")).scalar() or 0
+    taken = {task_id for task_id in task_ids if task_id <= sequence}
+    above = [task_id for task_id in task_ids if task_id > sequence]
+    if above:
+        taken.update(session.execute(union_all(*(select(table.c.task_id).where(table.c.task_id.in_(above))
+                                                 for table in (tasks_table, archive_table, tombstones_table))))
+                     .scalars())
+    clashing = [values for values in batch if values["task_id"] in taken]
+    existing = set()
+    if clashing:
+        # Only tasks with one of the titles can match, the user_id/title filter keeps the lookup small
+        titles = {values["title"] for values in clashing}
+        for table in (tasks_table, archive_table):
+            rows = session.execute(select(*(table.c[name] for name in CONTENT))
+                                   .where(table.c.user_id == user_id, table.c.title.in_(titles)))
+            existing.update(_content(row._asdict()) for row in rows)
+    kept = []
+    for values in batch:
+        task_id = values["task_id"]
+        if task_id in taken:
+            if _content(values) in existing:
+                continue
+            values = dict(values, task_id=None)
+        elif task_id is not None:
+            # Claimed by this row, a repeat of the id further down the file is a clash too
+            taken.add(task_id)
+            existing.add(_content(values))
+        kept.append(values)
+    # Kept ids go in first, a numbered row could otherwise get an id a later row of the batch keeps
+    return sorted(kept, key=lambda values: values["task_id"] is None)
+
+
+def _content(values):
+    """Helper function. Comparable content of a task, without its id. Input: column values dict."""
+    return tuple((values[name] or "") if name == "description" else values[name] for name in CONTENT)
+
+
+def export_tasks(session: Session, user_id, batch_size=BATCH_SIZE):
+    """Yield a user's tasks, archived ones included, as plain dicts, fetched batch_size rows at a time so memory
+    stays flat. Input: session, user_id, batch size."""
+    statement = (union_all(*(select(*(table.c[name] for name in FIELDS)).where(table.c.user_id == user_id)
+                             for table in (tasks_table, archive_table)))
+                 .order_by("task_id")
+                 .execution_options(yield_per=batch_size))
+    for row in session.execute(statement):
+        values = row._asdict()
+        values["due_date"] = values["due_date"].isoformat()
+        yield values
+
+
+def write_rows(file, rows, file_format):
+    """Write task dicts to an open text file as they arrive. Input: file, rows, 'csv' or 'jsonl'.
+    Returns the number of rows written."""
+    written = 0
+    if file_format == "csv":
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            written += 1
+        return written
+    for row in rows:
+        file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        written += 1
+    return written
+
+
+def import_file(session: Session, user_id, path, file_format=None):
+    """Import a CSV or JSONL file into a user's tasks. Input: session, user_id, path, format (optional).
+    Returns (imported, skipped)."""
+    file_format = detect_format(path, file_format)
+    with open(path, newline="", encoding="utf-8") as file:
+        return import_tasks(session, user_id, read_rows(file, file_format))
+
+
+def export_file(session: Session, user_id, path, file_format=None):
+    """Export a user's tasks to a CSV or JSONL file. Input: session, user_id, path, format (optional).
+    Returns the number of exported tasks."""
+    file_format = detect_format(path, file_format)
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        return write_rows(file, export_tasks(session, user_id), file_format)
+
+
+def main(argv=None):
+    from app.database.db import init_db, SessionLocal
+    from app.models.user import User
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("action", choices=("import", "export"))
+    parser.add_argument("file")
+    parser.add_argument("--user", required=True, help="username that owns the tasks")
+    parser.add_argument("--format", choices=FORMATS + ("json",), help="default: from the file suffix")
+    args = parser.parse_args(argv)
+
+    init_db()
+    session = SessionLocal()
+    try:
+        user = session.query(User).filter_by(username=args.user).first()
+        if user is None:
+            parser.error(f"unknown user '{args.user}'")
+        if args.action == "import":
+            imported, skipped = import_file(session, user.user_id, args.file, args.format)
+            print(f"Imported {imported} tasks, skipped {skipped} existing.")
+        else:
+            exported = export_file(session, user.user_id, args.file, args.format)
+            print(f"Exported {exported} tasks.")
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"error: {e}\n")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
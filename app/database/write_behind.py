@@ -0,0 +1,70 @@
+from app.database.bulk import bulk_update_tasks
+
+
+class WriteBehindQueue:
+    """Collects task field changes that were already applied to the view, and writes them to the database
+    in one transaction after a short debounce. A failed batch is rolled back and reported with the original
+    values, so the caller can revert its rows."""
+    def __init__(self, executor, scheduler, delay_ms=500, on_flushed=None, on_failed=None):
+        """Init for WriteBehindQueue class.
+        Input: DBExecutor, Tk widget used for after() timers, debounce in ms (0 writes every change at once),
+        callback after a batch was committed, callback(error, originals) when a batch failed."""
+        self.executor = executor
+        self.scheduler = scheduler
+        self.delay_ms = delay_ms
+        self.on_flushed = on_flushed
+        self.on_failed = on_failed
+        # task_id -> {field: new value}, and the values before the first queued change
+        self.pending = {}
+        self.originals = {}
+        self._timer = None
+
+    def enqueue(self, task_id, changes, originals):
+        """Queue changes of one task and restart the debounce timer. Input: task_id, {field: new value},
+        {field: value before the change}."""
+        self.pending.setdefault(task_id, {}).update(changes)
+        # Keep the oldest value of each field, it is what the database still holds
+        saved = self.originals.setdefault(task_id, {})
+        for name, value in originals.items():
+            saved.setdefault(name, value)
+        if self.delay_ms <= 0:
+            self.flush()
+            return
+        if self._timer is not None:
+            self.scheduler.after_cancel(self._timer)
+        self._timer = self.scheduler.after(self.delay_ms, self.flush)
+
+    def overlay(self, tasks):
+        """Apply queued values to freshly loaded tasks, so reloads do not show stale values. Input: tasks."""
+        for task in tasks:
+            changes = self.pending.get(task.task_id)
+            if changes:
+                for name, value in changes.items():
+                    setattr(task, name, value)
+        return tasks
+
+    def flush(self):
+        """Write every queued change in one transaction on the database writer thread."""
+        if self._timer is not None:
+            self.scheduler.after_cancel(self._timer)
+            self._timer = None
+        if not self.pending:
+            return
+        batch, originals = self.pending, self.originals
+        self.pending, self.originals = {}, {}
+
+        # Tasks that got the same changes, e.g. several tasks checked off, share a single UPDATE
+        groups = {}
+        for task_id, changes in batch.items():
+            groups.setdefault(tuple(sorted(changes.items())), []).append(task_id)
+
+        def write_batch(session):
+            for changes, task_ids in groups.items():
+                bulk_update_tasks(session, None, task_ids, **dict(changes))
+            return len(batch)
+
+        def on_error(error):
+            if self.on_failed:
+                self.on_failed(error, originals)
+
+        self.executor.submit_write(write_batch, self.on_flushed, on_error)
@@ -1,20 +1,30 @@
+import logging
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 
-from app.database.db import init_db, SessionLocal
+from app import config
 
 
 class App(tk.Tk):
     """Main Tkinter application, switches between frames to display"""
+    # The archiver starts a while after the database opens, then runs hourly, one batch per writer job
+    ARCHIVE_DELAY_MS = 10000
+    ARCHIVE_INTERVAL_MS = 60 * 60 * 1000
     def __init__(self):
-        """Init for class App. Establishes connection to database and creates Menu."""
+        """Init for class App. Shows the login frame and creates Menu, the database is opened once it is drawn."""
         super().__init__()
         self.title("EverTask")
-        init_db()
-        self.db = SessionLocal()
+        # Database session and executor, created by open_database()
+        self._db = None
+        self._executor = None
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         self.user = None
+        # Remember-me token of the current login, None when not remembered
+        self.session_token = None
         self.switch_to_login()
+        # SQLAlchemy and the ORM mappings load after the login frame is on screen, before the first login
+        self.after_idle(self.open_database)
 
         # Menu bar
         menu_bar = tk.Menu(self)
@@ -25,6 +35,110 @@ class App(tk.Tk):
         menu_bar.add_cascade(label="Menu", menu=help_menu)
         help_menu.add_command(label="About", command=self.show_about)
         help_menu.add_command(label="Help", command=self.show_help)
+        help_menu.add_separator()
+        help_menu.add_command(label="Import Tasks...", command=lambda: self.transfer_tasks("import_tasks"))
+        help_menu.add_command(label="Export Tasks...", command=lambda: self.transfer_tasks("export_tasks"))
+        help_menu.add_separator()
+        help_menu.add_command(label="Diagnostics...", command=self.show_diagnostics)
+        help_menu.add_separator()
+        help_menu.add_command(label="Log Out", command=self.logout)
+
+    def open_database(self):
+        """Import the database layer, migrate the database and start the database threads, once."""
+        if self._db is not None:
+            return
+        from app.database.db import init_db, SessionLocal, engine
+        from app.database.executor import DBExecutor
+        if config.PROFILE:
+            # Opt-in instrumentation, hooked before the first statement so migrations are measured too
+            from app.utils.profiling import PROFILER
+            PROFILER.enable(engine, self)
+        init_db()
+        # Session for the Tk thread, background work goes through the executor's own sessions
+        self._db = SessionLocal()
+        self._executor = DBExecutor(engine)
+        self._executor.attach(self)
+        if config.ARCHIVE_DAYS > 0:
+            self.after(self.ARCHIVE_DELAY_MS, self.archive_tasks)
+
+    @property
+    def db(self):
+        """Session for the Tk thread, the database is opened on first use."""
+        self.open_database()
+        return self._db
+
+    @property
+    def executor(self):
+        """DBExecutor for background database work, the database is opened on first use."""
+        self.open_database()
+        return self._executor
+
+    def on_close(self):
+        """Window close handler. Finish queued database writes before exiting."""
+        # Destroying the frame queues its pending write-behind changes, shutdown waits for the writer
+        if hasattr(self, "_frame"):
+            self._frame.destroy()
+            del self._frame
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._db.close()
+        if config.PROFILE_FILE:
+            from app.utils.profiling import PROFILER
+            PROFILER.dump(config.PROFILE_FILE)
+        self.destroy()
+
+    def archive_tasks(self):
+        """Move one batch of old completed tasks to the archive on the writer thread. Full batches are followed by
+        the next one, queued behind the writes made meanwhile, otherwise the archiver waits for its next run."""
+        from app.database.archive import archive_batch
+
+        def on_archived(moved):
+            if moved >= config.ARCHIVE_BATCH:
+                self.after_idle(self.archive_tasks)
+            else:
+                self.after(self.ARCHIVE_INTERVAL_MS, self.archive_tasks)
+
+        def on_failed(error):
+            # Archiving is housekeeping, a failed batch is retried with the next run
+            logging.getLogger(__name__).warning("Archiving failed: %s", error)
+            self.after(self.ARCHIVE_INTERVAL_MS, self.archive_tasks)
+
+        self._executor.submit_write(lambda session: archive_batch(session, config.ARCHIVE_DAYS, config.ARCHIVE_BATCH),
+                                    on_archived, on_failed)
+
+    def logout(self):
+        """Log Out option for Menu bar. Return to the login frame and forget a remembered login and the saved
+        task list."""
+        if self.user is None:
+            return
+        token = self.session_token
+        user_id = self.user.user_id
+        self.user = None
+        self.session_token = None
+        # The task list frame saves no snapshot without a user, the last one is removed too
+        from app.store.snapshot import delete_snapshot, snapshot_path
+        delete_snapshot(snapshot_path(user_id))
+        if token:
+            from app.utils.auth import revoke_token
+            from app.utils.remember import clear_token
+            clear_token()
+            self.executor.submit_write(lambda session: revoke_token(session, token))
+        # Leaving the task list writes its queued changes
+        self.switch_to_login()
+
+    def show_diagnostics(self):
+        """Diagnostics option for Menu bar. Show SQL, operation and Tk stall timings in a pop-up window."""
+        from app.gui.diagnostics import DiagnosticsWindow
+        from app.database.db import engine
+        DiagnosticsWindow(self, engine)
+
+    def transfer_tasks(self, action):
+        """Import/Export options for Menu bar. Only available on the task list. Input: frame method name."""
+        handler = getattr(getattr(self, "_frame", None), action, None)
+        if handler is None:
+            messagebox.showwarning("Warning", "Log in to import or export tasks.")
+            return
+        handler()
 
     def show_about(self):
         """About option for Menu bar. Show about information in a pop-up window"""
@@ -38,11 +152,21 @@ class App(tk.Tk):
             "[Add Task]: Click add, then fill in the task form to add\n\n"
             "[Edit Task]: Select a task by left clicking on it, click edit, then fill in the task form to make edits\n\n"
             "[Delete Task]: Select a task by left clicking on it, then click delete\n\n"
+            "[Bulk]: Select several tasks with Ctrl/Shift-click, then complete, re-categorize, re-prioritize "
+            "or delete them all at once\n\n"
             "[Filter]: Select a category from the dropdown menu\n\n"
+            "[Search]: Type words from a title or description, word beginnings are enough, best matches first\n\n"
+            "[Import/Export]: Use Menu to load tasks from, or save them to, a CSV or JSON Lines file\n\n"
             "[Report]: Generate a pie chart for remaining tasks by category percentage\n\n"
             "[Sort]: Click on the heading of the category to sort tasks by its content\n\n"
             "[Toggle Complete]: Double click on the check mark or x to toggle completeness\n\n"
-            "[Logout]: Close the window to automatically logout"
+            "[Show archived]: Tasks completed long ago are archived, check it to list them too. "
+            "Editing an archived task brings it back\n\n"
+            "[Remember me]: Check it when logging in to skip the password on the next start\n\n"
+            "[Diagnostics]: Use Menu > Diagnostics to record query, operation and UI stall timings, "
+            "and save them as JSON\n\n"
+            "[Log Out]: Use Menu > Log Out, this also forgets a remembered login and the saved task list. "
+            "Closing the window keeps both, the list is shown at once on the next start"
         )
         messagebox.showinfo("Help", help_text)
 
@@ -0,0 +1,31 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class BusyIndicator:
+    """Indeterminate progress bar and watch cursor shown while a frame waits for background work,
+    with the frame's buttons disabled so the work is not started twice."""
+    def __init__(self, frame, buttons):
+        """Init for BusyIndicator class. Input: frame, buttons to disable while busy."""
+        self.frame = frame
+        self.buttons = buttons
+        self.progress = ttk.Progressbar(frame, mode='indeterminate', length=120)
+        self.active = False
+
+    def start(self):
+        """Show the indicator and disable the buttons."""
+        self.active = True
+        for button in self.buttons:
+            button.config(state=tk.DISABLED)
+        self.frame.config(cursor="watch")
+        self.progress.pack(pady=5)
+        self.progress.start(15)
+
+    def stop(self):
+        """Hide the indicator and enable the buttons again."""
+        self.active = False
+        self.progress.stop()
+        self.progress.pack_forget()
+        self.frame.config(cursor="")
+        for button in self.buttons:
+            button.config(state=tk.NORMAL)
@@ -0,0 +1,109 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from app.utils.profiling import PROFILER
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Diagnostics popup window. Shows the profiler's SQL, operation and Tk stall timings, refreshed while open."""
+    REFRESH_MS = 1000
+    # Treeview columns of each tab: (heading, snapshot key, width)
+    SQL_COLUMNS = (("Statement", "statement", 420), ("Count", "count", 60), ("Total ms", "total_ms", 80),
+                   ("Mean ms", "mean_ms", 70), ("Max ms", "max_ms", 70), ("Rows", "rows", 60))
+    OPERATION_COLUMNS = (("Operation", "name", 220), ("Count", "count", 60), ("Total ms", "total_ms", 80),
+                         ("Mean ms", "mean_ms", 70), ("Max ms", "max_ms", 70))
+    STALL_COLUMNS = (("Time", "at", 200), ("Delay ms", "ms", 80), ("After operation", "during", 220))
+
+    def __init__(self, master, engine=None):
+        """Init for DiagnosticsWindow class. Input: App, engine to instrument when recording starts (optional)."""
+        super().__init__(master)
+        self.engine = engine
+        self.title("Diagnostics")
+
+        # Toolbar: recording switch, reset and JSON dump
+        toolbar = ttk.Frame(self)
+        toolbar.pack(fill='x', padx=5, pady=5)
+        self.record_button = ttk.Button(toolbar, command=self.toggle_recording)
+        self.record_button.pack(side='left')
+        ttk.Button(toolbar, text="Reset", command=self.reset).pack(side='left', padx=5)
+        ttk.Button(toolbar, text="Save JSON...", command=self.save_json).pack(side='left')
+        self.summary = ttk.Label(toolbar)
+        self.summary.pack(side='left', padx=10)
+
+        # One tab per kind of measurement
+        notebook = ttk.Notebook(self)
+        notebook.pack(fill='both', expand=True, padx=5, pady=(0, 5))
+        self.sql_tree = self._add_tab(notebook, "SQL", self.SQL_COLUMNS)
+        self.operation_tree = self._add_tab(notebook, "Operations", self.OPERATION_COLUMNS)
+        self.stall_tree = self._add_tab(notebook, "Tk stalls", self.STALL_COLUMNS)
+
+        self._job = None
+        self.refresh()
+
+    @staticmethod
+    def _add_tab(notebook, text, columns):
+        """Helper function. Add a tab holding a Treeview. Input: notebook, tab title, column definitions."""
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=text)
+        tree = ttk.Treeview(frame, columns=[heading for heading, _, _ in columns], show='headings', height=15)
+        for heading, _, width in columns:
+            tree.heading(heading, text=heading)
+            tree.column(heading, width=width, anchor='w' if width > 150 else 'e')
+        scrollbar = ttk.Scrollbar(frame, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        return tree
+
+    @staticmethod
+    def _fill(tree, columns, rows):
+        """Helper function. Replace the rows of a Treeview. Input: tree, column definitions, snapshot dicts."""
+        tree.delete(*tree.get_children())
+        for row in rows:
+            # Missing values, e.g. a stall outside any operation, are shown empty
+            tree.insert('', 'end', values=["" if row.get(key) is None else row[key] for _, key, _ in columns])
+
+    def refresh(self):
+        """Show the current measurements, then schedule the next refresh."""
+        snapshot = PROFILER.snapshot()
+        self.record_button.config(text="Stop Recording" if snapshot["enabled"] else "Start Recording")
+        tk_stats = snapshot["tk"]
+        self.summary.config(text=f"{snapshot['seconds']:.0f} s recorded, {len(snapshot['sql'])} statements, "
+                                 f"{tk_stats['stalls']} Tk stalls ≥ {tk_stats['stall_ms']} ms "
+                                 f"({tk_stats['stalled_ms']:.0f} ms in total, worst {tk_stats['max_delay_ms']:.0f} ms)")
+        self._fill(self.sql_tree, self.SQL_COLUMNS, snapshot["sql"])
+        self._fill(self.operation_tree, self.OPERATION_COLUMNS, snapshot["operations"])
+        self._fill(self.stall_tree, self.STALL_COLUMNS, reversed(tk_stats["recent_stalls"]))
+        self._job = self.after(self.REFRESH_MS, self.refresh)
+
+    def toggle_recording(self):
+        """Start or stop recording. Starting hooks the engine and the Tk event loop, once."""
+        if PROFILER.enabled:
+            PROFILER.disable()
+        else:
+            PROFILER.enable(self.engine, self.master)
+        self.after_cancel(self._job)
+        self.refresh()
+
+    def reset(self):
+        """Forget the measurements so far."""
+        PROFILER.reset()
+        self.after_cancel(self._job)
+        self.refresh()
+
+    def save_json(self):
+        """Ask for a file and write the measurements to it as JSON."""
+        path = filedialog.asksaveasfilename(parent=self, title="Save Diagnostics", defaultextension=".json",
+                                            filetypes=[("JSON files", "*.json"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            PROFILER.dump(path)
+        except OSError as e:
+            messagebox.showerror("Diagnostics", f"Could not save diagnostics: {e}", parent=self)
+
+    def destroy(self):
+        """Stop refreshing before the window is destroyed."""
+        if self._job is not None:
+            self.after_cancel(self._job)
+        super().destroy()
@@ -1,5 +1,6 @@
 import tkinter as tk
-from app.utils.auth import authenticate
+from app.gui.busy import BusyIndicator
+from app.utils.remember import load_token, save_token, clear_token
 
 class LoginFrame(tk.Frame):
     """Login Frame class. Inherits from tk.Frame"""
@@ -13,24 +14,120 @@ class LoginFrame(tk.Frame):
         self.username = tk.Entry(self)
         self.username.pack()
 
-        # Password entry field, hidden text *
+        # Password entry field, hidden text *, Enter logs in
         tk.Label(self, text="Password").pack()
         self.password = tk.Entry(self, show="*")
         self.password.pack()
+        self.password.bind("<Return>", lambda _: self.login())
+        # Remember me skips the password on the next start
+        self.remember = tk.BooleanVar(value=False)
+        tk.Checkbutton(self, text="Remember me", variable=self.remember).pack()
 
         # Login button calls login()
-        tk.Button(self, text="Login", command=self.login).pack()
+        login_button = tk.Button(self, text="Login", command=self.login)
+        login_button.pack()
         # Register button calls switch_to_register()
-        tk.Button(self, text="Register", command=master.switch_to_register).pack()
+        register_button = tk.Button(self, text="Register", command=master.switch_to_register)
+        register_button.pack()
+
+        # Shown while the password is checked, and the result message
+        self.busy = BusyIndicator(self, [login_button, register_button])
+        self.status = tk.Label(self, fg="red")
+        self.status.pack()
+
+        # A token saved by an earlier "Remember me" login signs in without the password
+        self.saved_token = load_token()
+        if self.saved_token:
+            self.after_idle(self.resume_session)
+
+    def resume_session(self):
+        """Sign in with the saved remember-me token on a database thread, no bcrypt check needed"""
+        token = self.saved_token
+
+        def authenticate_token_in_background(session):
+            from app.utils.auth import authenticate_token
+            return authenticate_token(session, token)
+
+        def on_resumed(user):
+            if not self.winfo_exists():
+                return
+            self.busy.stop()
+            if user:
+                self.master.user = user
+                self.master.session_token = token
+                self.master.switch_to_tasks()
+            else:
+                # Expired or revoked, the password is needed again
+                clear_token()
+                self.saved_token = None
+
+        self.busy.start()
+        # Expired tokens are deleted on sight, so the check runs on the writer thread
+        self.master.executor.submit_write(authenticate_token_in_background, on_resumed, self.on_error)
 
     def login(self):
-        """Login function, authenticates user and password before switching to tasks frame"""
-        # Call authenticate helper function in utils
-        user = authenticate(self.master.db, self.username.get(), self.password.get())
+        """Login function, authenticates user and password on a database thread before switching to tasks frame"""
+        if self.busy.active:
+            return
+        # Read the form here, worker threads must not touch Tk
+        username, password = self.username.get(), self.password.get()
+        remember, old_token = self.remember.get(), self.saved_token
+
+        def check_in_background(session):
+            # bcrypt releases the GIL, so the window keeps responding while the password is checked. It runs on
+            # a reader thread, queued writes do not wait for it
+            from app.utils.auth import check_password
+            return check_password(session, username, password)
+
+        def on_checked(result):
+            if not self.winfo_exists():
+                return
+            user, new_hash = result
+            if user is None:
+                self.on_login((None, None))
+                return
+
+            def save_login_in_background(session):
+                # The writes of a login: a rehash for a changed work factor and the remember-me tokens
+                from app.utils.auth import issue_token, revoke_token, store_password_hash
+                if new_hash:
+                    store_password_hash(session, user.user_id, new_hash)
+                    user.password_hash = new_hash
+                # A token saved for an earlier login is replaced, or dropped when not remembering this one
+                if old_token:
+                    revoke_token(session, old_token)
+                return user, issue_token(session, user.user_id) if remember else None
+
+            if new_hash or old_token or remember:
+                self.master.executor.submit_write(save_login_in_background, self.on_login, self.on_error)
+            else:
+                self.on_login((user, None))
+
+        self.status.config(text="")
+        self.busy.start()
+        self.master.executor.submit_read(check_in_background, on_checked, self.on_error)
+
+    def on_login(self, result):
+        """Result callback of login(), on the Tk thread. Input: (User or None when the login failed, new token)."""
+        if not self.winfo_exists():
+            return
+        self.busy.stop()
+        user, token = result
         # IF valid login, switch to tasks frame
         if user:
+            if token:
+                save_token(token)
+            elif self.saved_token:
+                clear_token()
             self.master.user = user
+            self.master.session_token = token
             self.master.switch_to_tasks()
         # ELSE display failed login text
         else:
-            tk.Label(self, text="Login failed!", fg="red").pack()
+            self.status.config(text="Login failed!")
+
+    def on_error(self, error):
+        """Error callback of login(), on the Tk thread. Input: exception."""
+        if self.winfo_exists():
+            self.busy.stop()
+            self.status.config(text=f"Login failed: {error}")
@@ -1,5 +1,5 @@
 import tkinter as tk
-from app.utils.auth import create_user
+from app.gui.busy import BusyIndicator
 
 class RegisterFrame(tk.Frame):
     """Register Frame class. Inherits from tk.Frame"""
@@ -19,18 +19,53 @@ class RegisterFrame(tk.Frame):
         self.password.pack()
 
         # Register button calls register()
-        tk.Button(self, text="Register", command=self.register).pack()
+        register_button = tk.Button(self, text="Register", command=self.register)
+        register_button.pack()
         # Back button calls switch_to_login()
-        tk.Button(self, text="Back", command=master.switch_to_login).pack()
+        back_button = tk.Button(self, text="Back", command=master.switch_to_login)
+        back_button.pack()
+
+        # Shown while the password is hashed, and the result message
+        self.busy = BusyIndicator(self, [register_button, back_button])
+        self.status = tk.Label(self, fg="red")
+        self.status.pack()
 
     def register(self):
-        """Register function, creates a new user before returning to login screen"""
-        # Call create_user helper function in utils
+        """Register function, creates a new user on the database writer thread before returning to login screen"""
+        if self.busy.active:
+            return
+        # Read the form here, worker threads must not touch Tk
+        username, password = self.username.get(), self.password.get()
+
+        def hash_in_background(session):
+            # bcrypt runs on a reader thread, the writer thread only inserts the user and queued writes
+            # do not wait behind the hashing
+            from app.utils.auth import hash_password
+            return hash_password(password)
+
+        def on_hashed(password_hash):
+            from app.utils.auth import add_user
+            self.master.executor.submit_write(lambda session: add_user(session, username, password_hash),
+                                              self.on_registered, self.on_error)
+
+        self.status.config(text="")
+        self.busy.start()
+        self.master.executor.submit_read(hash_in_background, on_hashed, self.on_error)
+
+    def on_registered(self, created):
+        """Result callback of register(), on the Tk thread. Input: True if the user was created."""
+        if not self.winfo_exists():
+            return
+        self.busy.stop()
         # IF user does not already exist, switch to login screen
-        if create_user(self.master.db, self.username.get(), self.password.get()):
+        if created:
             self.master.switch_to_login()
         # ELSE display an error message
         else:
-            tk.Label(self, text="Error! User already exists.", fg="red").pack()
-
+            self.status.config(text="Error! User already exists.")
 
+    def on_error(self, error):
+        """Error callback of register(), on the Tk thread. Input: exception."""
+        if self.winfo_exists():
+            self.busy.stop()
+            self.status.config(text=f"Could not register: {error}")
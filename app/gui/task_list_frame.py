@@ -1,22 +1,61 @@
+import logging
+import time
 import tkinter as tk
-import uuid
-import threading
-from tkinter import ttk, messagebox
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+from tkinter import ttk, messagebox, simpledialog, filedialog
 from datetime import datetime
+from app import config
 from app.models.task import Task
+from app.database.queries import (query_tasks, query_categories, count_tasks, keyset_position, current_version,
+                                  changes_since, report_counts, search_tasks, task_row, task_description)
+from app.database.bulk import bulk_update_tasks, bulk_delete_tasks
+from app.database.transfer import import_file, export_file
+from app.database.write_behind import WriteBehindQueue
+from app.gui.tree_sync import TreeSync
+from app.gui.virtual_list import PagedRows, window_range
+from app.store.task_store import TaskStore
+from app.store.snapshot import open_snapshot, save_snapshot, snapshot_path
+from app.utils.profiling import PROFILER, timed, timer
+
+# File choices of the import/export dialogs
+TRANSFER_FILETYPES = [("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl *.json"), ("All files", "*")]
 
 class TaskListFrame(tk.Frame):
     """Main tasks frame. Inherits from tk.Frame"""
+    # Above this many tasks only the visible window of rows (plus overscan) is kept in the tree
+    VIRTUAL_THRESHOLD = 2000
+    VIRTUAL_OVERSCAN = 10
+    # How often to pick up changes made by other app instances on the same database
+    SYNC_INTERVAL_MS = 3000
+    # Pause in typing before the search runs
+    SEARCH_DEBOUNCE_MS = 250
+
     def __init__(self, master):
         # Links to master window
         super().__init__(master)
 
-        # Lists of tasks to prevent repeated database queries
-        self.all_tasks = []
+        # Loaded tasks as plain TaskRow objects indexed by task_id, to prevent repeated database queries
+        self.all_tasks = TaskStore()
         self.sorted_column = None
         self.sort_reverse = False
+        # Virtual mode state: lazily fetched pages, first visible row and selection kept across scrolling
+        self.pages = None
+        self.page_filters = None
+        self.view_first = 0
+        self.selected_ids = set()
+        # Change counter value the loaded tasks are current with, None until the first load
+        self.sync_version = None
+        # Categories of the filter menu, kept for the warm-start snapshot
+        self.categories = []
+        # Applied search text, empty shows every task
+        self.search_text = ""
+        self._search_job = None
+        # Toggles and edits are shown at once and written in batches
+        self.write_behind = WriteBehindQueue(master.executor, self, config.WRITE_BEHIND_MS,
+                                             on_flushed=lambda _: self.sync_tasks(),
+                                             on_failed=self.revert_changes)
+        # Report window, reused and redrawn as tasks change, and the last counts read from the database
+        self.report_window = None
+        self.report_cache = None
 
         # Display welcome message
         tk.Label(self, text=f"Welcome, {master.user.username}").pack()
@@ -27,18 +66,45 @@ class TaskListFrame(tk.Frame):
         ttk.Button(toolbar, text="Add Task", command=self.add_task).pack(side='left', padx=5)
         ttk.Button(toolbar, text="Edit Task", command=self.edit_task).pack(side='left')
         ttk.Button(toolbar, text="Delete Task", command=self.delete_task).pack(side='left', padx=5)
+        # Bulk actions on every selected task (Ctrl/Shift-click to select several)
+        bulk_button = ttk.Menubutton(toolbar, text="Bulk")
+        bulk_menu = tk.Menu(bulk_button, tearoff=0)
+        bulk_menu.add_command(label="Mark Complete", command=lambda: self.bulk_update(complete=True))
+        bulk_menu.add_command(label="Mark Incomplete", command=lambda: self.bulk_update(complete=False))
+        bulk_menu.add_command(label="Set Category...", command=self.bulk_set_category)
+        bulk_menu.add_command(label="Set Priority...", command=self.bulk_set_priority)
+        bulk_menu.add_command(label="Delete", command=self.delete_task)
+        bulk_button['menu'] = bulk_menu
+        bulk_button.pack(side='left')
         ttk.Button(toolbar, text="Report", command=self.show_report).pack(side='right', padx=5)
 
+        # Full-text search of titles and descriptions, runs once typing pauses
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(toolbar, textvariable=self.search_var, width=20)
+        search_entry.pack(side='right')
+        search_entry.bind("<Escape>", lambda _: self.search_var.set(""))
+        ttk.Label(toolbar, text="Search:").pack(side='right', padx=(5, 5))
+        self.search_var.trace_add("write", self.on_search_typed)
+
         # Filter by category
         ttk.Label(toolbar, text="Filter:").pack(side='left', padx=(200, 5))
         self.filter_var = tk.StringVar(value="All")
         self.filter_menu = ttk.OptionMenu(toolbar, self.filter_var, "All")
         self.filter_menu.configure(width=10)
         self.filter_menu.pack(side='left')
-
-        # Treeview
+        # Archived tasks are only listed on request, the default list reads the live tasks alone
+        self.show_archived = tk.BooleanVar(value=False)
+        ttk.Checkbutton(toolbar, text="Show archived", variable=self.show_archived,
+                        command=self.toggle_archived).pack(side='left', padx=5)
+
+        # Treeview with a vertical scrollbar
+        body = ttk.Frame(self)
+        body.pack(fill='both', expand=True, pady=10)
         cols = ('✓/x', 'Title', 'Due Date', 'Description', 'Priority', 'Category')
-        self.tree = ttk.Treeview(self, columns=cols, show='headings')
+        self.tree = ttk.Treeview(body, columns=cols, show='headings', selectmode='extended',
+                                 yscrollcommand=self.on_tree_scroll)
+        self.scrollbar = ttk.Scrollbar(body, orient='vertical', command=self.on_scrollbar)
+        self.scrollbar.pack(side='right', fill='y')
 
         # Tree Columns
         self.tree.column('✓/x', width=50, anchor="c")
@@ -57,13 +123,38 @@ class TaskListFrame(tk.Frame):
         self.tree.heading('Category', text='Category', command=lambda: self.sort_by('Category'))
 
         # Draw the tree
-        self.tree.pack(fill='both', expand=True, pady=10)
+        self.tree.pack(side='left', fill='both', expand=True)
+        # Rows are reconciled by task_id instead of being rebuilt on every refresh
+        self.tree_sync = TreeSync(self.tree)
 
         # Bind double click action to mark tasks as completed
         self.tree.bind("<Double-1>", self.toggle_complete)
-
-        # Refresh the display
-        self.refresh_tasks()
+        # Track the selection, and scroll the window of rows ourselves in virtual mode
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", self.on_mousewheel)
+        self.tree.bind("<Button-5>", self.on_mousewheel)
+
+        # Show the rows saved when the app last closed right away, or wait for the first load, then poll for changes
+        if not self.show_snapshot():
+            self.refresh_tasks()
+        self._sync_job = self.after(self.SYNC_INTERVAL_MS, self.poll_changes)
+
+    def destroy(self):
+        """Write queued changes, save the warm-start snapshot and stop polling before the frame is destroyed."""
+        self.write_behind.flush()
+        # After a log out there is no user, and nothing is left on disk
+        if self.master.user is not None:
+            self.save_snapshot()
+        self.after_cancel(self._sync_job)
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        super().destroy()
+
+    def active(self):
+        """Check that the frame still shows a logged-in user's tasks. Callbacks of background work can arrive
+        after a log out destroyed it, they do nothing then."""
+        return self.master.user is not None and bool(self.winfo_exists())
 
     def toggle_complete(self, event):
         """Toggles complete status. Bound to double-click action. Input: event action."""
@@ -72,70 +163,349 @@ class TaskListFrame(tk.Frame):
         column = self.tree.identify_column(event.x)
         # IF location is the first column, toggle the complete status
         if item and column == '#1':
-            task = next((t for t in self.all_tasks if t.task_id == item), None)
+            task = self.all_tasks.get(int(item))
             if task:
-                task.complete = not task.complete
-                self.master.db.commit()
-                self.refresh_tasks()
+                self.change_task(task, {"complete": not task.complete})
+
+    def change_task(self, task, values):
+        """Apply field changes to a loaded task and its row right away, the database write is queued.
+        Input: task, {field: new value}."""
+        # Rows only hold the description preview, a new description replaces it
+        fields = ['description_preview' if name == 'description' else name for name in values]
+        originals = {name: getattr(task, name) for name in fields}
+        for name, value in values.items():
+            setattr(task, name, value)
+        self.write_behind.enqueue(task.task_id, values, originals)
+        self.show_changed_task(task, set(values))
+
+    def revert_changes(self, error, originals):
+        """Write-behind failure callback. Restore the rows of the failed batch. Input: error, {task_id: {field: value}}."""
+        if not self.active():
+            self.show_db_error(error)
+            return
+        for task_id, values in originals.items():
+            task = self.all_tasks.get(task_id)
+            if task:
+                for name, value in values.items():
+                    setattr(task, name, value)
+                self.show_changed_task(task, set(values))
+        self.show_db_error(error)
+
+    def show_changed_task(self, task, fields):
+        """Helper function. Update the view after a loaded task changed. Input: task, names of changed fields."""
+        if self.pages is not None:
+            # Virtual list: the row is updated in place, the new order comes with the sync after the write
+            self.tree_sync.update_row(task.task_id, self.task_values(task))
+            return
+        category = self.filter_var.get()
+        self.all_tasks.apply_changes([task], [], keep=lambda t: category in ("All", t.category))
+        # The row can only move or leave the list when the list is sorted or its category changed,
+        # reconciling still touches just that row
+        if self.sorted_column or 'category' in fields:
+            self.display_tasks()
+        else:
+            self.tree_sync.update_row(task.task_id, self.task_values(task))
+        if fields & {'complete', 'category'}:
+            self.update_report()
 
     def refresh_tasks(self):
-        """Refresh the list of tasks, threaded to prevent mainloop blocking."""
-        # Define function to be threaded
-        def load_and_display_tasks():
-            # Query tasks
-            self.all_tasks = self.master.db.query(Task).all()
-            # Update filter
-            self.update_filter_menu()
-            # Refresh display
+        """Refresh the list of tasks. The query runs on a database reader thread and bursts of refreshes
+        are coalesced into one query, the display is updated back on the Tk thread."""
+        if not self.active():
+            return
+        # Read the widget state here, worker threads must not touch Tk
+        user_id = self.master.user.user_id
+        filters = dict(category=self.filter_var.get(), sorted_column=self.sorted_column, sort_reverse=self.sort_reverse)
+        threshold = self.VIRTUAL_THRESHOLD
+        search = self.search_text
+        archived = self.show_archived.get()
+        # The refresh is timed from the request to the displayed rows, queueing on the reader pool included
+        started = time.perf_counter()
+
+        # Define function to run on a reader thread
+        def load_tasks(session):
+            with timer("refresh_tasks query"):
+                # Read the change counter first, later changes are picked up by the next sync_tasks()
+                version = current_version(session)
+                categories = query_categories(session, user_id, archived)
+                if search:
+                    # Search results are capped, so they are always loaded at once. Only live tasks are indexed
+                    tasks = search_tasks(session, user_id, search, rows=True, **filters)
+                    return version, filters, len(tasks), tasks, categories
+                # Query the current user's tasks, filtered and sorted by the database
+                total = count_tasks(session, user_id, category=filters['category'], archived=archived)
+                # Above the threshold only the virtual window's pages are fetched, later
+                tasks = None
+                if total <= threshold:
+                    tasks = query_tasks(session, user_id, rows=True, archived=archived, **filters)
+                return version, dict(filters, archived=archived), total, tasks, categories
+
+        self.master.executor.submit_coalesced("refresh_tasks", load_tasks,
+                                              lambda result: self.on_tasks_loaded(result, started), self.show_db_error)
+
+    @timed("refresh_tasks display")
+    def on_tasks_loaded(self, result, started=None):
+        """Display the result of refresh_tasks(), on the Tk thread.
+        Input: (version, filters, total, tasks, categories), perf_counter() time of the request (optional)."""
+        if not self.winfo_exists():
+            return
+        self.sync_version, filters, total, tasks, categories = result
+        if tasks is None:
+            # Virtual mode, pages are fetched as the window scrolls over them
+            sorted_column = filters['sorted_column']
+            self.pages = PagedRows(total, position=lambda t: keyset_position(t, sorted_column))
+            self.page_filters = filters
+        else:
+            self.pages = None
+            # Changes still waiting in the write-behind queue win over the database values
+            self.all_tasks = TaskStore(self.write_behind.overlay(tasks))
+        # Update filter
+        self.update_filter_menu(categories)
+        # Refresh display
+        self.display_tasks()
+        self.update_report()
+        if started is not None:
+            PROFILER.record_since("refresh_tasks", started)
+
+    @timed("show_snapshot")
+    def show_snapshot(self):
+        """Display the warm-start snapshot of the user, with the filter and sort state it was saved with.
+        A full list is then brought up to date with a delta sync, a virtual window with a refresh.
+        Returns False when there is no usable snapshot."""
+        if not config.SNAPSHOT:
+            return False
+        user_id = self.master.user.user_id
+        snapshot = open_snapshot(snapshot_path(user_id), user_id)
+        if snapshot is None:
+            return False
+        with snapshot:
+            view = snapshot.view
+            # Only the rows around the viewport are saved for a virtual list, at most VIRTUAL_THRESHOLD otherwise
+            rows = snapshot.rows()
+            whole = snapshot.offset == 0 and len(rows) == snapshot.total
+            version, offset = snapshot.version, snapshot.offset
+        self.filter_var.set(view["category"])
+        self.sorted_column, self.sort_reverse = view["sorted_column"], view["sort_reverse"]
+        self.show_archived.set(view["archived"])
+        self.view_first = view["first"]
+        self.update_filter_menu(view["categories"])
+        self.all_tasks = TaskStore(rows)
+        self.display_tasks()
+        if whole:
+            self.sync_version = version
+            self.sync_tasks()
+            return True
+        # The saved window starts with overscan rows above the viewport
+        if rows:
+            self.tree.yview_moveto((self.view_first - offset) / len(rows))
+        self.refresh_tasks()
+        return True
+
+    def save_snapshot(self):
+        """Write the displayed rows and the view state to the user's warm-start snapshot. Search results are not
+        saved, the previous snapshot is kept instead."""
+        if not config.SNAPSHOT or self.sync_version is None or self.search_text:
+            return
+        rows = self.ordered_tasks()
+        total, offset = len(rows), 0
+        if self.pages is not None:
+            total = self.pages.total
+            _, offset, _ = window_range(self.view_first, int(self.tree.cget('height')), total, self.VIRTUAL_OVERSCAN)
+        view = dict(category=self.filter_var.get(), sorted_column=self.sorted_column, sort_reverse=self.sort_reverse,
+                    archived=self.show_archived.get(), first=self.view_first, categories=self.categories)
+        user_id = self.master.user.user_id
+        try:
+            save_snapshot(snapshot_path(user_id), user_id, self.sync_version, rows, view, total, offset)
+        except OSError as e:
+            # The snapshot only speeds up the next start, closing goes on without it
+            logging.getLogger(__name__).warning("Could not save the task list snapshot: %s", e)
+
+    def sync_tasks(self):
+        """Apply only the tasks inserted, updated or deleted since the last load, by this or another app instance.
+        The virtual list, search results and the list with archived tasks are reloaded instead."""
+        if self.sync_version is None or not self.active():
+            return
+        user_id = self.master.user.user_id
+        since = self.sync_version
+        reload = self.pages is not None or bool(self.search_text) or self.show_archived.get()
+
+        # Define function to run on a reader thread
+        def load_changes(session):
+            if reload:
+                return current_version(session), None, None, None
+            latest, changed, deleted = changes_since(session, user_id, since, rows=True)
+            categories = query_categories(session, user_id) if changed or deleted else None
+            return latest, changed, deleted, categories
+
+        def on_changes(result):
+            latest, changed, deleted, categories = result
+            # Skip results made outdated by a full refresh, or with nothing new
+            if not self.active() or self.sync_version != since or latest == since:
+                return
+            # A counter behind the loaded version means the database was replaced, e.g. restored from a backup
+            if changed is None or latest < since:
+                self.refresh_tasks()
+                return
+            category = self.filter_var.get()
+            changed = self.write_behind.overlay(changed)
+            self.all_tasks.apply_changes(changed, deleted, keep=lambda t: category in ("All", t.category))
+            self.sync_version = latest
+            if categories is not None:
+                self.update_filter_menu(categories)
             self.display_tasks()
+            self.update_report()
+
+        self.master.executor.submit_coalesced("sync_tasks", load_changes, on_changes, self.show_db_error)
+
+    def poll_changes(self):
+        """Periodic sync with the database, keeps several app instances on one database file in step."""
+        self.sync_tasks()
+        self._sync_job = self.after(self.SYNC_INTERVAL_MS, self.poll_changes)
+
+    def fetch_pages(self, pages, start, stop):
+        """Virtual mode. Fetch the missing pages of [start, stop) on a reader thread, then redisplay.
+        Input: PagedRows, row range."""
+        if not self.active():
+            return
+        user_id = self.master.user.user_id
+        filters = self.page_filters
+        requests = pages.requests(pages.missing(start, stop))
 
-        # Start the database operation in a new thread, auto close thread
-        threading.Thread(target=load_and_display_tasks, daemon=True).start()
+        def load_pages(session):
+            return pages.fetch_pages(requests, lambda limit, offset, after: query_tasks(
+                session, user_id, limit=limit, offset=offset, after=after, rows=True, **filters))
 
-    def update_filter_menu(self):
-        """Update the filter menu, Fills dropdown with all unique categories."""
-        categories = sorted({task.category for task in self.all_tasks})
+        def on_loaded(fetched):
+            # Ignore pages of a list that was replaced by a newer refresh
+            if pages is self.pages and self.winfo_exists():
+                pages.put_pages({page: self.write_behind.overlay(rows) for page, rows in fetched.items()})
+                self.display_tasks()
+
+        self.master.executor.submit_coalesced("fetch_pages", load_pages, on_loaded, self.show_db_error)
+
+    def show_db_error(self, error):
+        """Error callback of database jobs, on the Tk thread. Input: exception."""
+        messagebox.showerror("Error", f"Database error: {error}")
+
+    def update_filter_menu(self, categories):
+        """Update the filter menu, Fills dropdown with all unique categories. Input: sorted categories."""
+        self.categories = list(categories)
         menu = self.filter_menu['menu']
         menu.delete(0, 'end')
         menu.add_command(label="All", command=lambda: self.set_filter("All"))
         for cat in categories:
             menu.add_command(label=cat, command=lambda c=cat: self.set_filter(c))
 
+    def on_search_typed(self, *args):
+        """Search box trace. Restart the debounce timer on every keystroke."""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DEBOUNCE_MS, self.apply_search)
+
+    def apply_search(self):
+        """Run the search typed in the search box, an empty box shows every task again."""
+        self._search_job = None
+        text = self.search_var.get().strip()
+        if text == self.search_text:
+            return
+        self.search_text = text
+        # New results start at the top of the list without the old selection
+        self.view_first = 0
+        self.selected_ids.clear()
+        self.refresh_tasks()
+
+    def toggle_archived(self):
+        """Show archived checkbutton command. Reload the list with or without the archived tasks."""
+        self.view_first = 0
+        self.selected_ids.clear()
+        self.refresh_tasks()
+
     def set_filter(self, value):
         """Set the filter, changes the current filter category to display correctly. Input: filter category."""
         self.filter_var.set(value)
-        self.display_tasks()
+        # A new filter starts at the top of the list without the old selection
+        self.view_first = 0
+        self.selected_ids.clear()
+        self.refresh_tasks()
 
+    @timed("display_tasks")
     def display_tasks(self):
         """Refresh the tree view display with tasks"""
-        # Remove all tasks from the tree
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        # Add all the tasks back in
-        tasks = self.all_tasks
-        if self.filter_var.get() != "All":
-            tasks = [t for t in tasks if t.category == self.filter_var.get()]
-
-        # Sort the selected column based on content
-        if self.sorted_column:
-            keymap = {
-                '✓/x': lambda t: t.complete,
-                'Title': lambda t: t.title,
-                'Due Date': lambda t: datetime.strptime(t.due_date, "%Y-%m-%d") if isinstance(t.due_date, str) else t.due_date,
-                'Description': lambda t: (t.description[:42] + '...') if len(t.description) > 45 else t.description,
-                'Priority': lambda t: t.priority,
-                'Category': lambda t: t.category
-            }
-            tasks.sort(key=keymap[self.sorted_column], reverse=self.sort_reverse)
-
-        # Insert values for each task
-        for task in tasks:
-            # Custom output for completed column given boolean state
-            complete_text = "✓" if task.complete else "x"
-            # Otherwise fill with content
-            self.tree.insert('', 'end', iid=task.task_id,
-                             values=(complete_text, task.title, task.due_date, task.description, task.priority, task.category))
+        # In virtual mode only the rows around the viewport are materialized
+        if self.pages is not None:
+            visible = int(self.tree.cget('height'))
+            self.view_first, start, stop = window_range(self.view_first, visible, self.pages.total, self.VIRTUAL_OVERSCAN)
+            # Keep the current rows on screen until the missing pages arrive
+            if self.pages.missing(start, stop):
+                self.fetch_pages(self.pages, start, stop)
+                return
+            self.all_tasks = TaskStore(self.pages.rows(start, stop))
+
+        # Only rows that were added, removed, changed or reordered are touched
+        self.tree_sync.sync((task.task_id, self.task_values(task)) for task in self.ordered_tasks())
+
+        if self.pages is not None:
+            # Scroll past the overscan rows above the viewport and place the scrollbar over the full list
+            if self.all_tasks:
+                self.tree.yview_moveto((self.view_first - start) / len(self.all_tasks))
+            total = max(self.pages.total, 1)
+            self.scrollbar.set(self.view_first / total, min(1.0, (self.view_first + visible) / total))
+            # Rows scrolled back into the window get their selection back
+            shown = [iid for iid in self.selected_ids if iid in self.tree_sync.rows]
+            if shown:
+                self.tree.selection_set(shown)
+        else:
+            self.selected_ids &= set(self.tree_sync.rows)
+
+    def ordered_tasks(self):
+        """Helper function. Loaded tasks in display order."""
+        # A full load arrives sorted by the query in refresh_tasks(), tasks from a delta need the sorted view
+        if self.sorted_column and self.pages is None:
+            return self.all_tasks.sorted_tasks(self.sorted_column, self.sort_reverse)
+        return list(self.all_tasks)
+
+    def scroll_to(self, first):
+        """Virtual mode. Move the viewport so the given row is at the top. Input: row index."""
+        if first != self.view_first:
+            self.view_first = first
+            self.display_tasks()
+
+    def on_scrollbar(self, *args):
+        """Scrollbar command. Scrolls the tree, or the window of rows in virtual mode. Input: scroll arguments."""
+        if self.pages is None:
+            self.tree.yview(*args)
+            return
+        if args[0] == 'moveto':
+            first = int(float(args[1]) * self.pages.total)
+        else:
+            step = int(args[1])
+            first = self.view_first + (step * int(self.tree.cget('height')) if args[2] == 'pages' else step)
+        self.scroll_to(first)
+
+    def on_tree_scroll(self, first, last):
+        """Tree yscrollcommand. In virtual mode the scrollbar tracks the window instead. Input: visible fractions."""
+        if self.pages is None:
+            self.scrollbar.set(first, last)
+
+    def on_mousewheel(self, event):
+        """Mouse wheel handler. Scrolls the window of rows in virtual mode. Input: event action."""
+        if self.pages is None:
+            return None
+        up = event.num == 4 or getattr(event, 'delta', 0) > 0
+        self.scroll_to(self.view_first + (-3 if up else 3))
+        return "break"
+
+    def on_select(self, event):
+        """Selection handler. Keeps the selection of rows scrolled out of the window. Input: event action."""
+        self.selected_ids = (self.selected_ids - set(self.tree_sync.rows)) | set(self.tree_selection())
+
+    @staticmethod
+    def task_values(task):
+        """Helper function. Treeview row values of a task. Input: task."""
+        # Custom output for completed column given boolean state
+        complete_text = "✓" if task.complete else "x"
+        # Otherwise fill with content
+        return complete_text, task.title, task.due_date, task.description_preview, task.priority, task.category
 
     def add_task(self):
         """Open window to add Task."""
@@ -143,35 +513,91 @@ class TaskListFrame(tk.Frame):
 
     def edit_task(self):
         """Open window to edit currently selected Task"""
-        task = self.get_selected_task()
-        if task:
-            TaskDialog(self, task)
+        self.get_selected_task(lambda task: TaskDialog(self, task))
 
     def delete_task(self):
-        """Delete the currently selected task, threaded to prevent blocking"""
-        task = self.get_selected_task()
+        """Delete the selected tasks with a single DELETE statement, run in the background"""
+        task_ids = self.get_selected_ids()
+        if not task_ids:
+            return
         # Open confirmation popup window
-        if task and messagebox.askyesno("Confirm", "Delete this task?"):
-            # Define delete function to thread
-            def delete_task_in_thread():
-                # Delete task in the background
-                self.master.db.delete(task)
-                self.master.db.commit()
-                self.refresh_tasks()
-            # Thread the delete operation
-            threading.Thread(target=delete_task_in_thread, daemon=True).start()
+        prompt = "Delete this task?" if len(task_ids) == 1 else f"Delete {len(task_ids)} tasks?"
+        if messagebox.askyesno("Confirm", prompt):
+            user_id = self.master.user.user_id
+            archived = self.show_archived.get()
+            # Define delete function to run on the database writer thread
+            def delete_tasks_in_background(session):
+                return bulk_delete_tasks(session, user_id, task_ids, archived)
+            self.master.executor.submit_write(delete_tasks_in_background,
+                                              lambda _: self.sync_tasks(), self.show_db_error)
+
+    def bulk_update(self, **values):
+        """Set the same values on every selected task with a single UPDATE statement. Input: column=value pairs."""
+        task_ids = self.get_selected_ids()
+        if not task_ids:
+            return
+        user_id = self.master.user.user_id
+        # Queued toggles and edits are written first, the writer thread keeps the order
+        self.write_behind.flush()
+
+        def update_tasks_in_background(session):
+            return bulk_update_tasks(session, user_id, task_ids, **values)
+        self.master.executor.submit_write(update_tasks_in_background,
+                                          lambda _: self.sync_tasks(), self.show_db_error)
+
+    def bulk_set_category(self):
+        """Ask for a category and move every selected task to it."""
+        if self.get_selected_ids():
+            category = simpledialog.askstring("Set Category", "New category:", parent=self)
+            if category and category.strip():
+                self.bulk_update(category=category.strip())
+
+    def bulk_set_priority(self):
+        """Ask for a priority and set it on every selected task."""
+        if self.get_selected_ids():
+            priority = simpledialog.askinteger("Set Priority", "New priority (1-5):", parent=self,
+                                               minvalue=1, maxvalue=5)
+            if priority is not None:
+                self.bulk_update(priority=priority)
+
+    def tree_selection(self):
+        """Helper function. Task ids of the selected rows, the Treeview hands its iids back as strings."""
+        return [int(iid) for iid in self.tree.selection()]
+
+    def get_selected_ids(self):
+        """Helper function to get the ids of all selected tasks, including rows scrolled out of the virtual window."""
+        task_ids = sorted(self.selected_ids | set(self.tree_selection()))
+        # If no selection, display a warning popup window
+        if not task_ids:
+            messagebox.showwarning("Warning", "No task selected.")
+        return task_ids
 
-    def get_selected_task(self):
-        """Helper function to get the selected task from treeview selection."""
-        sel = self.tree.selection()
+    def get_selected_task(self, on_task):
+        """Helper function to get the selected task from treeview selection. A row outside the virtual window is
+        loaded on a reader thread. Input: callback run with the task on the Tk thread."""
+        # In virtual mode the selected row may have been scrolled out of the tree
+        sel = self.tree_selection() or sorted(self.selected_ids)
         # If no selection, display a warning popup window
         if not sel:
             messagebox.showwarning("Warning", "No task selected.")
-            return None
+            return
         # Obtain the task_id
         task_id = sel[0]
-        # Return the corresponding task to the unique task_id
-        return next((t for t in self.all_tasks if t.task_id == task_id), None)
+        # Pass on the corresponding task to the unique task_id
+        task = self.all_tasks.get(task_id)
+        if task is not None:
+            on_task(task)
+            return
+        # Selected row is outside the virtual window, load it as a plain row
+        archived = self.show_archived.get()
+
+        def on_loaded(row):
+            # Skipped when the task was deleted meanwhile or the frame is gone
+            if row is not None and self.active():
+                on_task(row)
+
+        self.master.executor.submit_read(lambda session: task_row(session, task_id, archived), on_loaded,
+                                         self.show_db_error)
 
     def sort_by(self, col):
         """Helper function that determines the next state of the sort function. Input: column to sort"""
@@ -182,24 +608,101 @@ class TaskListFrame(tk.Frame):
             self.sorted_column = col
             self.sort_reverse = False
 
-        # Refresh the display
-        self.display_tasks()
+        # Reload the tasks in the new order
+        self.refresh_tasks()
 
+    def import_tasks(self):
+        """Ask for a CSV/JSONL file and import its tasks on the database writer thread, in batches"""
+        path = filedialog.askopenfilename(parent=self, title="Import Tasks", filetypes=TRANSFER_FILETYPES)
+        if not path:
+            return
+        user_id = self.master.user.user_id
+
+        def on_imported(result):
+            imported, skipped = result
+            messagebox.showinfo("Import", f"Imported {imported} tasks, skipped {skipped} existing.")
+            self.sync_tasks()
+
+        def on_failed(error):
+            # Batches before the failing line are already committed
+            messagebox.showerror("Import", f"Import stopped: {error}")
+            self.sync_tasks()
+
+        self.master.executor.submit_write(lambda session: import_file(session, user_id, path),
+                                          on_imported, on_failed)
+
+    def export_tasks(self):
+        """Ask for a target file and stream every task of the user to it in the background"""
+        path = filedialog.asksaveasfilename(parent=self, title="Export Tasks", defaultextension=".csv",
+                                            filetypes=TRANSFER_FILETYPES)
+        if not path:
+            return
+        user_id = self.master.user.user_id
+        # Queued toggles and edits are committed first, running after them on the writer thread keeps that order
+        self.write_behind.flush()
+        self.master.executor.submit_write(
+            lambda session: export_file(session, user_id, path),
+            lambda exported: messagebox.showinfo("Export", f"Exported {exported} tasks."),
+            lambda error: messagebox.showerror("Export", f"Could not export tasks: {error}"))
+
+    @timed("show_report")
     def show_report(self):
-        """Display the category distribution pie chart"""
-        counts = {}
-        for task in self.all_tasks:
-            category = "Complete" if task.complete else task.category
-            counts[category] = counts.get(category, 0) + 1
-
-        fig = Figure(figsize=(4, 4))
-        ax = fig.add_subplot(111)
-        ax.pie(counts.values(), labels=counts.keys(), autopct='%1.1f%%')
-        report_win = tk.Toplevel(self)
-        report_win.title("Task Categories Report")
-        canvas = FigureCanvasTkAgg(fig, master=report_win)
-        canvas.draw()
-        canvas.get_tk_widget().pack()
+        """Display the category distribution pie chart. The window is created once and kept up to date."""
+        if self.report_window is not None and self.report_window.winfo_exists():
+            self.report_window.lift()
+        else:
+            # matplotlib is only loaded when the first report is opened
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            from matplotlib.figure import Figure
+            self.report_window = tk.Toplevel(self)
+            self.report_window.title("Task Categories Report")
+            figure = Figure(figsize=(4, 4))
+            self.report_axes = figure.add_subplot(111)
+            self.report_canvas = FigureCanvasTkAgg(figure, master=self.report_window)
+            self.report_canvas.get_tk_widget().pack()
+            self.report_drawn = None
+        self.update_report()
+
+    def update_report(self):
+        """Recount the open report. Uses the counts kept by the loaded tasks when they hold every task,
+        otherwise one GROUP BY query on a reader thread, cached until the change counter moves."""
+        if not self.active() or self.report_window is None or not self.report_window.winfo_exists():
+            return
+        if (self.pages is None and self.filter_var.get() == "All" and not self.search_text
+                and self.sync_version is not None):
+            self.draw_report(self.all_tasks.report_counts())
+            return
+        user_id = self.master.user.user_id
+        archived = self.show_archived.get()
+        cached = self.report_cache
+
+        def count_categories(session):
+            key = (current_version(session), archived)
+            if cached and cached[0] == key:
+                return cached
+            return key, report_counts(session, user_id, archived)
+
+        def on_counted(result):
+            self.report_cache = result
+            self.draw_report(result[1])
+
+        self.master.executor.submit_coalesced("report_counts", count_categories, on_counted, self.show_db_error)
+
+    @timed("draw_report")
+    def draw_report(self, counts):
+        """Redraw the pie chart of the report window, only when the counts changed. Input: category counts."""
+        if self.report_window is None or not self.report_window.winfo_exists() or counts == self.report_drawn:
+            return
+        self.report_drawn = counts
+        # Same slice order whichever source counted
+        counts = dict(sorted(counts.items()))
+        self.report_axes.clear()
+        if counts:
+            self.report_axes.pie(counts.values(), labels=counts.keys(), autopct='%1.1f%%')
+        else:
+            self.report_axes.text(0.5, 0.5, "No tasks", ha='center', va='center')
+            self.report_axes.set_axis_off()
+        self.report_canvas.draw_idle()
 
 class TaskDialog(tk.Toplevel):
     """TaskDialog class. Popup window for adding and editing tasks. Inherits from tk.TopLevel."""
@@ -209,7 +712,6 @@ class TaskDialog(tk.Toplevel):
         super().__init__(master)
         self.master = master
         self.task = task
-        self.session = self.master.master.db
 
         # Status is set based on if a task is selected or not
         self.title("Edit Task" if task else "New Task")
@@ -218,10 +720,12 @@ class TaskDialog(tk.Toplevel):
         ttk.Label(self, text="Title:").grid(row=0, column=0, sticky='e')
         self.title_var = tk.StringVar(value=task.title if task else "")
         ttk.Entry(self, textvariable=self.title_var).grid(row=0, column=1)
-        # Description entry field
+        # Description entry field, the full text of an existing task is loaded in the background
         ttk.Label(self, text="Description:").grid(row=1, column=0, sticky='e')
-        self.desc_var = tk.StringVar(value=task.description if task else "")
-        ttk.Entry(self, textvariable=self.desc_var).grid(row=1, column=1)
+        self.desc_var = tk.StringVar(value="")
+        self.desc_entry = ttk.Entry(self, textvariable=self.desc_var)
+        self.desc_entry.grid(row=1, column=1)
+        self.description = None
         # Due date entry field
         ttk.Label(self, text="Due Date (YYYY-MM-DD):").grid(row=2, column=0, sticky='e')
         self.due_var = tk.StringVar(value=task.due_date if task else datetime.now().date().isoformat())
@@ -239,8 +743,29 @@ class TaskDialog(tk.Toplevel):
         self.comp_var = tk.BooleanVar(value=task.complete if task else False)
         ttk.Checkbutton(self, variable=self.comp_var).grid(row=5, column=1, sticky='w', padx=(2, 0))
         # Save button
-        ttk.Button(self, text="Save", command=self._on_save).grid(row=6, columnspan=2, pady=10)
+        self.save_button = ttk.Button(self, text="Save", command=self._on_save)
+        self.save_button.grid(row=6, columnspan=2, pady=10)
 
+        if task:
+            # List rows only carry the preview, the form waits for the full description before it can save
+            self.desc_entry.state(['disabled'])
+            self.save_button.state(['disabled'])
+            task_id, archived = task.task_id, master.show_archived.get()
+            master.master.executor.submit_read(lambda session: task_description(session, task_id, archived),
+                                               self.on_description_loaded, master.show_db_error)
+
+    def on_description_loaded(self, description):
+        """Fill in the full description of the edited task, on the Tk thread. Input: description."""
+        if not self.winfo_exists():
+            return
+        # A queued edit of the description is newer than the database
+        pending = self.master.write_behind.pending.get(self.task.task_id, {})
+        self.description = pending.get('description', description or "")
+        self.desc_var.set(self.description)
+        self.desc_entry.state(['!disabled'])
+        self.save_button.state(['!disabled'])
+
+    @timed("_on_save")
     def _on_save(self):
         """Validate the date in the entry form"""
         try:
@@ -249,36 +774,40 @@ class TaskDialog(tk.Toplevel):
             messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD.")
             return
 
-        def save_task_in_thread():
-            """Helper function. Save function to run in thread"""
-            try:
-                if not self.task:
-                    self.task = Task(
-                        task_id=str(uuid.uuid4()),
-                        user_id=int(self.master.master.user.user_id),
-                        title=self.title_var.get().strip(),
-                        description=self.desc_var.get().strip(),
-                        due_date=due_date,
-                        priority=int(self.prio_var.get()),
-                        category=self.cat_var.get().strip() or "General",
-                        complete=self.comp_var.get()
-                    )
-                    self.session.add(self.task)
-                else:
-                    self.task.title = self.title_var.get().strip()
-                    self.task.description = self.desc_var.get().strip()
-                    self.task.due_date = due_date
-                    self.task.priority = int(self.prio_var.get())
-                    self.task.category = self.cat_var.get().strip() or "General"
-                    self.task.complete = self.comp_var.get()
-
-                self.session.commit()
-                self.master.after(0, self.master.refresh_tasks)
-                self.master.after(0, self.destroy)
-
-            except Exception as e:
-                self.session.rollback()
-                self.master.after(0, lambda: messagebox.showerror("Error", f"Could not save task:"))
-
-        threading.Thread(target=save_task_in_thread, daemon=True).start()
-
+        # Read the form on the Tk thread, the save itself runs on the database writer thread
+        try:
+            values = dict(
+                title=self.title_var.get().strip(),
+                description=self.desc_var.get().strip(),
+                due_date=due_date,
+                priority=int(self.prio_var.get()),
+                category=self.cat_var.get().strip() or "General",
+                complete=self.comp_var.get()
+            )
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Error", "Could not save task: priority must be a number.")
+            return
+        # Edits are applied to the list at once and written by the write-behind queue
+        if self.task:
+            # An unchanged description is not written again, long notes stay out of the update
+            if values['description'] == self.description:
+                del values['description']
+            self.master.change_task(self.task, values)
+            self.destroy()
+            return
+        user_id = int(self.master.master.user.user_id)
+
+        def save_task_in_background(session):
+            """Helper function. Save function to run on the writer thread"""
+            # The database assigns the next task_id
+            session.add(Task(user_id=user_id, **values))
+
+        def on_saved(_):
+            # Both windows may be gone after a log out, sync_tasks() does nothing then
+            self.master.sync_tasks()
+            if self.winfo_exists():
+                self.destroy()
+
+        self.master.master.executor.submit_write(
+            save_task_in_background, on_saved,
+            lambda e: messagebox.showerror("Error", f"Could not save task: {e}"))
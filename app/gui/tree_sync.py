@@ -0,0 +1,99 @@
+from bisect import bisect_left
+
+
+class TreeSync:
+    """Keeps the rows of a ttk.Treeview in sync with a list of (iid, values), touching only rows that changed."""
+    def __init__(self, tree):
+        """Init for TreeSync class. Input: Treeview whose rows are only changed through this object."""
+        self.tree = tree
+        # Values currently shown for each iid, and the iids in display order
+        self.rows = {}
+        self.order = []
+
+    def sync(self, rows):
+        """Reconcile the tree with the wanted rows. Input: iterable of (iid, values) in display order.
+        Returns a dict counting inserted, updated, deleted and moved rows."""
+        desired = list(rows)
+        wanted = {iid for iid, _ in desired}
+        stats = {"inserted": 0, "updated": 0, "deleted": 0, "moved": 0}
+
+        # Delete rows that are no longer shown, in a single Tk call
+        stale = [iid for iid in self.order if iid not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self.rows[iid]
+            self.order = [iid for iid in self.order if iid in wanted]
+            stats["deleted"] = len(stale)
+
+        # Rows already in the right relative order stay where they are, only the others are moved
+        keep = _longest_ordered_run(self.order, desired)
+
+        previous = None
+        for iid, values in desired:
+            if iid not in self.rows:
+                # New row, insert right after the previous wanted row
+                index = self._index_after(previous)
+                self.tree.insert('', index, iid=iid, values=values)
+                self.order.insert(index, iid)
+                self.rows[iid] = values
+                stats["inserted"] += 1
+            else:
+                if self.rows[iid] != values:
+                    self.tree.item(iid, values=values)
+                    self.rows[iid] = values
+                    stats["updated"] += 1
+                if iid not in keep:
+                    self.order.remove(iid)
+                    index = self._index_after(previous)
+                    self.tree.move(iid, '', index)
+                    self.order.insert(index, iid)
+                    stats["moved"] += 1
+            previous = iid
+        return stats
+
+    def update_row(self, iid, values):
+        """Update the values of a single row in place. Input: iid, values."""
+        if iid in self.rows and self.rows[iid] != values:
+            self.tree.item(iid, values=values)
+            self.rows[iid] = values
+
+    def clear(self):
+        """Remove every row from the tree."""
+        if self.order:
+            self.tree.delete(*self.order)
+        self.rows.clear()
+        self.order.clear()
+
+    def _index_after(self, iid):
+        """Helper function. Tree index directly after the given iid, 0 for None. Input: iid or None."""
+        if iid is None:
+            return 0
+        # Appending after the last row is the common case of a first load, skip the linear search
+        if self.order[-1] == iid:
+            return len(self.order)
+        return self.order.index(iid) + 1
+
+
+def _longest_ordered_run(order, desired):
+    """Helper function. Largest set of existing rows whose current order already matches the desired order.
+    Input: current iids in order, desired (iid, values) list. Longest increasing subsequence, O(n log n)."""
+    position = {iid: i for i, iid in enumerate(order)}
+    ids = [iid for iid, _ in desired if iid in position]
+    tails, tail_ids, parent = [], [], {}
+    for iid in ids:
+        pos = position[iid]
+        k = bisect_left(tails, pos)
+        parent[iid] = tail_ids[k - 1] if k else None
+        if k == len(tails):
+            tails.append(pos)
+            tail_ids.append(iid)
+        else:
+            tails[k] = pos
+            tail_ids[k] = iid
+    keep = set()
+    iid = tail_ids[-1] if tail_ids else None
+    while iid is not None:
+        keep.add(iid)
+        iid = parent[iid]
+    return keep
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+
+
+class PagedRows:
+    """Rows of a query result addressed by index, fetched one page at a time and cached."""
+    def __init__(self, total, position=None, page_size=200, max_pages=16):
+        """Init for PagedRows class.
+        Input: total row count, position(row) -> keyset position (optional), rows per page, pages kept in memory."""
+        self.total = total
+        self.position = position
+        self.page_size = page_size
+        self.max_pages = max_pages
+        # page number -> rows, least recently used first
+        self.pages = OrderedDict()
+
+    def rows(self, start, stop):
+        """Return the cached rows with index in [start, stop). Input: start, stop."""
+        start, stop = max(0, start), min(stop, self.total)
+        if start >= stop:
+            return []
+        first_page, last_page = start // self.page_size, (stop - 1) // self.page_size
+        rows = []
+        for page in range(first_page, last_page + 1):
+            if page in self.pages:
+                self.pages.move_to_end(page)
+                rows.extend(self.pages[page])
+        offset = first_page * self.page_size
+        return rows[start - offset:stop - offset]
+
+    def missing(self, start, stop):
+        """Return the page numbers covering [start, stop) that are not cached. Input: start, stop."""
+        start, stop = max(0, start), min(stop, self.total)
+        if start >= stop:
+            return []
+        pages = range(start // self.page_size, (stop - 1) // self.page_size + 1)
+        return [page for page in pages if page not in self.pages]
+
+    def requests(self, pages):
+        """Plan the fetch of pages as (page, keyset position or None). Call on the thread owning the cache.
+        Input: page numbers."""
+        requests = []
+        for page in pages:
+            previous = self.pages.get(page - 1)
+            requests.append((page, self.position(previous[-1]) if self.position and previous else None))
+        return requests
+
+    def fetch_pages(self, requests, fetch):
+        """Fetch planned pages without touching the cache, safe on a worker thread.
+        Input: requests from requests(), fetch(limit, offset, after) -> rows. Returns {page: rows}."""
+        fetched = {}
+        for page, after in requests:
+            # Continue from the previous page with keyset pagination when it is known, deep OFFSETs are slow
+            previous = fetched.get(page - 1)
+            if self.position and previous:
+                after = self.position(previous[-1])
+            if after is not None:
+                fetched[page] = fetch(self.page_size, 0, after)
+            else:
+                fetched[page] = fetch(self.page_size, page * self.page_size, None)
+        return fetched
+
+    def put_pages(self, fetched):
+        """Add fetched pages to the cache, dropping the least recently used ones. Input: {page: rows}."""
+        for page, rows in fetched.items():
+            self.pages[page] = rows
+            self.pages.move_to_end(page)
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+
+    def load(self, start, stop, fetch):
+        """Fetch the missing pages of [start, stop) and return its rows, in the calling thread.
+        Input: start, stop, fetch(limit, offset, after) -> rows."""
+        self.put_pages(self.fetch_pages(self.requests(self.missing(start, stop)), fetch))
+        return self.rows(start, stop)
+
+
+def window_range(first, visible, total, overscan):
+    """Compute the rows to materialize for a viewport. Input: first visible row, visible rows, total rows, overscan.
+    Returns the clamped first visible row and the [start, stop) range including the overscan."""
+    first = max(0, min(first, total - visible))
+    start = max(0, first - overscan)
+    stop = min(total, first + visible + overscan)
+    return first, start, stop
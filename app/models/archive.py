@@ -0,0 +1,61 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Boolean, Index, Computed, func
+from sqlalchemy.orm import deferred
+
+from app.database.db import Base
+from app.models.task import DESCRIPTION_PREVIEW_SQL
+
+class TaskCompletion(Base):
+    """Completion time of every completed live task, kept by triggers. A side table, so stamping the time
+    does not update the task row and bump the change counter again"""
+    # Table name
+    __tablename__ = 'task_completions'
+    __table_args__ = (
+        Index('ix_task_completions_completed_at', 'completed_at'),
+    )
+
+    # Attributes, UTC time of the last completion
+    task_id = Column(Integer, primary_key=True, autoincrement=False)
+    completed_at = Column(DateTime, nullable=False)
+
+class ArchivedTask(Base):
+    """Archived task table. Tasks completed long ago are moved here with the same columns and task_id,
+    so the tasks table and its indexes only hold the working set"""
+    # Table name
+    __tablename__ = 'archived_tasks'
+    __table_args__ = (
+        Index('ix_archived_tasks_user', 'user_id', 'task_id'),
+    )
+
+    # Attributes, as in tasks
+    task_id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.user_id"))
+    description = deferred(Column(String, nullable=True))
+    due_date = Column(Date, nullable=False)
+    priority = Column(Integer, nullable=False)
+    category = Column(String, nullable=False)
+    complete = Column(Boolean, nullable=False)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    description_preview = Column(String, Computed(DESCRIPTION_PREVIEW_SQL, persisted=False))
+    # Completion time the task was archived for, and when the archiver moved it
+    completed_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, nullable=False, server_default=func.current_timestamp())
+
+# Triggers recording when tasks are completed, for every way a task gets completed: the task form, toggles and
+# bulk updates, and inserts of completed tasks (imports, restores). Reopening or deleting a task forgets the time.
+COMPLETION_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS tasks_completion_insert AFTER INSERT ON tasks WHEN NEW.complete
+    BEGIN
+        INSERT OR REPLACE INTO task_completions (task_id, completed_at) VALUES (NEW.task_id, CURRENT_TIMESTAMP);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_completion_update AFTER UPDATE OF complete ON tasks
+    WHEN NEW.complete IS NOT OLD.complete
+    BEGIN
+        DELETE FROM task_completions WHERE task_id = OLD.task_id;
+        INSERT INTO task_completions (task_id, completed_at) SELECT NEW.task_id, CURRENT_TIMESTAMP WHERE NEW.complete;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_completion_delete AFTER DELETE ON tasks
+    BEGIN
+        DELETE FROM task_completions WHERE task_id = OLD.task_id;
+    END""",
+]
@@ -0,0 +1,28 @@
+from sqlalchemy import column, table
+
+# FTS5 index over task titles and descriptions. It is an external content table reading the text from
+# tasks by rowid, so the text is not stored twice. The rowid is the INTEGER PRIMARY KEY task_id, so it survives
+# VACUUM. The 2 and 3 character prefix indexes keep prefix queries from scanning every term of the vocabulary.
+tasks_fts = table("tasks_fts", column("rowid"), column("rank"))
+
+SEARCH_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    # Triggers keeping the index in step with inserts, deletes and title/description edits
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (NEW.rowid, NEW.title, NEW.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (NEW.rowid, NEW.title, NEW.description);
+    END""",
+]
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+
+from app.database.db import Base
+
+class SessionToken(Base):
+    """Remember-me token table, inherits from ORM Base class. Only a SHA-256 hash of the secret part is stored."""
+    # Table name
+    __tablename__ = 'session_tokens'
+    __table_args__ = (
+        Index('ix_session_tokens_user', 'user_id'),
+    )
+
+    # Attributes
+    # Public half of the token, looked up by primary key
+    selector = Column(String, primary_key=True)
+    # SHA-256 hex digest of the secret half
+    verifier_hash = Column(String, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
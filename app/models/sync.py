@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Integer, Index
+
+from app.database.db import Base
+
+class SyncCounter(Base):
+    """Change counter table, a single row incremented by every insert, update and delete of a task"""
+    # Table name
+    __tablename__ = 'sync_counter'
+
+    # Attributes
+    id = Column(Integer, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+class TaskTombstone(Base):
+    """Tombstone table, remembers deleted tasks so other views can drop them without a full reload"""
+    # Table name
+    __tablename__ = 'task_tombstones'
+    __table_args__ = (
+        Index('ix_task_tombstones_user_version', 'user_id', 'version'),
+    )
+
+    # Attributes
+    task_id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer)
+    version = Column(Integer, nullable=False)
+
+# Triggers stamping tasks with the next counter value and recording tombstones.
+# The update trigger skips its own version write, so it does not fire again.
+SYNC_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS tasks_version_insert AFTER INSERT ON tasks
+    BEGIN
+        UPDATE sync_counter SET value = value + 1 WHERE id = 1;
+        UPDATE tasks SET version = (SELECT value FROM sync_counter WHERE id = 1) WHERE rowid = NEW.rowid;
+        DELETE FROM task_tombstones WHERE task_id = NEW.task_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_version_update AFTER UPDATE ON tasks WHEN NEW.version = OLD.version
+    BEGIN
+        UPDATE sync_counter SET value = value + 1 WHERE id = 1;
+        UPDATE tasks SET version = (SELECT value FROM sync_counter WHERE id = 1) WHERE rowid = NEW.rowid;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_version_delete AFTER DELETE ON tasks
+    BEGIN
+        UPDATE sync_counter SET value = value + 1 WHERE id = 1;
+        INSERT OR REPLACE INTO task_tombstones (task_id, user_id, version)
+        VALUES (OLD.task_id, OLD.user_id, (SELECT value FROM sync_counter WHERE id = 1));
+    END""",
+]
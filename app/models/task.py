@@ -1,23 +1,47 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Boolean, Index, Computed
+from sqlalchemy.orm import deferred, relationship
 
 from app.database.db import Base
 
+# Bounded description shown and sorted on by the list view, same text as description_preview() in
+# app.store.task_row. A virtual generated column: computed when read, nothing to keep in step on writes.
+DESCRIPTION_PREVIEW_SQL = ("CASE WHEN length(description) > 45 THEN substr(description, 1, 42) || '...' "
+                           "ELSE coalesce(description, '') END")
+
 class Task(Base):
     """Task table, inherits from ORM Base class"""
     # Table name
     __tablename__ = 'tasks'
+    # Indexes for the list view: user scope, completion/category filters and due date/priority ordering.
+    # task_id is the sort tiebreaker, so pages are read in index order without a temporary sort.
+    __table_args__ = (
+        Index('ix_tasks_user_complete_due', 'user_id', 'complete', 'due_date', 'task_id'),
+        Index('ix_tasks_user_category', 'user_id', 'category', 'task_id'),
+        Index('ix_tasks_user_due', 'user_id', 'due_date', 'task_id'),
+        Index('ix_tasks_user_priority', 'user_id', 'priority', 'task_id'),
+        Index('ix_tasks_user_version', 'user_id', 'version'),
+        # Description sort, reads the stored previews in order instead of truncating every description
+        Index('ix_tasks_user_preview', 'user_id', 'description_preview', 'task_id'),
+        # Ids are never reused, so a deleted task's id cannot reach a newer task through tombstones or queued edits
+        {'sqlite_autoincrement': True},
+    )
 
     # Attributes
-    task_id = Column(String, primary_key=True)
+    # INTEGER PRIMARY KEY is the rowid itself: appends go to the end of the table B-tree
+    # and every index entry carries a small integer instead of a 36 character UUID
+    task_id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
     # Links tasks to user
     user_id = Column(Integer, ForeignKey("users.user_id"))
-    description = Column(String, nullable=True)
+    # Unbounded notes, deferred: loaded on access, e.g. by the task form, not by list queries
+    description = deferred(Column(String, nullable=True))
     due_date = Column(Date, nullable=False)
     priority = Column(Integer, nullable=False)
     category = Column(String, nullable=False)
     complete = Column(Boolean, nullable=False)
+    # Change counter value of the last insert or update, set by the sync triggers
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    description_preview = Column(String, Computed(DESCRIPTION_PREVIEW_SQL, persisted=False))
 
     # Define the relationship to User
-    owner = relationship("User", back_populates="tasks")
\ No newline at end of file
+    owner = relationship("User", back_populates="tasks")
@@ -0,0 +1,117 @@
+from datetime import date, datetime
+
+import numpy as np
+
+from app.store.task_store import description_key
+
+
+def _due_ordinal(due_date):
+    """Helper function. Day number of a due date, string dates are parsed like the list view keymap. Input: due date."""
+    if isinstance(due_date, str):
+        due_date = datetime.strptime(due_date, "%Y-%m-%d")
+    if isinstance(due_date, datetime):
+        due_date = due_date.date()
+    return due_date.toordinal() if isinstance(due_date, date) else 0
+
+
+def _codes(values):
+    """Helper function. Encode strings as integers ordered like the strings. Input: strings.
+    Returns (sorted unique strings, code of every value)."""
+    values = np.array(list(values), dtype=object)
+    if not len(values):
+        return [], np.zeros(0, dtype=np.int64)
+    names, codes = np.unique(values, return_inverse=True)
+    return list(names), codes.astype(np.int64)
+
+
+class TaskColumns:
+    """Read-only columnar snapshot of a task list. Each column is a NumPy array, so filters are boolean masks
+    and sorts are one argsort/lexsort, with the same ordering as the list view keymap."""
+    def __init__(self, tasks=()):
+        """Init for TaskColumns class. Input: tasks, the snapshot keeps their order."""
+        self.tasks = list(tasks)
+        count = len(self.tasks)
+        self.priority = np.fromiter((t.priority for t in self.tasks), dtype=np.int64, count=count)
+        self.due = np.fromiter((_due_ordinal(t.due_date) for t in self.tasks), dtype=np.int64, count=count)
+        self.complete = np.fromiter((bool(t.complete) for t in self.tasks), dtype=bool, count=count)
+        self.category_names, self.category = _codes(t.category for t in self.tasks)
+        # Sort keys of the text columns, encoded on first use
+        self._text_keys = {}
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def sort_key(self, column):
+        """Return an integer array ordered like the column's keymap values. Input: column heading."""
+        if column == '✓/x':
+            return self.complete.astype(np.int64)
+        if column == 'Due Date':
+            return self.due
+        if column == 'Priority':
+            return self.priority
+        if column == 'Category':
+            return self.category
+        if column not in self._text_keys:
+            if column == 'Title':
+                values = (t.title for t in self.tasks)
+            elif column == 'Description':
+                values = (description_key(t) for t in self.tasks)
+            else:
+                raise KeyError(column)
+            self._text_keys[column] = _codes(values)[1]
+        return self._text_keys[column]
+
+    def mask(self, category="All", complete=None):
+        """Return the boolean mask of tasks matching the filters. Input: category filter, completion filter."""
+        selected = np.ones(len(self.tasks), dtype=bool)
+        if category != "All":
+            # A category missing from the snapshot matches nothing
+            position = np.searchsorted(self.category_names, category) if self.category_names else 0
+            if position < len(self.category_names) and self.category_names[position] == category:
+                selected &= self.category == position
+            else:
+                selected[:] = False
+        if complete is not None:
+            selected &= self.complete == bool(complete)
+        return selected
+
+    def order(self, sort=(), indices=None):
+        """Return task positions sorted by one or more columns. Ties keep snapshot order, also when reversed,
+        like sorted(). Input: [(column, reverse)] from most to least significant, positions to sort (optional)."""
+        if indices is None:
+            indices = np.arange(len(self.tasks))
+        if not sort or not len(indices):
+            return indices
+        # lexsort is stable and treats its last key as the primary one, a reversed column sorts on its negation
+        keys = [-self.sort_key(column)[indices] if reverse else self.sort_key(column)[indices]
+                for column, reverse in reversed(sort)]
+        return indices[np.lexsort(keys)]
+
+    def select(self, category="All", complete=None, sort=()):
+        """Return the tasks matching the filters in sorted order. Input: filters, [(column, reverse)]."""
+        indices = np.flatnonzero(self.mask(category, complete))
+        return [self.tasks[i] for i in self.order(sort, indices)]
+
+    def filter_tasks(self, category):
+        """Return the tasks of a category, 'All' returns every task. Input: category filter."""
+        return self.select(category)
+
+    def sorted_tasks(self, column, reverse=False, category="All"):
+        """Return tasks ordered by one column. Input: column, reverse, category filter."""
+        return self.select(category, sort=[(column, reverse)] if column else ())
+
+    def categories(self):
+        """Return the sorted list of categories."""
+        return list(self.category_names)
+
+    def report_counts(self):
+        """Return a dict of category→count, grouping completed under 'Complete'."""
+        open_counts = np.bincount(self.category[~self.complete], minlength=len(self.category_names))
+        counts = {name: int(count) for name, count in zip(self.category_names, open_counts) if count}
+        completed = int(self.complete.sum())
+        if completed:
+            counts["Complete"] = completed
+        return counts
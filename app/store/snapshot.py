@@ -0,0 +1,166 @@
+"""Warm-start snapshot of a user's task list: the last displayed rows in a binary, memory-mappable file.
+
+Layout, little-endian: a HEADER, the view state as UTF-8 JSON, padding to 8 bytes, one fixed-size RECORD per row
+in display order, then a heap with the text of every row. Rows are decoded from the memory map on access, so
+opening a snapshot and showing its first rows costs the same for any number of tasks.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+from datetime import date
+
+from app import config
+from app.store.task_row import TaskRow
+
+MAGIC = b"ETSN"
+# Bumped whenever the layout changes, older files are ignored
+FORMAT_VERSION = 2
+# magic, format version, user_id, change counter value, rows in the full list, index of the first saved row,
+# saved rows, view JSON bytes
+HEADER = struct.Struct("<4sH2xqqIIII")
+# task_id, due date ordinal (0: none), priority, complete, then (heap offset, byte length) of title,
+# description preview and category
+RECORD = struct.Struct("<qiiB3xIIIIII")
+# Byte length of a missing string
+NONE = 0xFFFFFFFF
+
+
+class Snapshot:
+    """Read view of a snapshot file through a memory map. Close it when done, the map keeps the file open."""
+    def __init__(self, path):
+        """Init for Snapshot class. Input: file path. Raises OSError or ValueError for unusable files."""
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < HEADER.size:
+                raise ValueError("snapshot is truncated")
+            (magic, version, self.user_id, self.version, self.total, self.offset, count,
+             view_length) = HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError("not a snapshot of this format")
+            self.view = json.loads(bytes(self._map[HEADER.size:HEADER.size + view_length]).decode("utf-8"))
+            self._records = _align(HEADER.size + view_length)
+            self._heap = self._records + count * RECORD.size
+            if self._heap > len(self._map):
+                raise ValueError("snapshot is truncated")
+            self._count = count
+        except Exception:
+            self._map.close()
+            raise
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def row(self, index):
+        """Decode one row as a TaskRow. Input: row index within the snapshot."""
+        (task_id, due, priority, complete, title_at, title_length, preview_at, preview_length,
+         category_at, category_length) = RECORD.unpack_from(self._map, self._records + index * RECORD.size)
+        return TaskRow(task_id, self._text(title_at, title_length), date.fromordinal(due) if due else None,
+                       self._text(preview_at, preview_length), priority,
+                       self._text(category_at, category_length), bool(complete))
+
+    def rows(self, start=0, stop=None):
+        """Decode the rows with index in [start, stop). Input: start, stop (optional, every row)."""
+        stop = self._count if stop is None else min(stop, self._count)
+        return [self.row(index) for index in range(max(0, start), stop)]
+
+    def close(self):
+        """Release the memory map."""
+        self._map.close()
+
+    def _text(self, at, length):
+        """Helper function. Decode a string of the heap. Input: heap offset, byte length."""
+        if length == NONE:
+            return None
+        start = self._heap + at
+        return self._map[start:start + length].decode("utf-8")
+
+
+def save_snapshot(path, user_id, version, rows, view, total=None, offset=0):
+    """Write rows to a snapshot file, readable by the current user only. The file is replaced atomically, so
+    readers see the old or the new snapshot. Input: path, user_id, change counter value the rows are current with,
+    rows in display order, view state dict, rows in the full list (optional), index of the first row (optional).
+    Returns the number of saved rows."""
+    records = []
+    heap = bytearray()
+
+    def text(value):
+        """Helper function. Append a string to the heap. Input: string or None. Returns (offset, byte length)."""
+        if value is None:
+            return 0, NONE
+        data = str(value).encode("utf-8")
+        heap.extend(data)
+        return len(heap) - len(data), len(data)
+
+    for row in rows:
+        due = row.due_date
+        records.append(RECORD.pack(row.task_id, due.toordinal() if isinstance(due, date) else 0, int(row.priority),
+                                   bool(row.complete), *text(row.title), *text(row.description_preview),
+                                   *text(row.category)))
+    view_data = json.dumps(view).encode("utf-8")
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, user_id, version, len(records) if total is None else total, offset,
+                         len(records), len(view_data))
+    data = header + view_data
+    data += b"\0" * (_align(len(data)) - len(data))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    # Created with owner-only permissions, the rows hold the user's task text
+    descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+            file.write(b"".join(records))
+            file.write(heap)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return len(records)
+
+
+def snapshot_path(user_id, database_url=None, directory=None):
+    """Return the snapshot file of a user of a database. Each database gets its own files, so the change counter
+    of a snapshot always refers to the database it was read from. Input: user_id, database URL (optional,
+    config.DATABASE_URL), directory (optional, config.SNAPSHOT_DIR)."""
+    url = database_url or config.DATABASE_URL
+    # A relative SQLite path names another file in every working directory
+    if url.startswith("sqlite:///") and not url.startswith("sqlite:////"):
+        url = "sqlite:///" + os.path.abspath(url[len("sqlite:///"):])
+    database = hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(directory or config.SNAPSHOT_DIR, f"tasks-{database}-{user_id}.snapshot")
+
+
+def open_snapshot(path, user_id):
+    """Open a user's snapshot, None if it is missing, unreadable, of another format or of another user.
+    Input: path, user_id."""
+    try:
+        snapshot = Snapshot(path)
+    except (OSError, ValueError):
+        return None
+    if snapshot.user_id != user_id:
+        snapshot.close()
+        return None
+    return snapshot
+
+
+def delete_snapshot(path):
+    """Delete a snapshot file, if any. Input: path."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _align(size):
+    """Helper function. Round a byte offset up to 8, so the records start aligned. Input: offset."""
+    return (size + 7) & ~7
@@ -0,0 +1,64 @@
+"""Sorted list split into blocks of bounded size, for the sorted views of TaskStore.
+
+An insert or removal bisects the block maxima, O(log n), then shifts entries within one block of at most
+2 * LOAD values. A plain list would shift every entry after the position, O(n) per mutation.
+"""
+from bisect import bisect_left, insort
+from itertools import chain
+
+# Target block size, a block is split in two when it grows past twice this
+LOAD = 512
+
+
+class SortedList:
+    """Values kept in ascending order, with O(log n) add and remove."""
+    def __init__(self, values=()):
+        """Init for SortedList class. Input: values (optional), in any order."""
+        values = sorted(values)
+        self._blocks = [values[start:start + LOAD] for start in range(0, len(values), LOAD)]
+        # Last value of every block, bisected to find the block of a value
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(values)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._blocks)
+
+    def __reversed__(self):
+        return chain.from_iterable(reversed(block) for block in reversed(self._blocks))
+
+    def add(self, value):
+        """Insert a value at its sorted position. Input: value."""
+        if not self._blocks:
+            self._blocks.append([value])
+            self._maxes.append(value)
+            self._len = 1
+            return
+        index = min(bisect_left(self._maxes, value), len(self._maxes) - 1)
+        block = self._blocks[index]
+        insort(block, value)
+        self._maxes[index] = block[-1]
+        if len(block) > 2 * LOAD:
+            # Only the short list of blocks shifts here, once every LOAD inserts into a block at most
+            self._blocks[index:index + 1] = [block[:LOAD], block[LOAD:]]
+            self._maxes[index:index + 1] = [block[LOAD - 1], block[-1]]
+        self._len += 1
+
+    def remove(self, value):
+        """Remove one occurrence of a value. Input: value. Raises ValueError if it is missing."""
+        index = bisect_left(self._maxes, value)
+        if index < len(self._maxes):
+            block = self._blocks[index]
+            position = bisect_left(block, value)
+            if block[position] == value:
+                del block[position]
+                if block:
+                    self._maxes[index] = block[-1]
+                else:
+                    del self._blocks[index]
+                    del self._maxes[index]
+                self._len -= 1
+                return
+        raise ValueError(f"{value!r} is not in the list")
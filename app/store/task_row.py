@@ -0,0 +1,37 @@
+# Descriptions longer than this are shown cut to PREVIEW_CUT characters and '...'
+PREVIEW_LENGTH = 45
+PREVIEW_CUT = 42
+
+
+def description_preview(description):
+    """Bounded description shown by the list view, same text as the description_preview column.
+    Input: description (None allowed)."""
+    description = description or ""
+    return (description[:PREVIEW_CUT] + '...') if len(description) > PREVIEW_LENGTH else description
+
+
+class TaskRow:
+    """Plain task of the list view: the displayed columns only, without ORM state or a session.
+    Fields can be set, so queued edits are applied to loaded rows like to Task objects.
+    Only the description preview is loaded, the full text is read by the task form."""
+    __slots__ = ('task_id', 'title', 'due_date', 'description_preview', 'priority', 'category', 'complete')
+
+    def __init__(self, task_id, title, due_date, description_preview, priority, category, complete):
+        """Init for TaskRow class. Input: column values, in __slots__ order."""
+        self.task_id = task_id
+        self.title = title
+        self.due_date = due_date
+        self.description_preview = description_preview
+        self.priority = priority
+        self.category = category
+        self.complete = complete
+
+    def _set_description(self, description):
+        """Setting the full description, e.g. from a queued edit, updates the preview. Input: description."""
+        self.description_preview = description_preview(description)
+
+    # Write-only: the full text is not kept by list rows
+    description = property(None, _set_description)
+
+    def __repr__(self):
+        return f"TaskRow({', '.join(repr(getattr(self, name)) for name in self.__slots__)})"
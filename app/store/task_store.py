@@ -0,0 +1,164 @@
+from collections import Counter
+
+from app.store.sorted_list import SortedList
+from app.store.task_row import description_preview
+
+
+def description_key(task):
+    """Description sort key, the truncated text shown by the list view, shared by every in-memory sort. Rows and
+    tasks carry it, other task objects get it computed from their description. Input: task."""
+    preview = getattr(task, "description_preview", None)
+    return preview if preview is not None else description_preview(task.description)
+
+
+# Column heading -> sort key of a task, same ordering as the list view keymap
+SORT_KEYS = {
+    '✓/x': lambda t: t.complete,
+    'Title': lambda t: t.title,
+    'Due Date': lambda t: t.due_date,
+    'Description': description_key,
+    'Priority': lambda t: t.priority,
+    'Category': lambda t: t.category,
+}
+
+
+class TaskStore:
+    """In-memory task collection indexed by task_id, with category buckets, report counters
+    and sorted views that are kept up to date on every add, update and remove."""
+    def __init__(self, tasks=()):
+        """Init for TaskStore class. Input: tasks (optional), kept in the given order."""
+        # task_id -> task, in load order
+        self._by_id = {}
+        # category -> {task_id: task}, and the sorted list of non-empty categories
+        self._buckets = {}
+        self._categories = SortedList()
+        # Report counters: open tasks per category and completed tasks
+        self._open_counts = Counter()
+        self._complete_count = 0
+        # Indexed values of each task, so an update can find the entries of the old values
+        self._indexed = {}
+        # column -> SortedList of (key, task_id), built on first use
+        self._views = {}
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, task_id):
+        return task_id in self._by_id
+
+    def get(self, task_id):
+        """Return the task with the given id, None if missing. Input: task_id."""
+        return self._by_id.get(task_id)
+
+    def add(self, task):
+        """Add a task, or re-index it if its id is already stored. Input: task."""
+        if task.task_id in self._by_id:
+            self._unindex(task.task_id)
+        self._by_id[task.task_id] = task
+        self._index(task)
+
+    def update(self, task):
+        """Re-index a stored task after its attributes changed. Input: task."""
+        self._unindex(task.task_id)
+        self._by_id[task.task_id] = task
+        self._index(task)
+
+    def remove(self, task_id):
+        """Remove and return the task with the given id, None if missing. Input: task_id."""
+        if task_id not in self._by_id:
+            return None
+        self._unindex(task_id)
+        return self._by_id.pop(task_id)
+
+    def apply_changes(self, changed, deleted, keep=None):
+        """Apply a delta from changes_since(). Input: changed tasks, deleted task ids,
+        keep(task) -> bool deciding if a changed task belongs in this store (optional)."""
+        for task_id in deleted:
+            self.remove(task_id)
+        for task in changed:
+            if keep is None or keep(task):
+                self.add(task)
+            else:
+                self.remove(task.task_id)
+
+    def categories(self):
+        """Return the sorted list of unique categories."""
+        return list(self._categories)
+
+    def category_count(self, category):
+        """Return the number of tasks in a category. Input: category."""
+        return len(self._buckets.get(category, ()))
+
+    def in_category(self, category):
+        """Return the tasks of a category, 'All' returns every task. Input: category."""
+        if category == "All":
+            return list(self)
+        return list(self._buckets.get(category, {}).values())
+
+    def report_counts(self):
+        """Return a dict of category→count, grouping completed under 'Complete'."""
+        counts = {category: count for category, count in self._open_counts.items() if count}
+        if self._complete_count:
+            counts["Complete"] = self._complete_count
+        return counts
+
+    def sorted_tasks(self, column, reverse=False, category="All"):
+        """Return tasks ordered by a column, ties broken by task_id. Input: column, reverse, category filter."""
+        view = self._view(column)
+        entries = reversed(view) if reverse else view
+        tasks = (self._by_id[task_id] for _, task_id in entries)
+        if category == "All":
+            return list(tasks)
+        return [t for t in tasks if t.category == category]
+
+    def _view(self, column):
+        """Helper function. Sorted (key, task_id) view of a column, built once then maintained. Input: column."""
+        if column not in self._views:
+            key = SORT_KEYS[column]
+            entries = []
+            for task_id, task in self._by_id.items():
+                value = key(task)
+                # Remember the key, so later updates remove the right entry
+                self._indexed[task_id][2][column] = value
+                entries.append((value, task_id))
+            self._views[column] = SortedList(entries)
+        return self._views[column]
+
+    def _index(self, task):
+        """Helper function. Add a task to the category buckets, counters and sorted views, O(log n) per view.
+        Input: task."""
+        category = task.category
+        bucket = self._buckets.setdefault(category, {})
+        if not bucket:
+            self._categories.add(category)
+        bucket[task.task_id] = task
+        if task.complete:
+            self._complete_count += 1
+        else:
+            self._open_counts[category] += 1
+        keys = {column: SORT_KEYS[column](task) for column in self._views}
+        for column, key in keys.items():
+            self._views[column].add((key, task.task_id))
+        self._indexed[task.task_id] = (category, bool(task.complete), keys)
+
+    def _unindex(self, task_id):
+        """Helper function. Remove the entries of a task's last indexed values. Input: task_id."""
+        category, complete, keys = self._indexed.pop(task_id)
+        bucket = self._buckets[category]
+        del bucket[task_id]
+        if not bucket:
+            del self._buckets[category]
+            self._categories.remove(category)
+        if complete:
+            self._complete_count -= 1
+        else:
+            self._open_counts[category] -= 1
+            if not self._open_counts[category]:
+                del self._open_counts[category]
+        for column, key in keys.items():
+            self._views[column].remove((key, task_id))
@@ -2,18 +2,36 @@
 from datetime import datetime
 
 from app.models.task import Task
+from app.database.queries import query_tasks
+from app.store.task_store import TaskStore, description_key
+from app.store.columnar import TaskColumns
 
 
-def load_tasks(db):
-    """Load all Task objects from the database."""
-    return db.query(Task).all()
+def load_tasks(db, user_id=None, category="All", sorted_column=None, sort_reverse=False, limit=None, offset=0):
+    """Load Task objects from the database. With a user_id, filter, sort and paginate in SQL."""
+    if user_id is None:
+        return db.query(Task).all()
+    return query_tasks(db, user_id, category=category, sorted_column=sorted_column,
+                       sort_reverse=sort_reverse, limit=limit, offset=offset)
+
+def find_task(tasks, task_id):
+    """Return the Task with given id. O(1) for a TaskStore, linear scan for a list."""
+    if isinstance(tasks, TaskStore):
+        return tasks.get(task_id)
+    return next((t for t in tasks if t.task_id == task_id), None)
 
 def get_categories(tasks):
     """Return sorted list of unique categories from tasks."""
+    if isinstance(tasks, (TaskStore, TaskColumns)):
+        return tasks.categories()
     return sorted({t.category for t in tasks})
 
 def filter_tasks(tasks, filter_value):
     """Filter tasks by category. 'All' returns all tasks."""
+    if isinstance(tasks, TaskStore):
+        return tasks.in_category(filter_value)
+    if isinstance(tasks, TaskColumns):
+        return tasks.filter_tasks(filter_value)
     if filter_value == "All":
         return list(tasks)
     return [t for t in tasks if t.category == filter_value]
@@ -28,13 +46,15 @@ def sort_tasks_logic(tasks, sorted_column, sort_reverse):
     """Sort tasks according to column and order."""
     if not sorted_column:
         return list(tasks)
+    if isinstance(tasks, (TaskStore, TaskColumns)):
+        return tasks.sorted_tasks(sorted_column, sort_reverse)
     keymap = {
         '✓/x':      lambda t: t.complete,
         'Title':    lambda t: t.title,
         'Due Date': lambda t: datetime.strptime(t.due_date, "%Y-%m-%d")
                                  if isinstance(t.due_date, str) else t.due_date,
-        'Description': lambda t: (t.description[:42] + '...')
-                                if len(t.description) > 45 else t.description,
+        # The preview loaded with the task, reading the deferred description would cost a query per task
+        'Description': description_key,
         'Priority': lambda t: t.priority,
         'Category': lambda t: t.category
     }
@@ -42,24 +62,31 @@ def sort_tasks_logic(tasks, sorted_column, sort_reverse):
 
 def toggle_complete_logic(task_id, tasks, db):
     """Toggle the complete flag on the Task with given id."""
-    task = next((t for t in tasks if t.task_id == task_id), None)
+    task = find_task(tasks, task_id)
     if task:
         task.complete = not task.complete
         db.commit()
+        if isinstance(tasks, TaskStore):
+            tasks.update(task)
     return task
 
 def delete_task_logic(task_id, tasks, db):
-    """Delete the given Task from DB and return the new list."""
-    task = next((t for t in tasks if t.task_id == task_id), None)
+    """Delete the given Task from DB and return the new list. A TaskStore is updated in place and returned."""
+    task = find_task(tasks, task_id)
     if task:
         db.delete(task)
         db.commit()
+        if isinstance(tasks, TaskStore):
+            tasks.remove(task_id)
+            return tasks, task
         remaining = [t for t in tasks if t.task_id != task_id]
         return remaining, task
     return tasks, None
 
 def report_counts_logic(tasks):
     """Return a dict of category→count, grouping completed under 'Complete'."""
+    if isinstance(tasks, (TaskStore, TaskColumns)):
+        return tasks.report_counts()
     counts = {}
     for t in tasks:
         key = "Complete" if t.complete else t.category
@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.task import Task
+from app.models.user import User
+from app.models.archive import ArchivedTask, TaskCompletion
+from app.database import archive as A
+from app.database import queries as Q
+from app.database import transfer as T
+from app.database.bulk import bulk_update_tasks, bulk_delete_tasks
+from app.database.db import init_db
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        # File database with the migrations, so the completion and sync triggers are installed
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine("sqlite:///" + os.path.join(self.tmp.name, "test.db"))
+        init_db(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add(User(user_id=1, username="a", password_hash="h"))
+        self.db.add_all(Task(user_id=1, title=f"T{i}", description="", due_date=date(2025, 1, 1 + i),
+                             priority=1 + i % 5, category="Work" if i % 2 else "Home", complete=i < 6)
+                        for i in range(10))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def age(self, task_ids, completed_at="2020-01-01 00:00:00"):
+        """Pretend tasks were completed long ago."""
+        self.db.execute(text("UPDATE task_completions SET completed_at = :at WHERE task_id IN (%s)"
+                             % ",".join(map(str, task_ids))), {"at": completed_at})
+        self.db.commit()
+
+    def test_completion_times(self):
+        self.assertEqual(sorted(c.task_id for c in self.db.query(TaskCompletion)), [1, 2, 3, 4, 5, 6])
+        version = Q.current_version(self.db)
+        self.db.get(Task, 7).complete = True
+        self.db.get(Task, 1).complete = False
+        self.db.get(Task, 2).title = "Renamed"
+        self.db.commit()
+        # Stamping the time does not touch the task row, every update is one change
+        self.assertEqual(Q.current_version(self.db), version + 3)
+        self.assertEqual(sorted(c.task_id for c in self.db.query(TaskCompletion)), [2, 3, 4, 5, 6, 7])
+        self.db.delete(self.db.get(Task, 2))
+        self.db.commit()
+        self.assertIsNone(self.db.get(TaskCompletion, 2))
+
+    def test_archive_in_batches(self):
+        version = Q.current_version(self.db)
+        self.age([1, 2, 3, 4, 5])
+        self.assertEqual(A.archive_batch(self.db, 30, 2), 2)
+        self.db.commit()
+        self.assertEqual(A.archive_completed(self.db, 30, 2), 3)
+        self.assertEqual(A.archive_completed(self.db, 30, 2), 0)
+        # Task 6 was completed now, open tasks have no completion time
+        self.assertEqual([t.task_id for t in Q.query_tasks(self.db, 1)], [6, 7, 8, 9, 10])
+        archived = self.db.query(ArchivedTask).order_by(ArchivedTask.task_id).all()
+        self.assertEqual([(t.task_id, t.title) for t in archived], [(i, f"T{i - 1}") for i in range(1, 6)])
+        self.assertTrue(all(t.completed_at.year == 2020 and t.archived_at for t in archived))
+        # Open views drop the archived tasks through their tombstones
+        self.assertEqual(sorted(Q.changes_since(self.db, 1, version)[2]), [1, 2, 3, 4, 5])
+        self.assertEqual(Q.count_tasks(self.db, 1), 5)
+        self.assertEqual(Q.count_tasks(self.db, 1, archived=True), 10)
+
+    def test_archived_mode_queries(self):
+        self.age([1, 2, 3, 4])
+        A.archive_completed(self.db, 30)
+        everything = Q.query_tasks(self.db, 1, sorted_column="Priority", sort_reverse=True, rows=True, archived=True)
+        live = Q.query_tasks(self.db, 1, sorted_column="Priority", sort_reverse=True, rows=True)
+        self.assertEqual(len(everything), 10)
+        self.assertEqual([t.task_id for t in everything if t.task_id > 4], [t.task_id for t in live])
+        # Keyset pages over live and archived tasks together
+        pages, after = [], None
+        while True:
+            page = Q.query_tasks(self.db, 1, sorted_column="Description", limit=3, after=after, archived=True)
+            if not page:
+                break
+            pages.extend(page)
+            after = Q.keyset_position(page[-1], "Description")
+        self.assertEqual([t.task_id for t in pages],
+                         [t.task_id for t in Q.query_tasks(self.db, 1, sorted_column="Description", archived=True)])
+        self.assertEqual(Q.report_counts(self.db, 1, archived=True), {"Complete": 6, "Home": 2, "Work": 2})
+        self.assertEqual(Q.report_counts(self.db, 1), {"Complete": 2, "Home": 2, "Work": 2})
+        self.assertIsNone(Q.task_row(self.db, 1))
+        self.assertEqual(Q.task_row(self.db, 1, archived=True).title, "T0")
+
+    def test_edit_restores(self):
+        self.age([1, 2])
+        A.archive_completed(self.db, 30)
+        # Edits of archived tasks move them back, with their completion time
+        self.assertEqual(bulk_update_tasks(self.db, None, [1, 2], priority=5), 2)
+        self.assertEqual(bulk_update_tasks(self.db, 1, [2], complete=False), 1)
+        self.db.commit()
+        self.assertEqual(self.db.query(ArchivedTask).count(), 0)
+        self.assertEqual((self.db.get(Task, 1).priority, self.db.get(TaskCompletion, 1).completed_at.year), (5, 2020))
+        self.assertIsNone(self.db.get(TaskCompletion, 2))
+        self.assertEqual([t.task_id for t in Q.search_tasks(self.db, 1, "T0")], [1])
+        # Only the reopened task stays live
+        self.assertEqual(A.archive_completed(self.db, 30), 1)
+
+    def test_delete_archived(self):
+        self.age([1])
+        A.archive_completed(self.db, 30)
+        self.assertEqual(bulk_delete_tasks(self.db, 1, [1, 2]), 1)
+        self.assertEqual(bulk_delete_tasks(self.db, 1, [1, 3], archived=True), 2)
+        self.db.commit()
+        self.assertEqual(self.db.query(ArchivedTask).count(), 0)
+
+    def test_transfer_includes_archive(self):
+        self.age([1, 2])
+        A.archive_completed(self.db, 30)
+        exported = list(T.export_tasks(self.db, 1, batch_size=3))
+        self.assertEqual([row["task_id"] for row in exported], list(range(1, 11)))
+        # Re-importing the export skips live and archived tasks alike
+        self.assertEqual(T.import_tasks(self.db, 1, exported), (0, 10))
+        # Other tasks under taken ids, archived ones included, get new ids
+        rows = [dict(task_id=task_id, title="Dup", due_date="2025-01-01") for task_id in (1, 7, 11)]
+        self.assertEqual(T.import_tasks(self.db, 1, rows), (3, 0))
+        self.assertEqual(self.db.get(Task, 11).title, "Dup")
+        self.assertIsNone(self.db.get(Task, 1))
+        self.assertEqual([t.task_id for t in self.db.query(Task).filter(Task.title == "Dup")], [11, 12, 13])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.db import Base
+from app.models.session_token import SessionToken
+from app.models.user import User
+from app.utils import auth, remember
+
+class TestAuth(unittest.TestCase):
+    def setUp(self):
+        # In-memory SQLite
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def stored_hash(self, username):
+        self.db.expire_all()
+        return self.db.query(User).filter_by(username=username).one().password_hash
+
+    def test_create_and_authenticate(self):
+        self.assertTrue(auth.create_user(self.db, " alice ", "secret", rounds=4))
+        self.assertFalse(auth.create_user(self.db, "alice", "other", rounds=4))
+        self.assertEqual(auth.authenticate(self.db, "alice", "secret", rounds=4).username, "alice")
+        self.assertIsNone(auth.authenticate(self.db, "alice", "wrong", rounds=4))
+        self.assertIsNone(auth.authenticate(self.db, "bob", "secret", rounds=4))
+
+    def test_rehash_when_cost_changes(self):
+        auth.create_user(self.db, "alice", "secret", rounds=4)
+        old_hash = self.stored_hash("alice")
+        self.assertEqual(auth.hash_rounds(old_hash), 4)
+        # A failed login keeps the old hash
+        auth.authenticate(self.db, "alice", "wrong", rounds=5)
+        self.assertEqual(self.stored_hash("alice"), old_hash)
+        # A successful login with a new cost upgrades it, later logins keep it
+        self.assertIsNotNone(auth.authenticate(self.db, "alice", "secret", rounds=5))
+        new_hash = self.stored_hash("alice")
+        self.assertEqual(auth.hash_rounds(new_hash), 5)
+        auth.authenticate(self.db, "alice", "secret", rounds=5)
+        self.assertEqual(self.stored_hash("alice"), new_hash)
+        self.assertIsNotNone(auth.authenticate(self.db, "alice", "secret", rounds=5))
+
+    def test_check_then_store(self):
+        # The split used by the login form: bcrypt on a reader thread, the writes on the writer thread
+        auth.create_user(self.db, "alice", "secret", rounds=4)
+        old_hash = self.stored_hash("alice")
+        self.assertEqual(auth.check_password(self.db, "alice", "wrong", rounds=5), (None, None))
+        user, new_hash = auth.check_password(self.db, "alice", "secret", rounds=5)
+        self.assertEqual(self.stored_hash("alice"), old_hash)
+        auth.store_password_hash(self.db, user.user_id, new_hash)
+        self.assertEqual(auth.hash_rounds(self.stored_hash("alice")), 5)
+        self.assertIsNone(auth.check_password(self.db, "alice", "secret", rounds=5)[1])
+        self.assertTrue(auth.add_user(self.db, " bob ", auth.hash_password("pw", 4)))
+        self.assertFalse(auth.add_user(self.db, "bob", auth.hash_password("pw", 4)))
+        self.assertEqual(auth.authenticate(self.db, "bob", "pw", rounds=4).username, "bob")
+
+    def test_work_factor(self):
+        self.assertEqual(auth.work_factor(2), 4)
+        self.assertEqual(auth.work_factor(40), 31)
+        self.assertEqual(auth.hash_rounds(auth.hash_password("x", 6)), 6)
+        self.assertIsNone(auth.hash_rounds("not a hash"))
+
+    def test_remember_token(self):
+        auth.create_user(self.db, "alice", "secret", rounds=4)
+        user = auth.authenticate(self.db, "alice", "secret", rounds=4)
+        token = auth.issue_token(self.db, user.user_id)
+        self.assertEqual(auth.authenticate_token(self.db, token).username, "alice")
+        # Only a hash of the secret is stored
+        selector, _, verifier = token.partition(".")
+        self.assertNotIn(verifier, self.db.get(SessionToken, selector).verifier_hash)
+        self.assertIsNone(auth.authenticate_token(self.db, selector + ".forged"))
+        self.assertIsNone(auth.authenticate_token(self.db, "unknown.token"))
+        self.assertIsNone(auth.authenticate_token(self.db, ""))
+        auth.revoke_token(self.db, token)
+        self.assertIsNone(auth.authenticate_token(self.db, token))
+
+    def test_expired_and_revoked_tokens(self):
+        auth.create_user(self.db, "alice", "secret", rounds=4)
+        user_id = auth.authenticate(self.db, "alice", "secret", rounds=4).user_id
+        expired = auth.issue_token(self.db, user_id, days=-1)
+        self.assertIsNone(auth.authenticate_token(self.db, expired))
+        # Expired tokens are deleted when used
+        self.assertEqual(self.db.query(SessionToken).count(), 0)
+        tokens = [auth.issue_token(self.db, user_id) for _ in range(3)]
+        auth.revoke_user_tokens(self.db, user_id)
+        self.assertTrue(all(auth.authenticate_token(self.db, token) is None for token in tokens))
+
+    def test_remember_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session")
+            self.assertIsNone(remember.load_token(path))
+            remember.save_token("selector.secret", path)
+            self.assertEqual(remember.load_token(path), "selector.secret")
+            if os.name == "posix":
+                self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+            remember.clear_token(path)
+            remember.clear_token(path)
+            self.assertIsNone(remember.load_token(path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import date
+
+from app.benchmarks import synthetic as S
+from app.benchmarks import task_logic as B
+from app.benchmarks import concurrent_load as C
+from app.benchmarks import row_memory as R
+from app.benchmarks import primary_key as P
+from app.benchmarks import warm_start as W
+from app.database.db import make_engine
+
+class TestBenchmarks(unittest.TestCase):
+    def test_generator_is_deterministic(self):
+        first = list(S.generate_tasks(300, seed=4))
+        self.assertEqual(first, list(S.generate_tasks(300, seed=4)))
+        self.assertNotEqual(first, list(S.generate_tasks(300, seed=5)))
+        # A longer run starts with the same tasks
+        self.assertEqual(first[:100], list(S.generate_tasks(100, seed=4)))
+
+    def test_generator_options(self):
+        tasks = list(S.generate_tasks(500, users=3, categories=2, description_words=(2, 4), due_days=10,
+                                      start=date(2025, 3, 1)))
+        self.assertEqual({t["user_id"] for t in tasks}, {1, 2, 3})
+        self.assertEqual(len({t["category"] for t in tasks}), 2)
+        self.assertTrue(all(2 <= len(t["description"].split()) <= 4 for t in tasks))
+        self.assertTrue(all(date(2025, 3, 1) <= t["due_date"] < date(2025, 3, 11) for t in tasks))
+        self.assertEqual(len({t["task_id"] for t in tasks}), 500)
+
+    def test_compare_flags_regressions(self):
+        baseline = [dict(name="sort", size=10, best_ms=1.0), dict(name="load", size=10, best_ms=2.0)]
+        results = [dict(name="sort", size=10, best_ms=1.5), dict(name="load", size=10, best_ms=2.1),
+                   dict(name="load", size=100, best_ms=20.0)]
+        rows = B.compare(baseline, results, threshold=1.25)
+        self.assertEqual([(name, regressed) for name, _, _, _, _, regressed in rows], [("sort", True), ("load", False)])
+
+    def test_run_size(self):
+        results = B.run_size(100, 1, users=2)
+        self.assertIn("delete_task_logic store", {row["name"] for row in results})
+        self.assertTrue(all(row["size"] == 100 and row["best_ms"] >= 0 and row["peak_kib"] >= 0 for row in results))
+
+    def test_row_memory(self):
+        orm, rows = R.run_size(200, 1)
+        self.assertEqual((orm["kind"], rows["kind"], orm["size"], rows["size"]), ("orm", "rows", 200, 200))
+        self.assertLess(rows["bytes_per_task"], orm["bytes_per_task"])
+
+    def test_primary_key_variants(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            rows = [P.run_variant(os.path.join(tmp, f"{i}.db"), key, 300, 100) for i, key in enumerate(P.KEYS)]
+        self.assertTrue(all(row["tasks"] == 300 and row["mib"] > 0 for row in rows))
+
+    def test_warm_start(self):
+        small, large = W.run_size(100, 1), W.run_size(W.VIRTUAL_THRESHOLD + 1, 1)
+        self.assertEqual((small["rows"], large["rows"]), (100, W.VISIBLE + W.OVERSCAN))
+        self.assertTrue(all(row["snapshot_ms"] > 0 and row["bytes"] > 0 for row in (small, large)))
+
+    def test_load_helpers(self):
+        self.assertEqual(C.parse_mix("list=3, save"), {"list": 3.0, "save": 1.0})
+        with self.assertRaises(ValueError):
+            C.parse_mix("list=1,drop=2")
+        ordered = list(range(1, 101))
+        self.assertEqual([C.percentile(ordered, f) for f in (0.5, 0.95, 0.99)], [50, 95, 99])
+        self.assertEqual(C.percentile([], 0.5), 0.0)
+        rows = C.summarize({"list": [(1.0, "ok"), (3.0, "locked")], "save": [(2.0, "error")]}, 2.0)
+        self.assertEqual([row["operation"] for row in rows], ["list", "save", "total"])
+        self.assertEqual((rows[-1]["count"], rows[-1]["locked"], rows[-1]["errors"]), (3, 1, 1))
+        self.assertEqual(rows[-1]["per_second"], 1.5)
+
+    def test_simulated_user(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            url = "sqlite:///" + os.path.join(tmp, "load.db")
+            ids = C.prepare(url, 1, 50, pragmas=None)
+            engine = make_engine(url)
+            mix = dict(list=5, save=2, toggle=2, delete=1)
+            samples = C.simulate_user(engine, 0, ids[0], mix, time.time() + 0.3, seed=1)
+            engine.dispose()
+        self.assertTrue(samples["list"])
+        self.assertTrue(all(outcome == "ok" for values in samples.values() for _, outcome in values))
+
+if __name__ == "__main__":
+    unittest.main()
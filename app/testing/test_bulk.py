@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.task import Task
+from app.models.user import User
+from app.models.sync import TaskTombstone
+from app.database import bulk as B
+from app.database.db import init_db
+from app.database.queries import changes_since
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        # File database with the migrations, so the sync triggers are installed
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine("sqlite:///" + os.path.join(self.tmp.name, "test.db"))
+        init_db(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add_all([User(user_id=1, username="a", password_hash="h"),
+                         User(user_id=2, username="b", password_hash="h")])
+        self.db.add_all(Task(task_id=i, user_id=1 if i < 1200 else 2, title=f"T{i}", description="",
+                             due_date=date(2025, 1, 1), priority=3, category="Work", complete=False)
+                        for i in range(1210))
+        self.db.commit()
+
+        # Count UPDATE/DELETE statements sent to the database
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self.record_statement)
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def record_statement(self, connection, cursor, statement, parameters, context, executemany):
+        if statement.startswith(("UPDATE", "DELETE")):
+            self.statements.append(statement)
+
+    def test_update_one_statement_per_chunk(self):
+        ids = list(range(1200))
+        self.assertEqual(B.bulk_update_tasks(self.db, 1, ids, complete=True, category="Done"), 1200)
+        self.db.commit()
+        # 1200 ids in chunks of 500
+        self.assertEqual(len(self.statements), 3)
+        self.assertEqual(self.db.query(Task).filter(Task.complete, Task.category == "Done").count(), 1200)
+
+    def test_update_is_scoped_to_owner(self):
+        self.assertEqual(B.bulk_update_tasks(self.db, 1, [1, 1205], priority=1), 1)
+        self.db.commit()
+        self.assertEqual(self.db.get(Task, 1205).priority, 3)
+        # Without an owner every listed task is updated
+        self.assertEqual(B.bulk_update_tasks(self.db, None, [1, 1205], priority=2), 2)
+
+    def test_delete_leaves_tombstones(self):
+        version = changes_since(self.db, 1, 0)[0]
+        ids = list(range(0, 1200, 2)) + [1201]
+        self.assertEqual(B.bulk_delete_tasks(self.db, 1, ids), 600)
+        self.db.commit()
+        self.assertEqual(len(self.statements), 2)
+        self.assertEqual(self.db.query(Task).filter(Task.user_id == 1).count(), 600)
+        self.assertIsNotNone(self.db.get(Task, 1201))
+        # Row triggers still fire for set-based statements, so delta sync sees every row
+        self.assertEqual(self.db.query(TaskTombstone).count(), 600)
+        _, changed, deleted = changes_since(self.db, 1, version)
+        self.assertEqual(changed, [])
+        self.assertEqual(sorted(deleted), sorted(ids[:-1]))
+
+    def test_empty_selection(self):
+        self.assertEqual(B.bulk_update_tasks(self.db, 1, [], complete=True), 0)
+        self.assertEqual(B.bulk_delete_tasks(self.db, 1, []), 0)
+        self.assertEqual(self.statements, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import unittest
+from datetime import date
+from types import SimpleNamespace
+
+from app.store.columnar import TaskColumns
+import app.testing.task_logic as L
+
+def make_task(i, rng):
+    # Few distinct values per column, so the tie order is checked too
+    return SimpleNamespace(
+        task_id=str(i),
+        title=rng.choice(["Alpha", "beta", "Gamma", "Ärger"]),
+        description=rng.choice(["", "short", "x" * 50, "x" * 42 + "yyyy", "x" * 42 + "zzz"]),
+        due_date=date(2025, 1, rng.randint(1, 5)),
+        priority=rng.randint(1, 3),
+        category=rng.choice(["Work", "Home", "School"]),
+        complete=rng.random() < 0.5,
+    )
+
+class TestTaskColumns(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.tasks = [make_task(i, rng) for i in range(300)]
+        self.columns = TaskColumns(self.tasks)
+
+    def test_sort_matches_keymap(self):
+        for column in ('✓/x', 'Title', 'Due Date', 'Description', 'Priority', 'Category'):
+            for reverse in (False, True):
+                self.assertEqual(L.sort_tasks_logic(self.columns, column, reverse),
+                                 L.sort_tasks_logic(self.tasks, column, reverse), (column, reverse))
+
+    def test_string_due_dates(self):
+        for task in self.tasks:
+            task.due_date = task.due_date.isoformat()
+        columns = TaskColumns(self.tasks)
+        self.assertEqual(L.sort_tasks_logic(columns, "Due Date", True), L.sort_tasks_logic(self.tasks, "Due Date", True))
+
+    def test_multi_column_sort(self):
+        sort = [("Category", False), ("Priority", True), ("Due Date", False)]
+        # Stable sorts from the least to the most significant column give the expected order
+        expected = list(self.tasks)
+        for column, reverse in reversed(sort):
+            expected = L.sort_tasks_logic(expected, column, reverse)
+        self.assertEqual(self.columns.select(sort=sort), expected)
+
+    def test_filters(self):
+        self.assertEqual(L.filter_tasks(self.columns, "Home"), L.filter_tasks(self.tasks, "Home"))
+        self.assertEqual(L.filter_tasks(self.columns, "All"), self.tasks)
+        self.assertEqual(L.filter_tasks(self.columns, "Missing"), [])
+        self.assertEqual(self.columns.select("Work", complete=True, sort=[("Title", False)]),
+                         L.sort_tasks_logic([t for t in self.tasks if t.category == "Work" and t.complete],
+                                            "Title", False))
+        self.assertEqual(L.get_categories(self.columns), ["Home", "School", "Work"])
+
+    def test_report_counts(self):
+        self.assertEqual(L.report_counts_logic(self.columns), L.report_counts_logic(self.tasks))
+
+    def test_empty(self):
+        columns = TaskColumns()
+        self.assertEqual(columns.select("Work", sort=[("Title", True)]), [])
+        self.assertEqual(columns.report_counts(), {})
+        self.assertEqual(columns.categories(), [])
+
+if __name__ == "__main__":
+    unittest.main()
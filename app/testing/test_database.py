@@ -0,0 +1,150 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.task import Task
+from app.database import db as D
+from app.database import queries as Q
+
+# Tasks table as created before any migration existed
+LEGACY_SCHEMA = [
+    "CREATE TABLE users (user_id INTEGER NOT NULL, username VARCHAR NOT NULL, password_hash VARCHAR NOT NULL, "
+    "PRIMARY KEY (user_id), UNIQUE (username))",
+    "CREATE TABLE tasks (task_id VARCHAR NOT NULL, title VARCHAR NOT NULL, user_id INTEGER, description VARCHAR, "
+    "due_date DATE NOT NULL, priority INTEGER NOT NULL, category VARCHAR NOT NULL, complete BOOLEAN NOT NULL, "
+    "PRIMARY KEY (task_id), FOREIGN KEY(user_id) REFERENCES users (user_id))",
+]
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        # File database, so separate connections see the same schema
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine("sqlite:///" + os.path.join(self.tmp.name, "test.db"))
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def index_names(self):
+        with self.engine.connect() as connection:
+            rows = connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'").all()
+        return {name for (name,) in rows}
+
+    def query_plan(self, query):
+        """Return the EXPLAIN QUERY PLAN text of an ORM query."""
+        compiled = query.statement.compile(dialect=self.engine.dialect)
+        params = compiled.construct_params()
+        with self.engine.connect() as connection:
+            rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled),
+                                              tuple(params[name] for name in compiled.positiontup)).all()
+        return " | ".join(row[-1] for row in rows)
+
+    def test_fresh_database_is_current(self):
+        D.init_db(self.engine)
+        with self.engine.connect() as connection:
+            self.assertEqual(D.get_schema_version(connection), D.SCHEMA_VERSION)
+        self.assertTrue({"ix_tasks_user_complete_due", "ix_tasks_user_category"} <= self.index_names())
+        self.assertEqual(D.run_migrations(self.engine), [])
+
+    def test_legacy_database_is_migrated(self):
+        with self.engine.begin() as connection:
+            for statement in LEGACY_SCHEMA:
+                connection.exec_driver_sql(statement)
+        self.assertFalse(any(name.startswith("ix_tasks") for name in self.index_names()))
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("INSERT INTO tasks VALUES ('f3c1-uuid', 'Old', 1, '', '2025-01-01', 1, 'Work', 0)")
+            connection.exec_driver_sql("INSERT INTO tasks VALUES ('0a9e-uuid', 'Older', 1, '', '2025-01-02', 2, 'Home', 1)")
+        D.init_db(self.engine)
+        self.assertTrue({index.name for index in Task.__table__.indexes} <= self.index_names())
+        with self.engine.connect() as connection:
+            self.assertEqual(D.get_schema_version(connection), D.SCHEMA_VERSION)
+            self.assertEqual(D._column_type(connection, "tasks", "task_id"), "INTEGER")
+        # Existing rows survive, numbered in insertion order, and are tracked by the change counter from now on
+        db = sessionmaker(bind=self.engine)()
+        self.assertEqual([(t.task_id, t.title) for t in db.query(Task).order_by(Task.task_id)], [(1, "Old"), (2, "Older")])
+        db.get(Task, 1).title = "Renamed"
+        db.commit()
+        self.assertEqual(Q.changes_since(db, 1, 0)[1][0].title, "Renamed")
+        # The search index is built from the existing rows and follows later changes
+        self.assertEqual([t.task_id for t in Q.search_tasks(db, 1, "renam")], [1])
+        db.add(Task(user_id=1, title="New", description="", due_date=date(2025, 1, 3), priority=1, category="Work",
+                    complete=False))
+        db.commit()
+        self.assertEqual([t.task_id for t in Q.search_tasks(db, 1, "new")], [3])
+        # The preview column is computed for old and new rows alike
+        db.get(Task, 2).description = "x" * 100
+        db.commit()
+        self.assertEqual([row.description_preview for row in Q.query_tasks(db, 1, rows=True)], ["", "x" * 42 + "...", ""])
+        db.close()
+
+    def test_engine_pragmas(self):
+        engine = D.make_engine("sqlite:///" + os.path.join(self.tmp.name, "tuned.db"),
+                               pragmas={"journal_mode": "wal", "synchronous": "NORMAL", "cache_size": -2048})
+        with engine.connect() as connection:
+            self.assertEqual(connection.exec_driver_sql("PRAGMA journal_mode").scalar(), "wal")
+            self.assertEqual(connection.exec_driver_sql("PRAGMA synchronous").scalar(), 1)
+            self.assertEqual(connection.exec_driver_sql("PRAGMA cache_size").scalar(), -2048)
+        engine.dispose()
+        with self.assertRaises(ValueError):
+            D.apply_sqlite_pragmas(None, {"synchronous": "SOMETIMES"})
+
+    def test_changes_since(self):
+        D.init_db(self.engine)
+        db = sessionmaker(bind=self.engine)()
+        new_task = lambda user_id: Task(user_id=user_id, title="T", description="", due_date=date(2025, 1, 1),
+                                        priority=1, category="Work", complete=False)
+        db.add_all([new_task(1), new_task(1), new_task(2)])
+        db.commit()
+        version, changed, deleted = Q.changes_since(db, 1, 0)
+        self.assertEqual(version, 3)
+        self.assertEqual(sorted(t.task_id for t in changed), [1, 2])
+        self.assertEqual(deleted, [])
+        # Nothing new since the returned version
+        self.assertEqual(Q.changes_since(db, 1, version), (version, [], []))
+
+        # An update and a delete are both picked up, only for their owner
+        db.get(Task, 1).complete = True
+        db.delete(db.get(Task, 3))
+        db.delete(db.get(Task, 2))
+        db.commit()
+        latest, changed, deleted = Q.changes_since(db, 1, version)
+        self.assertEqual(latest, version + 3)
+        self.assertEqual([t.task_id for t in changed], [1])
+        self.assertEqual(deleted, [2])
+        self.assertEqual(Q.changes_since(db, 2, version), (latest, [], [3]))
+        # Ids of deleted tasks are never handed out again, so their tombstones stay valid
+        db.add(new_task(1))
+        db.commit()
+        self.assertEqual(Q.changes_since(db, 1, latest)[1][0].task_id, 4)
+        db.close()
+
+    def test_list_queries_use_indexes(self):
+        D.init_db(self.engine)
+        db = sessionmaker(bind=self.engine)()
+        db.add_all(Task(task_id=i + 1, user_id=i % 10, title="T", description="", due_date=date(2025, 1, 1 + i % 28),
+                        priority=1 + i % 5, category=f"C{i % 7}", complete=bool(i % 2)) for i in range(200))
+        db.commit()
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+
+        plan = self.query_plan(Q.task_query(db, 1, sorted_column="Due Date"))
+        self.assertIn("ix_tasks_user_due", plan)
+        self.assertNotIn("USE TEMP B-TREE", plan)
+        plan = self.query_plan(Q.task_query(db, 1, complete=False, sorted_column="Due Date"))
+        self.assertIn("ix_tasks_user_complete_due", plan)
+        plan = self.query_plan(Q.task_query(db, 1, category="C3"))
+        self.assertIn("ix_tasks_user_category", plan)
+        self.assertNotIn("USE TEMP B-TREE", plan)
+        plan = self.query_plan(Q.task_query(db, 1, sorted_column="Priority", sort_reverse=True))
+        self.assertIn("ix_tasks_user_priority", plan)
+        self.assertNotIn("USE TEMP B-TREE", plan)
+        plan = self.query_plan(Q.task_query(db, 1, sorted_column="Description", rows=True))
+        self.assertIn("ix_tasks_user_preview", plan)
+        self.assertNotIn("USE TEMP B-TREE", plan)
+        db.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date
+from sqlalchemy import create_engine
+
+from app.models.task import Task
+from app.models.user import User
+from app.database.db import init_db
+from app.database.executor import DBExecutor
+
+class TestDBExecutor(unittest.TestCase):
+    def setUp(self):
+        # File database shared by the worker threads
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine("sqlite:///" + os.path.join(self.tmp.name, "test.db"))
+        init_db(self.engine)
+        self.executor = DBExecutor(self.engine)
+        self.results = []
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def wait_for(self, count, timeout=5):
+        """Deliver callbacks, as the Tk poll loop would, until count results arrived."""
+        deadline = time.time() + timeout
+        while len(self.results) < count and time.time() < deadline:
+            self.executor.deliver()
+            time.sleep(0.005)
+        self.assertEqual(len(self.results), count)
+
+    def test_write_then_read(self):
+        def write(session):
+            session.add(User(user_id=1, username="u", password_hash="h"))
+            session.add(Task(task_id=1, user_id=1, title="A", description="", due_date=date(2025, 1, 1),
+                             priority=1, category="Work", complete=False))
+        self.executor.submit_write(write, self.results.append)
+        self.wait_for(1)
+        self.executor.submit_read(lambda session: session.query(Task).all(), self.results.append)
+        self.wait_for(2)
+        # Loaded objects stay readable on the calling thread after the worker session closed
+        self.assertEqual([t.title for t in self.results[1]], ["A"])
+
+    def test_errors_are_rolled_back_and_reported(self):
+        def fail(session):
+            session.add(User(user_id=1, username="u", password_hash="h"))
+            raise ValueError("boom")
+        self.executor.submit_write(fail, on_error=self.results.append)
+        self.wait_for(1)
+        self.assertIsInstance(self.results[0], ValueError)
+        self.executor.submit_read(lambda session: session.query(User).count(), self.results.append)
+        self.wait_for(2)
+        self.assertEqual(self.results[1], 0)
+
+    def test_failing_callback_does_not_stop_delivery(self):
+        def fail(value):
+            raise AttributeError("late callback")
+        self.executor.submit_read(lambda session: 1, fail)
+        self.executor.submit_read(lambda session: 2, self.results.append)
+        with self.assertLogs("app.database.executor", "ERROR"):
+            self.wait_for(1)
+        self.assertEqual(self.results, [2])
+
+    def test_poll_reschedules_after_errors(self):
+        class Root:
+            def __init__(self):
+                self.scheduled = []
+
+            def after(self, ms, callback):
+                self.scheduled.append(callback)
+
+        root = Root()
+        self.executor.attach(root, interval=1)
+        def deliver():
+            raise RuntimeError("delivery failed")
+        self.executor.deliver = deliver
+        with self.assertRaises(RuntimeError):
+            root.scheduled.pop()()
+        self.assertEqual(len(root.scheduled), 1)
+
+    def test_callbacks_run_on_delivering_thread(self):
+        self.executor.submit_read(lambda session: threading.current_thread().name,
+                                  lambda name: self.results.append((name, threading.current_thread().name)))
+        self.wait_for(1)
+        worker, caller = self.results[0]
+        self.assertTrue(worker.startswith("db-reader"))
+        self.assertEqual(caller, threading.current_thread().name)
+
+    def test_burst_is_coalesced(self):
+        release = threading.Event()
+        runs = []
+
+        def work(n):
+            def run(session):
+                runs.append(n)
+                release.wait(5)
+                return n
+            return run
+
+        # The first request runs, the burst behind it collapses into one more query with the latest request
+        for n in range(6):
+            self.executor.submit_coalesced("refresh", work(n), self.results.append)
+        release.set()
+        self.wait_for(1)
+        time.sleep(0.05)
+        self.executor.deliver()
+        self.assertEqual(runs, [0, 5])
+        self.assertEqual(self.results, [5])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from sqlalchemy import create_engine, text
+
+from app.utils.profiling import Profiler, normalize
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.profiler = Profiler(stall_ms=50, slow_ms=10000, keep=3)
+
+    def test_disabled_records_nothing(self):
+        engine = create_engine("sqlite:///:memory:")
+        self.profiler.instrument(engine)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        with self.profiler.timer("load"):
+            pass
+        self.profiler.timed("call")(lambda: None)()
+        snapshot = self.profiler.snapshot()
+        self.assertEqual((snapshot["sql"], snapshot["operations"]), ([], []))
+
+    def test_sql_timing(self):
+        engine = create_engine("sqlite:///:memory:")
+        self.profiler.enable(engine)
+        # Hooks are installed once per engine
+        self.profiler.instrument(engine)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1), (2), (3)"))
+            for _ in range(2):
+                conn.execute(text("UPDATE t SET x = x + 1 WHERE x IN (1, 2)"))
+                conn.execute(text("SELECT   x\n FROM t"))
+        sql = {row["statement"]: row for row in self.profiler.snapshot()["sql"]}
+        self.assertEqual(sql["SELECT x FROM t"]["count"], 2)
+        # Affected rows are summed, SELECT row counts are unknown
+        self.assertEqual(sql["UPDATE t SET x = x + 1 WHERE x IN (1, 2)"]["rows"], 3)
+        self.assertEqual(sql["SELECT x FROM t"]["rows"], 0)
+        self.assertEqual(len(self.profiler.snapshot()["slow_queries"]), 3)
+
+    def test_normalize(self):
+        self.assertEqual(normalize("SELECT * FROM t\n  WHERE id IN (?, ?, ?)"), "SELECT * FROM t WHERE id IN (?, ...)")
+        self.assertEqual(normalize("SELECT * FROM t WHERE id IN (?)"), "SELECT * FROM t WHERE id IN (?)")
+
+    def test_operations_and_stalls(self):
+        self.profiler.enable()
+        timed = self.profiler.timed("double")(lambda value: value * 2)
+        self.assertEqual(timed(4), 8)
+        with self.profiler.timer("block"):
+            pass
+        self.profiler.record_since("request", time.perf_counter())
+        operations = {row["name"]: row["count"] for row in self.profiler.snapshot()["operations"]}
+        self.assertEqual(operations, {"double": 1, "block": 1, "request": 1})
+
+        self.profiler.record_stall(5.0)
+        self.profiler.record_stall(80.0)
+        tk = self.profiler.snapshot()["tk"]
+        self.assertEqual((tk["ticks"], tk["stalls"], tk["max_delay_ms"]), (2, 1, 80.0))
+        # A stall right after an operation on this thread is attributed to it
+        self.assertEqual(tk["recent_stalls"][0]["during"], "request")
+        self.profiler.reset()
+        self.assertEqual(self.profiler.snapshot()["tk"]["ticks"], 0)
+
+    def test_dump(self):
+        self.profiler.enable()
+        self.profiler.record_sql("SELECT 1", 2.5)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            self.profiler.dump(path)
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        self.assertEqual(data["sql"][0]["statement"], "SELECT 1")
+        self.assertEqual(data["slow_queries"][0]["ms"], 2.5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.task import Task
+from app.database.db import Base
+from app.models.user import User
+from app.database import queries as Q
+from app.store.task_row import TaskRow
+import app.testing.task_logic as L
+
+class TestTaskQueries(unittest.TestCase):
+    def setUp(self):
+        # In-memory SQLite
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        self.db = Session()
+
+        # Two users, so scoping by user_id can be checked
+        self.db.add_all([User(user_id=1, username="testuser", password_hash="hashed"),
+                         User(user_id=2, username="other", password_hash="hashed")])
+        self.db.commit()
+
+        # Seed tasks for user 1, with ties on every column to exercise the task_id tiebreak
+        categories = ["Work", "Home", "School"]
+        for i in range(12):
+            self.db.add(Task(
+                task_id=i,
+                user_id=1,
+                title="T" + str(i % 4),
+                description=("long " * (i + 5)) if i % 3 == 0 else f"d{i % 5}",
+                due_date=date(2025, 5, 1 + i % 5),
+                priority=1 + i % 3,
+                category=categories[i % 3],
+                complete=bool(i % 2)
+            ))
+        # One task for user 2
+        self.db.add(Task(task_id=100, user_id=2, title="Other", description="", due_date=date(2025, 1, 1),
+                         priority=1, category="Secret", complete=False))
+        self.db.commit()
+
+    def test_scoped_to_user(self):
+        tasks = Q.query_tasks(self.db, 1)
+        self.assertEqual(len(tasks), 12)
+        self.assertTrue(all(t.user_id == 1 for t in tasks))
+        self.assertEqual(Q.query_categories(self.db, 1), ["Home", "School", "Work"])
+        self.assertEqual(Q.query_categories(self.db, 2), ["Secret"])
+
+    def test_filters(self):
+        work = Q.query_tasks(self.db, 1, category="Work")
+        self.assertEqual(len(work), 4)
+        self.assertEqual(Q.count_tasks(self.db, 1, category="Work"), 4)
+        done = Q.query_tasks(self.db, 1, complete=True)
+        self.assertTrue(all(t.complete for t in done))
+        self.assertEqual(Q.count_tasks(self.db, 1, complete=True), 6)
+
+    def test_report_counts_match_python(self):
+        counts = Q.report_counts(self.db, 1)
+        self.assertEqual(counts, L.report_counts_logic(Q.query_tasks(self.db, 1)))
+        self.assertEqual(list(counts), ["Complete", "Home", "School", "Work"])
+        self.assertEqual(Q.report_counts(self.db, 2), {"Secret": 1})
+        self.assertEqual(Q.report_counts(self.db, 3), {})
+
+    def test_sort_matches_python_keymap(self):
+        tasks = Q.query_tasks(self.db, 1)
+        for column in Q.SORT_COLUMNS:
+            for reverse in (False, True):
+                expected = L.sort_tasks_logic(tasks, column, reverse)
+                actual = Q.query_tasks(self.db, 1, sorted_column=column, sort_reverse=reverse)
+                key = lambda t: Q.keyset_position(t, column)[0]
+                self.assertEqual([key(t) for t in actual], [key(t) for t in expected], column)
+        # Sorting on the preview leaves the deferred descriptions unloaded, no query per task
+        self.assertFalse(any("description" in t.__dict__ for t in tasks))
+
+    def test_offset_pagination(self):
+        full = Q.query_tasks(self.db, 1, sorted_column="Priority")
+        page = Q.query_tasks(self.db, 1, sorted_column="Priority", limit=5, offset=5)
+        self.assertEqual([t.task_id for t in page], [t.task_id for t in full[5:10]])
+        self.assertEqual(len(L.load_tasks(self.db, 1, limit=3)), 3)
+
+    def test_keyset_pagination(self):
+        for column in (None, "Due Date", "Description", "✓/x"):
+            for reverse in (False, True):
+                full = Q.query_tasks(self.db, 1, sorted_column=column, sort_reverse=reverse)
+                pages, after = [], None
+                while True:
+                    page = Q.query_tasks(self.db, 1, sorted_column=column, sort_reverse=reverse,
+                                         limit=5, after=after)
+                    if not page:
+                        break
+                    pages.extend(page)
+                    after = Q.keyset_position(page[-1], column)
+                self.assertEqual([t.task_id for t in pages], [t.task_id for t in full])
+
+    def test_rows_match_tasks(self):
+        fields = TaskRow.__slots__
+        values = lambda tasks: [tuple(getattr(t, name) for name in fields) for t in tasks]
+        for column in (None, "Due Date", "Description", "✓/x"):
+            tasks = Q.query_tasks(self.db, 1, category="Work", sorted_column=column)
+            rows = Q.query_tasks(self.db, 1, category="Work", sorted_column=column, rows=True)
+            self.assertEqual(values(rows), values(tasks))
+        # Rows are plain objects, loading them leaves nothing in the session
+        self.db.expunge_all()
+        rows = Q.query_tasks(self.db, 1, rows=True, limit=5, after=Q.keyset_position(tasks[0], "✓/x"))
+        self.assertTrue(all(type(row) is TaskRow for row in rows))
+        self.assertEqual(len(self.db.identity_map), 0)
+        self.assertEqual(Q.task_row(self.db, 3).title, "T3")
+        self.assertIsNone(Q.task_row(self.db, 999))
+        self.assertEqual(len(Q.changes_since(self.db, 1, -1, rows=True)[1]), 12)
+
+    def test_description_deferred(self):
+        self.assertEqual(Q.task_description(self.db, 0), "long " * 5)
+        self.assertIsNone(Q.task_description(self.db, 999))
+        # List queries carry the bounded preview, never the full text
+        self.db.expunge_all()
+        statement = str(Q.task_query(self.db, 1, rows=True).statement)
+        self.assertNotIn("tasks.description,", statement)
+        tasks = {t.task_id: t for t in Q.query_tasks(self.db, 1)}
+        self.assertNotIn("description", tasks[9].__dict__)
+        self.assertEqual(tasks[9].description_preview, "long " * 8 + "lo...")
+        self.assertEqual(tasks[1].description_preview, "d1")
+        rows = {row.task_id: row for row in Q.query_tasks(self.db, 1, rows=True)}
+        self.assertTrue(all(len(row.description_preview) <= 45 for row in rows.values()))
+        self.assertEqual(rows[9].description_preview, tasks[9].description_preview)
+        # Setting the description of a row, as the write-behind overlay does, updates its preview
+        rows[1].description = "short"
+        self.assertEqual(rows[1].description_preview, "short")
+        rows[1].description = None
+        self.assertEqual(rows[1].description_preview, "")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.task import Task
+from app.models.user import User
+from app.database import queries as Q
+from app.database.db import init_db
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        # File database with the migrations, so the FTS5 table and its triggers exist
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine("sqlite:///" + os.path.join(self.tmp.name, "test.db"))
+        init_db(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add_all([User(user_id=1, username="a", password_hash="h"),
+                         User(user_id=2, username="b", password_hash="h")])
+        rows = [
+            (1, 1, "Buy groceries", "milk, eggs and bread", "Home"),
+            (2, 1, "Quarterly report", "draft the report, then send the report to Ana", "Work"),
+            (3, 1, "Report bug", None, "Work"),
+            (4, 1, "Café visit", "meet Zoë", "Home"),
+            (5, 2, "Report for user two", "", "Work"),
+        ]
+        self.db.add_all(Task(task_id=task_id, user_id=user_id, title=title, description=description,
+                             due_date=date(2025, 1, task_id), priority=3, category=category, complete=False)
+                        for task_id, user_id, title, description, category in rows)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def ids(self, text, **kwargs):
+        return [t.task_id for t in Q.search_tasks(self.db, 1, text, **kwargs)]
+
+    def test_fts_query(self):
+        self.assertEqual(Q.fts_query('rep "x" AND b*'), '"rep"* "x" "AND"* "b"')
+        self.assertIsNone(Q.fts_query(' "*() '))
+        self.assertIsNone(Q.fts_query(None))
+
+    def test_prefix_and_ranking(self):
+        # bm25 ranks the short task about the word above the long one, user 2's task is not returned
+        self.assertEqual(self.ids("rep"), [3, 2])
+        self.assertEqual(self.ids("report bu"), [3])
+        self.assertEqual(self.ids("GROC"), [1])
+        # Diacritics are folded
+        self.assertEqual(self.ids("cafe zoe"), [4])
+        self.assertEqual(self.ids("  "), [])
+        self.assertEqual(self.ids("rep", limit=1), [3])
+
+    def test_filters_and_sorting(self):
+        self.assertEqual(self.ids("rep", category="Home"), [])
+        self.assertEqual(self.ids("rep", sorted_column="Due Date", sort_reverse=True), [3, 2])
+        self.assertEqual(self.ids("rep", sorted_column="Title"), [2, 3])
+
+    def test_index_follows_changes(self):
+        self.db.get(Task, 1).title = "Pick up parcel"
+        self.db.get(Task, 3).complete = True
+        self.db.delete(self.db.get(Task, 2))
+        self.db.add(Task(task_id=6, user_id=1, title="Parcel", description="report it", due_date=date(2025, 2, 1),
+                         priority=1, category="Home", complete=False))
+        self.db.commit()
+        self.assertEqual(self.ids("groceries"), [])
+        self.assertEqual(self.ids("bread"), [1])
+        self.assertEqual(sorted(self.ids("parcel")), [1, 6])
+        self.assertEqual(sorted(self.ids("report")), [3, 6])
+        with self.engine.connect() as connection:
+            # The external content index matches the table
+            connection.exec_driver_sql("INSERT INTO tasks_fts (tasks_fts, rank) VALUES ('integrity-check', 1)")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.task import Task
+from app.models.user import User
+from app.database import queries as Q
+from app.database.db import init_db
+from app.store import snapshot as S
+from app.store.task_row import TaskRow
+from app.store.task_store import TaskStore
+
+VIEW = dict(category="All", sorted_column="Title", sort_reverse=False, archived=False, first=0,
+            categories=["Home", "Work"])
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache", "tasks.snapshot")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        rows = [TaskRow(1, "Plain", date(2025, 1, 2), "note", 3, "Work", False),
+                TaskRow(2, "Ünïcode ✓", date(2025, 12, 31), None, 1, "Home", True),
+                TaskRow(3, "Empty", None, "", 5, "Work", False)]
+        self.assertEqual(S.save_snapshot(self.path, 7, 42, rows, VIEW, total=10, offset=4), 3)
+        with S.open_snapshot(self.path, 7) as snapshot:
+            self.assertEqual((snapshot.version, snapshot.total, snapshot.offset, len(snapshot)), (42, 10, 4, 3))
+            self.assertEqual(snapshot.view, VIEW)
+            self.assertEqual([repr(row) for row in snapshot.rows()], [repr(row) for row in rows])
+            # Rows are decoded on access, any one of them
+            self.assertEqual(snapshot.row(1).title, "Ünïcode ✓")
+            self.assertEqual([row.task_id for row in snapshot.rows(2, 99)], [3])
+        # Readable by the owner only, and no temporary file is left behind
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["tasks.snapshot"])
+
+    def test_unusable_files(self):
+        self.assertIsNone(S.open_snapshot(self.path, 1))
+        S.save_snapshot(self.path, 1, 5, [TaskRow(1, "T", date(2025, 1, 1), "", 1, "Work", False)], VIEW)
+        self.assertIsNone(S.open_snapshot(self.path, 2))
+        with open(self.path, "rb") as file:
+            data = file.read()
+        # Truncated, of another format version, or empty
+        for broken in (data[:-40], data[:4] + b"\x63\x00" + data[6:], b""):
+            with open(self.path, "wb") as file:
+                file.write(broken)
+            self.assertIsNone(S.open_snapshot(self.path, 1))
+        S.delete_snapshot(self.path)
+        S.delete_snapshot(self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_paths(self):
+        first = S.snapshot_path(1, "sqlite:////data/a.db", self.tmp.name)
+        self.assertEqual(os.path.dirname(first), self.tmp.name)
+        self.assertNotEqual(first, S.snapshot_path(2, "sqlite:////data/a.db", self.tmp.name))
+        self.assertNotEqual(first, S.snapshot_path(1, "sqlite:////data/b.db", self.tmp.name))
+        # A relative path is resolved against the working directory
+        self.assertEqual(S.snapshot_path(1, "sqlite:///a.db", self.tmp.name),
+                         S.snapshot_path(1, "sqlite:///" + os.path.abspath("a.db"), self.tmp.name))
+
+    def test_reconcile_with_changes(self):
+        engine = create_engine("sqlite:///" + os.path.join(self.tmp.name, "test.db"))
+        init_db(engine)
+        db = sessionmaker(bind=engine)()
+        db.add(User(user_id=1, username="a", password_hash="h"))
+        db.add_all(Task(user_id=1, title=f"T{i}", description="d" * i, due_date=date(2025, 1, 1 + i), priority=3,
+                        category="Work", complete=False) for i in range(5))
+        db.commit()
+        version = Q.current_version(db)
+        S.save_snapshot(self.path, 1, version, Q.query_tasks(db, 1, sorted_column="Title", rows=True), VIEW)
+        # Changes made while the app was closed
+        db.get(Task, 2).title = "Renamed"
+        db.delete(db.get(Task, 3))
+        db.add(Task(user_id=1, title="New", description="", due_date=date(2025, 2, 1), priority=1, category="Home",
+                    complete=False))
+        db.commit()
+        with S.open_snapshot(self.path, 1) as snapshot:
+            store = TaskStore(snapshot.rows())
+            _, changed, deleted = Q.changes_since(db, 1, snapshot.version, rows=True)
+        store.apply_changes(changed, deleted)
+        self.assertEqual([(t.task_id, t.title) for t in store.sorted_tasks("Title")],
+                         [(t.task_id, t.title) for t in Q.query_tasks(db, 1, sorted_column="Title", rows=True)])
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import random
+import unittest
+
+from app.store.sorted_list import LOAD, SortedList
+
+class TestSortedList(unittest.TestCase):
+    def test_matches_sorted_python_list(self):
+        rng = random.Random(5)
+        # Enough values to split and empty blocks, with duplicates
+        values = [rng.randint(0, 300) for _ in range(5 * LOAD)]
+        items = SortedList(values[:LOAD])
+        expected = sorted(values[:LOAD])
+        for value in values[LOAD:]:
+            items.add(value)
+            expected.append(value)
+        expected.sort()
+        self.assertEqual((list(items), len(items)), (expected, len(expected)))
+        # The single starting block was split
+        self.assertGreater(len(items._blocks), 1)
+        rng.shuffle(values)
+        for value in values[:-10]:
+            items.remove(value)
+            expected.remove(value)
+        self.assertEqual(list(items), expected)
+        self.assertEqual(list(reversed(items)), expected[::-1])
+
+    def test_remove_missing(self):
+        items = SortedList([(2, "b"), (1, "a")])
+        self.assertEqual(list(items), [(1, "a"), (2, "b")])
+        for value in ((1, "b"), (3, "c")):
+            with self.assertRaises(ValueError):
+                items.remove(value)
+        items.remove((1, "a"))
+        items.remove((2, "b"))
+        self.assertEqual(len(items), 0)
+        items.add((0, "z"))
+        self.assertEqual(list(items), [(0, "z")])
+
+if __name__ == "__main__":
+    unittest.main()
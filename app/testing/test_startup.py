@@ -0,0 +1,23 @@
+import unittest
+
+from app.benchmarks import startup as S
+
+class TestStartup(unittest.TestCase):
+    def test_startup_within_budget(self):
+        elapsed, loaded = S.probe()
+        self.assertEqual(loaded, [], "heavy modules imported before the login window")
+        self.assertLess(elapsed, S.DEFAULT_BUDGET_MS)
+
+    def test_report_is_deferred(self):
+        # The task list needs the database layer, matplotlib waits for the first report
+        _, loaded = S.probe(["app.gui.task_list_frame"], ["matplotlib", "sqlalchemy"])
+        self.assertEqual(loaded, ["sqlalchemy"])
+
+    def test_import_times(self):
+        rows = S.import_times(["app.gui.app"])
+        names = [name.strip() for name, _, _ in rows]
+        self.assertEqual(names[-1], "app.gui.app")
+        self.assertNotIn("sqlalchemy", names)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ from app.models.task import Task
 from app.database.db import Base
 from app.models.user import User
 import app.testing.task_logic as L
+from app.store.task_store import TaskStore
 
 class TestTaskLogic(unittest.TestCase):
     def setUp(self):
@@ -23,7 +24,7 @@ class TestTaskLogic(unittest.TestCase):
 
         # Seed sample tasks linked to the user
         t1 = Task(
-            task_id="1",
+            task_id=1,
             user_id=1,
             title="A",
             description="foo",
@@ -33,7 +34,7 @@ class TestTaskLogic(unittest.TestCase):
             complete=False
         )
         t2 = Task(
-            task_id="2",
+            task_id=2,
             user_id=1,
             title="B",
             description="bar",
@@ -43,7 +44,7 @@ class TestTaskLogic(unittest.TestCase):
             complete=True
         )
         t3 = Task(
-            task_id="3",
+            task_id=3,
             user_id=1,
             title="C",
             description="baz",
@@ -91,21 +92,32 @@ class TestTaskLogic(unittest.TestCase):
 
     def test_toggle_complete_logic(self):
         tasks = L.load_tasks(self.db)
-        t = L.toggle_complete_logic("1", tasks, self.db)
+        t = L.toggle_complete_logic(1, tasks, self.db)
         self.assertTrue(t.complete)
         # toggle back
-        t_back = L.toggle_complete_logic("1", tasks, self.db)
+        t_back = L.toggle_complete_logic(1, tasks, self.db)
         self.assertFalse(t_back.complete)
 
     def test_delete_task_logic_and_report(self):
         tasks = L.load_tasks(self.db)
-        remaining, deleted = L.delete_task_logic("2", tasks, self.db)
+        remaining, deleted = L.delete_task_logic(2, tasks, self.db)
         self.assertIsNotNone(deleted)
-        self.assertEqual(deleted.task_id, "2")
+        self.assertEqual(deleted.task_id, 2)
         self.assertEqual(len(remaining), 2)
         counts = L.report_counts_logic(remaining)
         # both remaining are category "Work" and incomplete
         self.assertEqual(counts, {"Work": 2})
 
+    def test_store_toggle_and_delete(self):
+        store = TaskStore(L.load_tasks(self.db))
+        t = L.toggle_complete_logic(1, store, self.db)
+        self.assertTrue(t.complete)
+        self.assertEqual(L.report_counts_logic(store), {"Complete": 2, "Work": 1})
+        remaining, deleted = L.delete_task_logic(2, store, self.db)
+        self.assertIs(remaining, store)
+        self.assertEqual(deleted.task_id, 2)
+        self.assertEqual(L.get_categories(store), ["Work"])
+        self.assertEqual(len(L.load_tasks(self.db)), 2)
+
 if __name__ == "__main__":
     unittest.main()
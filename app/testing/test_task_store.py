@@ -0,0 +1,81 @@
+import random
+import unittest
+from datetime import date
+from types import SimpleNamespace
+
+from app.store.task_store import TaskStore, SORT_KEYS
+import app.testing.task_logic as L
+
+def make_task(i, rng):
+    return SimpleNamespace(
+        task_id=f"{i:03d}",
+        title=rng.choice("ABCDE"),
+        description=rng.choice(["", "short", "x" * 60]),
+        due_date=date(2025, 1, rng.randint(1, 28)),
+        priority=rng.randint(1, 5),
+        category=rng.choice(["Work", "Home", "School"]),
+        complete=rng.random() < 0.5,
+    )
+
+class TestTaskStore(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(3)
+        self.tasks = [make_task(i, self.rng) for i in range(60)]
+        self.store = TaskStore(self.tasks)
+
+    def assert_consistent(self):
+        """Every maintained index matches a from-scratch computation over the same tasks."""
+        tasks = list(self.store)
+        self.assertEqual(self.store.categories(), sorted({t.category for t in tasks}))
+        self.assertEqual(self.store.report_counts(), L.report_counts_logic(tasks))
+        for column, key in SORT_KEYS.items():
+            for reverse in (False, True):
+                expected = sorted(tasks, key=lambda t: (key(t), t.task_id), reverse=reverse)
+                self.assertEqual(self.store.sorted_tasks(column, reverse), expected, column)
+        for category in self.store.categories():
+            self.assertEqual(self.store.category_count(category), len(L.filter_tasks(tasks, category)))
+
+    def test_lookup(self):
+        self.assertEqual(len(self.store), 60)
+        self.assertIs(self.store.get("007"), self.tasks[7])
+        self.assertIsNone(self.store.get("missing"))
+        self.assertIn("010", self.store)
+        self.assertEqual(list(self.store), self.tasks)
+
+    def test_indexes_follow_mutations(self):
+        # Build the sorted views first, so they are maintained rather than rebuilt
+        self.assert_consistent()
+        for step in range(200):
+            action = self.rng.random()
+            if action < 0.3 and len(self.store):
+                self.store.remove(self.rng.choice(list(self.store)).task_id)
+            elif action < 0.6:
+                self.store.add(make_task(100 + step, self.rng))
+            elif len(self.store):
+                task = self.rng.choice(list(self.store))
+                task.complete = not task.complete
+                task.category = self.rng.choice(["Work", "Home", "Errands"])
+                task.priority = self.rng.randint(1, 5)
+                self.store.update(task)
+        self.assert_consistent()
+
+    def test_apply_changes(self):
+        updated = make_task(5, self.rng)
+        updated.category = "Errands"
+        added = make_task(200, self.rng)
+        added.category = "Work"
+        self.store.apply_changes([updated, added], ["001", "missing"], keep=lambda t: t.category != "Errands")
+        self.assertNotIn("001", self.store)
+        self.assertNotIn("005", self.store)
+        self.assertIs(self.store.get("200"), added)
+        self.assertEqual(len(self.store), 59)
+        self.assert_consistent()
+
+    def test_task_logic_accepts_store(self):
+        self.assertEqual(L.get_categories(self.store), ["Home", "School", "Work"])
+        self.assertEqual(len(L.filter_tasks(self.store, "All")), 60)
+        self.assertEqual([t.priority for t in L.sort_tasks_logic(self.store, "Priority", False)],
+                         sorted(t.priority for t in self.tasks))
+
+if __name__ == "__main__":
+    unittest.main()
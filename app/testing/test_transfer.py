@@ -0,0 +1,126 @@
+import io
+import os
+import tempfile
+import unittest
+from datetime import date
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.task import Task
+from app.models.user import User
+from app.database import transfer as T
+from app.database.db import init_db
+
+class TestTransfer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine("sqlite:///" + os.path.join(self.tmp.name, "test.db"))
+        init_db(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add_all([User(user_id=1, username="a", password_hash="h"),
+                         User(user_id=2, username="b", password_hash="h")])
+        self.db.add_all(Task(task_id=i + 1, user_id=1, title=f"T{i}", description="d, \"quoted\"\nline",
+                             due_date=date(2025, 1, 1 + i % 28), priority=1 + i % 5, category="Work",
+                             complete=i % 2 == 0)
+                        for i in range(25))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def tasks_of(self, user_id):
+        return [{name: getattr(t, name) for name in T.FIELDS}
+                for t in self.db.query(Task).filter(Task.user_id == user_id).order_by(Task.task_id)]
+
+    def test_round_trip(self):
+        for file_format in T.FORMATS:
+            path = os.path.join(self.tmp.name, "tasks." + file_format)
+            self.assertEqual(T.export_file(self.db, 1, path), 25)
+            # The same tasks again are skipped
+            self.assertEqual(T.import_file(self.db, 1, path), (0, 25))
+            self.db.query(Task).filter(Task.user_id == 1).delete()
+            self.db.commit()
+            self.assertEqual(T.import_file(self.db, 2, path), (25, 0))
+            self.assertEqual(len(self.tasks_of(2)), 25)
+            self.db.query(Task).update({Task.user_id: 1})
+            self.db.commit()
+        self.assertEqual(self.tasks_of(1)[3]["description"], "d, \"quoted\"\nline")
+        self.assertIs(self.tasks_of(1)[3]["complete"], False)
+
+    def test_import_batches(self):
+        statements = []
+        event.listen(self.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, params, context, many: statements.append(many))
+        rows = ({"title": f"New {i}", "due_date": "2025-02-01", "priority": "2", "complete": "true"}
+                for i in range(250))
+        self.assertEqual(T.import_tasks(self.db, 2, rows, batch_size=100), (250, 0))
+        # One executemany per batch
+        self.assertEqual(statements.count(True), 3)
+        imported = self.tasks_of(2)
+        self.assertEqual(len({t["task_id"] for t in imported}), 250)
+        self.assertTrue(all(t["complete"] and t["category"] == "General" for t in imported))
+
+    def test_uuid_ids_get_new_ids(self):
+        # Files exported while task ids were UUIDs still import under new ids
+        rows = [{"task_id": "6f1c0e2a-5d4b-4c1e-9a43-3e2f1b7c8d90", "title": "Old", "due_date": "2025-01-01"},
+                {"task_id": " 30 ", "title": "Free", "due_date": "2025-01-01"}]
+        self.assertEqual(T.import_tasks(self.db, 2, rows), (2, 0))
+        self.assertEqual([t["task_id"] for t in self.tasks_of(2)], [30, 31])
+
+    def test_taken_ids_from_another_database(self):
+        # Another database numbered its own tasks 1..5, its export clashes with ids of user 1
+        rows = [dict(task_id=i, title=f"Other {i}", due_date="2025-03-01") for i in range(1, 6)]
+        self.assertEqual(T.import_tasks(self.db, 2, rows, batch_size=2), (5, 0))
+        self.assertEqual([t["title"] for t in self.tasks_of(2)], [f"Other {i}" for i in range(1, 6)])
+        self.assertTrue(all(t["task_id"] > 25 for t in self.tasks_of(2)))
+        self.assertEqual(len(self.tasks_of(1)), 25)
+        # Importing the file again finds the tasks under their new ids, a clashing id of the same user
+        # with other content is a new task
+        self.assertEqual(T.import_tasks(self.db, 2, rows), (0, 5))
+        rows = [dict(task_id=1, title="T0", due_date="2025-01-01", description="new text")]
+        self.assertEqual(T.import_tasks(self.db, 1, rows), (1, 0))
+        self.assertEqual(len(self.tasks_of(1)), 26)
+        # A repeated id within one file is a clash as well
+        rows = [dict(task_id=40, title="A", due_date="2025-01-01"), dict(task_id=40, title="B", due_date="2025-01-01")]
+        self.assertEqual(T.import_tasks(self.db, 2, rows), (2, 0))
+
+    def test_deleted_ids_are_not_reused(self):
+        exported = list(T.export_tasks(self.db, 1))
+        self.db.delete(self.db.get(Task, 25))
+        self.db.delete(self.db.get(Task, 3))
+        self.db.commit()
+        # The deleted tasks come back under new ids, a queued edit of an old id cannot reach them
+        self.assertEqual(T.import_tasks(self.db, 1, exported), (2, 23))
+        self.assertEqual([t["task_id"] for t in self.tasks_of(1)][-2:], [26, 27])
+        self.assertIsNone(self.db.get(Task, 3))
+        self.assertIsNone(self.db.get(Task, 25))
+        self.assertEqual(sorted(t["title"] for t in self.tasks_of(1) if t["task_id"] > 25), ["T2", "T24"])
+
+    def test_invalid_row_reports_line(self):
+        rows = [{"title": "ok", "due_date": "2025-01-01"}, {"title": "bad", "due_date": "01/02/2025"}]
+        with self.assertRaisesRegex(ValueError, "Line 2"):
+            T.import_tasks(self.db, 2, rows)
+        with self.assertRaisesRegex(ValueError, "Line 1: title"):
+            T.import_tasks(self.db, 2, [{"due_date": "2025-01-01"}])
+
+    def test_export_streams_rows(self):
+        rows = T.export_tasks(self.db, 1, batch_size=10)
+        first = next(rows)
+        self.assertEqual(first["task_id"], 1)
+        self.assertEqual(first["due_date"], "2025-01-01")
+        self.assertEqual(len(list(rows)), 24)
+        buffer = io.StringIO()
+        self.assertEqual(T.write_rows(buffer, T.export_tasks(self.db, 2), "jsonl"), 0)
+        self.assertEqual(buffer.getvalue(), "")
+
+    def test_detect_format(self):
+        self.assertEqual(T.detect_format("x.CSV"), "csv")
+        self.assertEqual(T.detect_format("x.json"), "jsonl")
+        self.assertEqual(T.detect_format("x.txt", "csv"), "csv")
+        with self.assertRaises(ValueError):
+            T.detect_format("x.txt")
+
+if __name__ == "__main__":
+    unittest.main()
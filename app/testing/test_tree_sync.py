@@ -0,0 +1,83 @@
+import random
+import unittest
+
+from app.gui.tree_sync import TreeSync
+
+class FakeTree:
+    """Stand-in for ttk.Treeview, records the calls TreeSync makes."""
+    def __init__(self):
+        self.items = []
+        self.values = {}
+        self.calls = []
+
+    def insert(self, parent, index, iid, values):
+        self.calls.append("insert")
+        self.items.insert(index, iid)
+        self.values[iid] = values
+
+    def move(self, iid, parent, index):
+        self.calls.append("move")
+        self.items.remove(iid)
+        self.items.insert(index, iid)
+
+    def item(self, iid, values):
+        self.calls.append("item")
+        self.values[iid] = values
+
+    def delete(self, *iids):
+        self.calls.append("delete")
+        for iid in iids:
+            self.items.remove(iid)
+            del self.values[iid]
+
+def rows(ids, version=0):
+    return [(iid, (iid, version)) for iid in ids]
+
+class TestTreeSync(unittest.TestCase):
+    def setUp(self):
+        self.tree = FakeTree()
+        self.sync = TreeSync(self.tree)
+        self.sync.sync(rows("abcdef"))
+        self.tree.calls.clear()
+
+    def test_initial_load(self):
+        self.assertEqual(self.tree.items, list("abcdef"))
+
+    def test_unchanged_refresh_touches_nothing(self):
+        stats = self.sync.sync(rows("abcdef"))
+        self.assertEqual(self.tree.calls, [])
+        self.assertEqual(sum(stats.values()), 0)
+
+    def test_single_value_change(self):
+        desired = rows("abcdef")
+        desired[2] = ("c", ("c", 1))
+        self.sync.sync(desired)
+        self.assertEqual(self.tree.calls, ["item"])
+        self.assertEqual(self.tree.values["c"], ("c", 1))
+
+    def test_single_row_moved(self):
+        stats = self.sync.sync(rows("bcdefa"))
+        self.assertEqual(self.tree.items, list("bcdefa"))
+        self.assertEqual(stats["moved"], 1)
+
+    def test_insert_and_delete(self):
+        self.sync.sync(rows("axcey"))
+        self.assertEqual(self.tree.items, list("axcey"))
+        self.assertEqual(self.tree.calls.count("delete"), 1)
+
+    def test_update_row(self):
+        self.sync.update_row("d", ("d", 2))
+        self.assertEqual(self.tree.calls, ["item"])
+        self.assertEqual(self.sync.rows["d"], ("d", 2))
+
+    def test_random_reorders(self):
+        rng = random.Random(7)
+        pool = [str(i) for i in range(40)]
+        for _ in range(50):
+            ids = rng.sample(pool, rng.randint(0, len(pool)))
+            self.sync.sync(rows(ids))
+            self.assertEqual(self.tree.items, ids)
+            self.assertEqual(self.sync.order, ids)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from app.gui.virtual_list import PagedRows, window_range
+
+class TestVirtualList(unittest.TestCase):
+    def setUp(self):
+        # Rows are their own keyset position
+        self.data = list(range(1000))
+        self.calls = []
+
+    def fetch(self, limit, offset, after):
+        self.calls.append((limit, offset, after))
+        if after is not None:
+            start = self.data.index(after) + 1
+        else:
+            start = offset
+        return self.data[start:start + limit]
+
+    def test_rows_fetch_only_needed_pages(self):
+        pages = PagedRows(len(self.data), position=lambda r: r, page_size=100)
+        self.assertEqual(pages.load(150, 170, self.fetch), list(range(150, 170)))
+        self.assertEqual(self.calls, [(100, 100, None)])
+        # Same page again comes from the cache
+        pages.load(160, 180, self.fetch)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_sequential_scroll_uses_keyset(self):
+        pages = PagedRows(len(self.data), position=lambda r: r, page_size=100)
+        self.assertEqual(pages.load(90, 120, self.fetch), list(range(90, 120)))
+        self.assertEqual(self.calls, [(100, 0, None), (100, 0, 99)])
+
+    def test_planned_fetch_continues_from_cached_page(self):
+        pages = PagedRows(len(self.data), position=lambda r: r, page_size=100)
+        pages.load(0, 10, self.fetch)
+        self.assertEqual(pages.missing(50, 250), [1, 2])
+        requests = pages.requests(pages.missing(50, 250))
+        self.assertEqual(requests, [(1, 99), (2, None)])
+        # Fetching does not touch the cache, so it can run on a worker thread
+        fetched = pages.fetch_pages(requests, self.fetch)
+        self.assertEqual(list(pages.pages), [0])
+        pages.put_pages(fetched)
+        self.assertEqual(pages.rows(50, 250), list(range(50, 250)))
+        self.assertEqual(self.calls[1:], [(100, 0, 99), (100, 0, 199)])
+
+    def test_cache_is_bounded(self):
+        pages = PagedRows(len(self.data), page_size=100, max_pages=3)
+        for start in range(0, 1000, 100):
+            pages.load(start, start + 10, self.fetch)
+        self.assertEqual(list(pages.pages), [7, 8, 9])
+
+    def test_rows_clamped_to_total(self):
+        pages = PagedRows(len(self.data), page_size=100)
+        self.assertEqual(pages.load(995, 1010, self.fetch), list(range(995, 1000)))
+        self.assertEqual(pages.load(-5, 2, self.fetch), [0, 1])
+
+    def test_window_range(self):
+        self.assertEqual(window_range(0, 10, 1000, 5), (0, 0, 15))
+        self.assertEqual(window_range(500, 10, 1000, 5), (500, 495, 515))
+        # The viewport cannot scroll past the last full screen
+        self.assertEqual(window_range(2000, 10, 1000, 5), (990, 985, 1000))
+        self.assertEqual(window_range(-3, 10, 4, 5), (0, 0, 4))
+
+if __name__ == "__main__":
+    unittest.main()
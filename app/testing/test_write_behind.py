@@ -0,0 +1,114 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import date
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.task import Task
+from app.models.user import User
+from app.database.db import init_db
+from app.database.executor import DBExecutor
+from app.database.write_behind import WriteBehindQueue
+
+class FakeScheduler:
+    """Stand-in for the Tk widget timers, fired by hand."""
+    def __init__(self):
+        self.timers = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.timers[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, timer):
+        self.timers.pop(timer, None)
+
+    def fire(self):
+        for timer, callback in list(self.timers.items()):
+            del self.timers[timer]
+            callback()
+
+class TestWriteBehind(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine("sqlite:///" + os.path.join(self.tmp.name, "test.db"))
+        init_db(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add(User(user_id=1, username="u", password_hash="h"))
+        self.db.add_all(Task(task_id=i, user_id=1, title=f"T{i}", description="", due_date=date(2025, 1, 1),
+                             priority=3, category="Work", complete=False) for i in range(12))
+        self.db.commit()
+
+        # Count committed transactions
+        self.commits = 0
+        event.listen(self.engine, "commit", self.count_commit)
+
+        self.executor = DBExecutor(self.engine)
+        self.scheduler = FakeScheduler()
+        self.flushed, self.failed = [], []
+        self.queue = WriteBehindQueue(self.executor, self.scheduler, delay_ms=200,
+                                      on_flushed=self.flushed.append,
+                                      on_failed=lambda error, originals: self.failed.append(originals))
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.db.close()
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def count_commit(self, connection):
+        self.commits += 1
+
+    def wait_for(self, results):
+        deadline = time.time() + 5
+        while not results and time.time() < deadline:
+            self.executor.deliver()
+            time.sleep(0.005)
+        self.assertTrue(results)
+
+    def stored(self, field):
+        self.db.expire_all()
+        return {t.task_id: getattr(t, field) for t in self.db.query(Task)}
+
+    def test_changes_written_in_one_transaction(self):
+        for i in range(12):
+            self.queue.enqueue(i, {"complete": True}, {"complete": False})
+        self.queue.enqueue(3, {"priority": 1}, {"priority": 3})
+        # Nothing is written before the debounce timer fires
+        self.assertEqual(len(self.scheduler.timers), 1)
+        self.assertFalse(any(self.stored("complete").values()))
+
+        self.scheduler.fire()
+        self.wait_for(self.flushed)
+        self.assertEqual(self.flushed, [12])
+        self.assertEqual(self.commits, 1)
+        self.assertTrue(all(self.stored("complete").values()))
+        self.assertEqual(self.stored("priority")[3], 1)
+
+    def test_overlay_shows_queued_values(self):
+        self.queue.enqueue(1, {"title": "Queued"}, {"title": "T1"})
+        tasks = self.queue.overlay(self.db.query(Task).filter(Task.task_id.in_([1, 2])).all())
+        self.assertEqual(sorted(t.title for t in tasks), ["Queued", "T2"])
+        self.db.rollback()
+
+    def test_failed_batch_rolls_back_and_reports_originals(self):
+        self.queue.enqueue(1, {"complete": True}, {"complete": False})
+        self.queue.enqueue(2, {"complete": True}, {"complete": False})
+        self.queue.enqueue(2, {"title": None}, {"title": "T2"})
+        self.queue.flush()
+        self.wait_for(self.failed)
+        self.assertEqual(self.failed[0], {1: {"complete": False}, 2: {"complete": False, "title": "T2"}})
+        self.assertFalse(any(self.stored("complete").values()))
+
+    def test_zero_delay_writes_immediately(self):
+        self.queue.delay_ms = 0
+        self.queue.enqueue(5, {"complete": True}, {"complete": False})
+        self.assertEqual(self.scheduler.timers, {})
+        self.wait_for(self.flushed)
+        self.assertTrue(self.stored("complete")[5])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,41 @@
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta, timezone
+
 import bcrypt
 from sqlalchemy.orm import Session
+from app import config
 from app.models.user import User
+from app.models.session_token import SessionToken
 from sqlalchemy.exc import IntegrityError
 
-def create_user(session: Session, username: str, password: str):
-    """Create user function. Hashes password for security. Input: session, username, password."""
+# Work factors bcrypt accepts
+MIN_ROUNDS, MAX_ROUNDS = 4, 31
+
+def work_factor(rounds=None):
+    """Return the bcrypt work factor to use, clamped to bcrypt's range. Input: rounds (optional, config.BCRYPT_ROUNDS)."""
+    rounds = config.BCRYPT_ROUNDS if rounds is None else rounds
+    return max(MIN_ROUNDS, min(MAX_ROUNDS, int(rounds)))
+
+def hash_password(password: str, rounds=None):
+    """Hash a password with bcrypt. Input: password, work factor (optional, config.BCRYPT_ROUNDS by default)."""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(work_factor(rounds))).decode()
+
+def hash_rounds(password_hash: str):
+    """Return the work factor of a bcrypt hash ('$2b$<rounds>$...'), None if unreadable. Input: password hash."""
+    parts = password_hash.split("$")
+    return int(parts[2]) if len(parts) > 3 and parts[2].isdigit() else None
+
+def create_user(session: Session, username: str, password: str, rounds=None):
+    """Create user function. Hashes password for security. Input: session, username, password, work factor (optional)."""
+    return add_user(session, username, hash_password(password, rounds))
+
+def add_user(session: Session, username: str, password_hash: str):
+    """Insert a user with a password hash made beforehand, so the database write does not wait for bcrypt.
+    Input: session, username, password hash. Returns False if the username is taken."""
     # Strip whitespaces from username
     username = username.strip()
-    # Get the password hash
-    password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
     # Create a new user with the username and password hash
     user = User(username=username, password_hash=password_hash)
     # Add the user
@@ -22,13 +49,80 @@ def create_user(session: Session, username: str, password: str):
         session.rollback()
         return False
 
-def authenticate(session: Session, username: str, password: str):
-    """Authenticate login function. Input: session, username, password"""
+def authenticate(session: Session, username: str, password: str, rounds=None):
+    """Authenticate login function. Input: session, username, password, work factor (optional).
+    A hash made with another work factor is replaced after a successful check."""
+    user, new_hash = check_password(session, username, password, rounds)
+    if new_hash:
+        user.password_hash = new_hash
+        session.commit()
+    return user
+
+def check_password(session: Session, username: str, password: str, rounds=None):
+    """Check a login without writing to the database. Input: session, username, password, work factor (optional).
+    Returns (User or None, new password hash or None). The new hash replaces one made with another work factor,
+    store it with store_password_hash()."""
     # Strip whitespaces from username
     username = username.strip()
     # Query User table for username
     user = session.query(User).filter_by(username=username).first()
     # Check that the password matches using encrypted check and return user if valid
     if user and bcrypt.checkpw(password.encode(), user.password_hash.encode()):
-        return user
-    return None
+        # Rehash when the configured cost changed, the plain password is only known right now
+        if hash_rounds(user.password_hash) != work_factor(rounds):
+            return user, hash_password(password, rounds)
+        return user, None
+    return None, None
+
+def store_password_hash(session: Session, user_id: int, password_hash: str):
+    """Replace the password hash of a user. Input: session, user_id, password hash."""
+    session.query(User).filter(User.user_id == user_id).update({User.password_hash: password_hash})
+    session.commit()
+
+def issue_token(session: Session, user_id: int, days=None):
+    """Create a remember-me token '<selector>.<secret>' for a user, only a hash of the secret is stored.
+    Input: session, user_id, days valid (optional, config.REMEMBER_DAYS by default). Returns the token."""
+    selector, verifier = secrets.token_urlsafe(12), secrets.token_urlsafe(32)
+    now = _utc_now()
+    days = config.REMEMBER_DAYS if days is None else days
+    session.add(SessionToken(selector=selector, verifier_hash=_token_hash(verifier), user_id=user_id,
+                             created_at=now, expires_at=now + timedelta(days=days)))
+    session.commit()
+    return f"{selector}.{verifier}"
+
+def authenticate_token(session: Session, token: str):
+    """Remember-me login: one primary key lookup and a constant-time hash comparison instead of bcrypt.
+    Input: session, token. Returns the User, None for unknown, revoked or expired tokens."""
+    selector, _, verifier = (token or "").strip().partition(".")
+    if not selector or not verifier:
+        return None
+    row = session.get(SessionToken, selector)
+    if row is None:
+        return None
+    # Expired tokens are removed on sight
+    if row.expires_at <= _utc_now():
+        session.delete(row)
+        session.commit()
+        return None
+    if not hmac.compare_digest(row.verifier_hash, _token_hash(verifier)):
+        return None
+    return session.get(User, row.user_id)
+
+def revoke_token(session: Session, token: str):
+    """Delete a remember-me token, e.g. on logout. Input: session, token."""
+    selector = (token or "").strip().partition(".")[0]
+    session.query(SessionToken).filter(SessionToken.selector == selector).delete()
+    session.commit()
+
+def revoke_user_tokens(session: Session, user_id: int):
+    """Delete every remember-me token of a user, signing out all machines. Input: session, user_id."""
+    session.query(SessionToken).filter(SessionToken.user_id == user_id).delete()
+    session.commit()
+
+def _token_hash(verifier: str):
+    """Helper function. SHA-256 hex digest of a token secret. Input: secret."""
+    return hashlib.sha256(verifier.encode()).hexdigest()
+
+def _utc_now():
+    """Helper function. Current UTC time without tzinfo, as stored by SQLite DateTime columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
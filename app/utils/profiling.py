@@ -0,0 +1,233 @@
+"""Opt-in instrumentation: SQL statement timings, GUI operation timings and Tk event-loop stalls.
+
+Recording is off until Profiler.enable() is called, which app.gui.app does when EVERTASK_PROFILE is set
+or when recording is started from the diagnostics window.
+"""
+import functools
+import heapq
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from app import config
+
+# Interval of the Tk watchdog tick, in ms
+TICK_MS = 25
+# Slow statements and stalls kept for the diagnostics window and the JSON dump
+KEEP = 50
+# Expanded IN lists differ in their number of placeholders, they are grouped as one statement
+_IN_LIST = re.compile(r"\(\?(?:, \?)+\)")
+
+log = logging.getLogger(__name__)
+
+
+def normalize(statement):
+    """Collapse whitespace and IN lists, so one statement shape is counted under one key. Input: SQL text."""
+    return _IN_LIST.sub("(?, ...)", " ".join(statement.split()))
+
+
+class Timing:
+    """Running count, total and maximum of one kind of measurement."""
+    __slots__ = ("count", "total_ms", "max_ms", "rows")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        # Rows affected, only known for INSERT/UPDATE/DELETE
+        self.rows = 0
+
+    def add(self, ms, rows=None):
+        """Add one measurement. Input: duration in ms, row count (optional)."""
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        if rows is not None and rows >= 0:
+            self.rows += rows
+
+    def as_dict(self):
+        """Return the totals with the mean, rounded for display."""
+        return dict(count=self.count, total_ms=round(self.total_ms, 3), max_ms=round(self.max_ms, 3),
+                    mean_ms=round(self.total_ms / self.count, 3) if self.count else 0.0, rows=self.rows)
+
+
+class Profiler:
+    """Collects the measurements of every thread. Hooks are installed once and do nothing while disabled."""
+    def __init__(self, stall_ms=config.PROFILE_STALL_MS, slow_ms=config.PROFILE_SLOW_MS, keep=KEEP):
+        """Init for Profiler class. Input: Tk stall threshold in ms, slow statement threshold in ms,
+        slow statements and stalls to keep."""
+        self.enabled = False
+        self.stall_ms = stall_ms
+        self.slow_ms = slow_ms
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._engines = set()
+        self._watching = False
+        self.reset()
+
+    def reset(self):
+        """Forget every measurement."""
+        with self._lock:
+            self.started = time.time()
+            self.sql = {}
+            self.operations = {}
+            # Delay of every watchdog tick, of the stalls only, and the latest stalls
+            self.ticks = Timing()
+            self.stall_timing = Timing()
+            self.stalls = deque(maxlen=self.keep)
+            # Min-heap of (ms, sequence, statement, rows), the slowest statements are kept
+            self._slowest = []
+            self._sequence = itertools.count()
+            # Last GUI operation run on the Tk thread, stalls are attributed to it
+            self._last_operation = None
+
+    def enable(self, engine=None, root=None):
+        """Start recording, hooking an engine and watching a Tk root when given. Input: engine, Tk root (optional)."""
+        self.enabled = True
+        if engine is not None:
+            self.instrument(engine)
+        if root is not None:
+            self.watch(root)
+
+    def disable(self):
+        """Stop recording, the measurements are kept."""
+        self.enabled = False
+
+    def record_sql(self, statement, ms, rows=None):
+        """Add the timing of one executed statement. Input: SQL text, duration in ms, affected rows (optional)."""
+        key = normalize(statement)
+        with self._lock:
+            self.sql.setdefault(key, Timing()).add(ms, rows)
+            entry = (ms, next(self._sequence), key, rows)
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, entry)
+            elif ms > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+        if ms >= self.slow_ms:
+            log.warning("Slow statement (%.1f ms): %s", ms, key)
+
+    def record(self, name, ms):
+        """Add the timing of one GUI or background operation. Input: operation name, duration in ms."""
+        with self._lock:
+            self.operations.setdefault(name, Timing()).add(ms)
+            if threading.current_thread() is threading.main_thread():
+                self._last_operation = (name, time.perf_counter())
+
+    def record_since(self, name, start):
+        """Add an operation that started at a perf_counter() value, e.g. before waiting on a database thread,
+        while enabled. Input: operation name, start time."""
+        if self.enabled:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record_stall(self, ms, now=None):
+        """Add one Tk tick that ran late. Input: delay in ms, perf_counter() time of the tick (optional)."""
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            self.ticks.add(ms)
+            if ms < self.stall_ms:
+                return
+            self.stall_timing.add(ms)
+            # The operation that finished during the stall most likely caused it
+            during = None
+            if self._last_operation and self._last_operation[1] >= now - ms / 1000:
+                during = self._last_operation[0]
+            self.stalls.append(dict(at=datetime.now().isoformat(timespec="milliseconds"), ms=round(ms, 3),
+                                    during=during))
+
+    @contextmanager
+    def timer(self, name):
+        """Context manager timing its block as an operation, while enabled. Input: operation name."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def timed(self, name):
+        """Decorator timing every call of a function as an operation, while enabled. Input: operation name."""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with self.timer(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def instrument(self, engine):
+        """Time every statement of an engine with cursor execute events, once per engine. Input: engine."""
+        if id(engine) in self._engines:
+            return
+        self._engines.add(id(engine))
+        from sqlalchemy import event
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if self.enabled:
+                conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get("profile_start")
+            if not starts:
+                return
+            ms = (time.perf_counter() - starts.pop()) * 1000
+            # SQLite reports -1 for SELECT, the rows are only fetched after this event
+            self.record_sql(statement, ms, cursor.rowcount)
+
+    def watch(self, root, interval_ms=TICK_MS):
+        """Measure Tk event-loop stalls: a tick is scheduled every interval and its delay is recorded.
+        The watch ends with the next tick after disable(). Input: Tk root, tick interval in ms."""
+        if self._watching:
+            return
+        self._watching = True
+        expected = time.perf_counter() + interval_ms / 1000
+
+        def tick():
+            nonlocal expected
+            if not self.enabled:
+                self._watching = False
+                return
+            now = time.perf_counter()
+            self.record_stall(max(0.0, (now - expected) * 1000), now)
+            expected = now + interval_ms / 1000
+            root.after(interval_ms, tick)
+        root.after(interval_ms, tick)
+
+    def snapshot(self):
+        """Return every measurement as JSON-ready dicts, statements and operations by total time."""
+        with self._lock:
+            by_total = lambda item: item[1].total_ms
+            sql = [dict(statement=key, **timing.as_dict())
+                   for key, timing in sorted(self.sql.items(), key=by_total, reverse=True)]
+            operations = [dict(name=name, **timing.as_dict())
+                          for name, timing in sorted(self.operations.items(), key=by_total, reverse=True)]
+            slowest = [dict(statement=key, ms=round(ms, 3), rows=rows)
+                       for ms, _, key, rows in sorted(self._slowest, reverse=True)]
+            tk = dict(ticks=self.ticks.count, stall_ms=self.stall_ms, stalls=self.stall_timing.count,
+                      stalled_ms=round(self.stall_timing.total_ms, 3), max_delay_ms=round(self.ticks.max_ms, 3),
+                      recent_stalls=list(self.stalls))
+        return dict(started=datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+                    seconds=round(time.time() - self.started, 1), enabled=self.enabled,
+                    sql=sql, slow_queries=slowest, operations=operations, tk=tk)
+
+    def dump(self, path):
+        """Write snapshot() to a JSON file. Input: file path."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, indent=2)
+
+
+# The application's profiler, shared by the database hooks and the GUI
+PROFILER = Profiler()
+timed = PROFILER.timed
+timer = PROFILER.timer
@@ -0,0 +1,29 @@
+import os
+
+from app import config
+
+
+def load_token(path=None):
+    """Read the saved remember-me token, None if there is none. Input: file path (optional, config.REMEMBER_FILE)."""
+    try:
+        with open(path or config.REMEMBER_FILE, encoding="utf-8") as file:
+            return file.read().strip() or None
+    except OSError:
+        return None
+
+
+def save_token(token, path=None):
+    """Save a remember-me token, readable by the current user only. Input: token, file path (optional)."""
+    path = path or config.REMEMBER_FILE
+    # Created with owner-only permissions, so the token never exists world-readable
+    descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+        file.write(token)
+
+
+def clear_token(path=None):
+    """Delete the saved remember-me token, if any. Input: file path (optional)."""
+    try:
+        os.remove(path or config.REMEMBER_FILE)
+    except FileNotFoundError:
+        pass